@@ -1,12 +1,27 @@
+import json
 import os
+import re
 from mayaUtils import *
-from PySide2.QtCore import Signal
-from PySide2.QtGui import QIntValidator, QRegExpValidator
-from PySide2.QtWidgets import QCheckBox, QFileDialog, QHBoxLayout, QLabel, QLineEdit, QListWidget, QMessageBox, QPushButton, QVBoxLayout, QWidget
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PySide2.QtGui import QDoubleValidator, QIntValidator, QRegExpValidator
+from PySide2.QtWidgets import QAbstractItemView, QCheckBox, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QListWidget, QMessageBox, QProgressDialog, QPushButton, QTableView, QVBoxLayout
 import maya.cmds as mc
-from mayaUtils import IsJoint, IsMesh, QMayaWindow
-import mayatools
-import remote_execution
+from mayaUtils import IsJoint, IsMesh
+from toolLauncher import QMayaWindow
+import tempfile
+import fbxExport
+import keyReduction
+import lodChain
+import skinWeights
+import exportCache
+import exportJobRunner
+import exportValidation
+import skeletonIndex
+import ueTransport
+import animStateStore
+from exportTrace import Traced, tracer
+import exportWorker
+import mayapyPool
 
 
 def TryAction(action):
@@ -20,11 +35,51 @@ def TryAction(action):
 
 # Data oriented class
 class AnimClip:
-    def __init__(self):
-        self.subfix = ""
-        self.frameMin = mc.playbackOptions(q=True, min=True) 
-        self.frameMax = mc.playbackOptions(q=True, max=True)
-        self.shouldExport = True
+    def __init__(self, subfix="", frameMin=None, frameMax=None, shouldExport=True):
+        self.subfix = subfix
+        self.frameMin = mc.playbackOptions(q=True, min=True) if frameMin is None else frameMin
+        self.frameMax = mc.playbackOptions(q=True, max=True) if frameMax is None else frameMax
+        self.shouldExport = shouldExport
+
+# clip ranges from a json list (or a batch spec with "clips") of {subfix, frameMin, frameMax}, or from a text or csv
+# file with one "subfix, frameMin, frameMax" line per clip, a header line before them is skipped
+def LoadClipRanges(path):
+    with open(path, "r") as clipFile:
+        if os.path.splitext(path)[1].lower() == ".json":
+            clipSpecs = json.load(clipFile)
+            return clipSpecs.get("clips", []) if isinstance(clipSpecs, dict) else clipSpecs
+
+        clipSpecs = []
+        isFirstLine = True
+        for lineNumber, line in enumerate(clipFile, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = [field for field in re.split(r"[,\s]+", line) if field]
+            if len(fields) != 3:
+                raise Exception(f"{path} line {lineNumber}: expected subfix, frameMin, frameMax but got \"{line}\"")
+            try:
+                # frames exported from other tools can come as 12.0
+                frameMin, frameMax = int(float(fields[1])), int(float(fields[2]))
+            except ValueError:
+                if isFirstLine:
+                    isFirstLine = False
+                    continue
+                raise Exception(f"{path} line {lineNumber}: the frames have to be numbers but got \"{line}\"")
+            isFirstLine = False
+            clipSpecs.append({"subfix": fields[0], "frameMin": frameMin, "frameMax": frameMax})
+        return clipSpecs
+
+# Data oriented class
+# the unreal imports of one export: every file goes over as soon as it is written, unsaved, and the packages are saved
+# once every part of the export is done. While the skeletal mesh exports in the background the clips that need its
+# skeleton are held back
+class PendingUnrealImports:
+    def __init__(self, partCount, isMeshPending):
+        self.heldTasks = []
+        self.remainingParts = partCount
+        self.isMeshPending = isMeshPending
+        self.hasImports = False
 
 class MayaToUE:
     def __init__(self):
@@ -34,6 +89,93 @@ class MayaToUE:
         self.fileName = ""
         self.saveDir = ""
         self.scale = 1.0  
+        self.sendToUnreal = True
+        self.reduceKeys = False
+        self.keyTolerances = dict(keyReduction.DEFAULT_TOLERANCES)
+        # clip path -> keys before and after, max error per channel kind and file size of the last reduced export
+        self.clipReductions = {}
+        self.generateLods = False
+        self.lodSettings = [dict(lodSetting) for lodSetting in lodChain.DEFAULT_LOD_SETTINGS]
+        # SaveFiles hands a skeletal mesh with lods to a mayapy worker and returns before it is written
+        self.exportLodsInBackground = False
+        self.pruneSkinWeights = False
+        self.skinWeightThreshold = skinWeights.DEFAULT_WEIGHT_THRESHOLD
+        self.maxInfluences = skinWeights.DEFAULT_MAX_INFLUENCES
+        # influences before and after per mesh of the last pruned skeletal mesh export
+        self.skinPrunings = []
+        self.backgroundExports = []
+        self.backgroundExportFinishedCallback = None
+        # the export stops before anything is baked when the root joint, meshes or clip ranges have problems
+        self.validateBeforeExport = True
+
+    # the same keys a batch export spec uses, so a character can be saved into a profile and loaded back
+    def GetSpec(self):
+        return {
+            "rootJoint": self.rootJnt,
+            "meshes": list(self.meshes),
+            "scale": self.scale,
+            "fileName": self.fileName,
+            "saveDir": self.saveDir,
+            "sendToUnreal": self.sendToUnreal,
+            "reduceKeys": self.reduceKeys,
+            "keyTolerances": dict(self.keyTolerances),
+            "generateLods": self.generateLods,
+            "lods": [dict(lodSetting) for lodSetting in self.lodSettings],
+            "pruneSkinWeights": self.pruneSkinWeights,
+            "skinWeightThreshold": self.skinWeightThreshold,
+            "maxInfluences": self.maxInfluences,
+            "validate": self.validateBeforeExport,
+            "clips": [{"subfix": animClip.subfix, "frameMin": animClip.frameMin, "frameMax": animClip.frameMax, "shouldExport": animClip.shouldExport} for animClip in self.animationClips],
+        }
+
+    # clips without a range fall back to the playback range of the scene, same as in the widget
+    def LoadSpec(self, spec):
+        self.rootJnt = spec["rootJoint"]
+        self.meshes = list(spec.get("meshes", []))
+        self.SetScale(spec.get("scale", 1.0))
+        self.fileName = spec["fileName"]
+        self.saveDir = spec["saveDir"]
+        self.sendToUnreal = spec.get("sendToUnreal", self.sendToUnreal)
+        self.reduceKeys = spec.get("reduceKeys", False)
+        self.keyTolerances.update(spec.get("keyTolerances", {}))
+        self.generateLods = spec.get("generateLods", bool(spec.get("lods")))
+        self.lodSettings = [dict(lodSetting) for lodSetting in spec.get("lods", self.lodSettings)]
+        self.pruneSkinWeights = spec.get("pruneSkinWeights", False)
+        self.skinWeightThreshold = spec.get("skinWeightThreshold", self.skinWeightThreshold)
+        self.maxInfluences = spec.get("maxInfluences", self.maxInfluences)
+        self.validateBeforeExport = spec.get("validate", True)
+        self.animationClips = []
+        self.AddAnimClips(spec.get("clips", []))
+
+    def SetSkinWeightThreshold(self, thresholdStr):
+        try:
+            threshold = float(thresholdStr)
+            if not 0 <= threshold < 1:
+                raise ValueError("Threshold must be in [0, 1).")
+            self.skinWeightThreshold = threshold
+        except ValueError:
+            raise Exception("Invalid weight threshold. Please enter a number between 0 and 1.")
+
+    def SetMaxInfluences(self, maxInfluencesStr):
+        try:
+            maxInfluences = int(maxInfluencesStr)
+            if maxInfluences < 1:
+                raise ValueError("Max influences must be at least 1.")
+            self.maxInfluences = maxInfluences
+        except ValueError:
+            raise Exception("Invalid max influences. Please enter a whole number of at least 1.")
+
+    def SetLodSettings(self, lodSettingsStr):
+        self.lodSettings = lodChain.ParseLodSettings(lodSettingsStr)
+
+    def SetKeyTolerance(self, channelKind, toleranceStr):
+        try:
+            tolerance = float(toleranceStr)
+            if tolerance < 0:
+                raise ValueError("Tolerance must not be negative.")
+            self.keyTolerances[channelKind] = tolerance
+        except ValueError:
+            raise Exception(f"Invalid {channelKind} tolerance. Please enter a valid number.")
 
     def SetScale(self, scaleStr):
         try:
@@ -45,43 +187,459 @@ class MayaToUE:
             raise Exception("Invalid scale value. Please enter a valid number.")
 
     def GetAllJoints(self):
-        jnts = [self.rootJnt]
-        children = mc.listRelatives(self.rootJnt, c=True, ad=True, type="joint")
-        if children:
-            jnts.extend(children)
-        return jnts
+        return skeletonIndex.GetSkeletonIndex(self.rootJnt).GetSubtree(self.rootJnt)
+
+    def GetSkeletalMeshSavePath(self):
+        path = os.path.join(self.saveDir, self.fileName + ".fbx")
+        return os.path.normpath(path)
+
+    def GetAnimDirPath(self):
+        path = os.path.join(self.saveDir, "anim")
+        return os.path.normpath(path)
+
+    def GetSavePathForAnimClip(self, animClip: AnimClip):
+        path = os.path.join(self.GetAnimDirPath(), self.fileName + animClip.subfix + ".fbx")
+        return os.path.normpath(path)
+
+    def AddNewAnimEntry(self):
+        self.animationClips.append(AnimClip())
+        return self.animationClips[-1]
+
+    def AddAnimClips(self, clipSpecs):
+        newClips = [AnimClip(clipSpec.get("subfix", ""), clipSpec.get("frameMin"), clipSpec.get("frameMax"), clipSpec.get("shouldExport", True)) for clipSpec in clipSpecs]
+        self.animationClips += newClips
+        return newClips
+
+    def RemoveAnimClip(self, clipToRemove: AnimClip):
+        self.animationClips.remove(clipToRemove)
+
+    def SetSelectedAsRootJnt(self):
+        selection = mc.ls(sl=True)
+        if not selection:
+            raise Exception("Nothing Selected, Please Select the Root Joint of the Rig!")
 
-    def SaveFiles(self):
+        selectedJnt = selection[0]
+        if not IsJoint(selectedJnt):
+            raise Exception(f"{selectedJnt} is not a joint, Please Select the Root Joint of the Rig!")
+
+        self.rootJnt = selectedJnt
+
+    def AddRootJoint(self):
+        if (not self.rootJnt) or (not mc.objExists(self.rootJnt)):
+            raise Exception("No Root Joint Assigned, Please Set the Current Root Joint of the Rig First!")
+
+        rootJntPosX, rootJntPosY, rootJntPosZ = mc.xform(self.rootJnt, q=True, t=True, ws=True)
+        if rootJntPosX == 0 and rootJntPosY == 0 and rootJntPosZ == 0:
+            raise Exception("Current Root Joint is at origin already, no need to make a new one!")
+
+        mc.select(cl=True)
+        rootJntName = self.rootJnt + "_root"
+        mc.joint(n=rootJntName)
+        mc.parent(self.rootJnt, rootJntName)
+        self.rootJnt = rootJntName
+
+    def AddSelectedMeshes(self):
+        selection = mc.ls(sl=True)
+        if not selection:
+            raise Exception("No Mesh Selected!")
+
+        meshes = set()
+        for sel in selection:
+            if IsMesh(sel):
+                meshes.add(sel)
+
+        if len(meshes) == 0:
+            raise Exception("No Mesh Selected!")
+
+        self.meshes = list(meshes)
+
+    def GetManifestPath(self):
+        path = os.path.join(self.saveDir, self.fileName + "_export_manifest.json")
+        return os.path.normpath(path)
+
+    def GetAnimStateDirPath(self):
+        path = os.path.join(self.saveDir, "states")
+        return os.path.normpath(path)
+
+    def GetAnimStateLibrary(self):
+        return animStateStore.AnimStateLibrary(self.GetAnimStateDirPath())
+
+    @Traced("SaveAnimStates")
+    def SaveAnimStates(self):
         allJnts = self.GetAllJoints()
-        allMeshes = self.meshes
-        allObjectToExport = allJnts + allMeshes
-        mc.select(allObjectToExport, r=True)
+        stateLibrary = self.GetAnimStateLibrary()
+        for animClip in self.animationClips:
+            if not animClip.shouldExport:
+                continue
+            data = animStateStore.SampleJointTransforms(allJnts, animClip.frameMin, animClip.frameMax)
+            metadata = {"fileName": self.fileName, "subfix": animClip.subfix, "scale": self.scale}
+            stateLibrary.SaveState(self.fileName + animClip.subfix, allJnts, animClip.frameMin, animClip.frameMax, data, metadata)
+        return stateLibrary
 
-        skeletalMeshExportPath = self.GetSkeletalMeshSavePath()
+    def GetTracePath(self):
+        path = os.path.join(self.saveDir, self.fileName + "_export_trace.json")
+        return os.path.normpath(path)
+
+    def LoadManifest(self, forceFullExport):
+        manifest = exportCache.ExportManifest(self.GetManifestPath())
+        if forceFullExport:
+            manifest.Clear()
+        return manifest
+
+    def GetExportIssues(self):
+        clipRanges = [(self.GetSavePathForAnimClip(animClip), animClip.frameMin, animClip.frameMax) for animClip in self.animationClips if animClip.shouldExport]
+        return exportValidation.GetExportIssues(self.rootJnt, self.meshes, clipRanges, self.scale)
+
+    def ValidateExport(self):
+        if self.validateBeforeExport:
+            exportValidation.RaiseExportIssues(self.GetExportIssues())
+
+    @Traced("SaveFiles")
+    def SaveFiles(self, forceFullExport=False):
+        self.ValidateExport()
+        manifest = self.LoadManifest(forceFullExport)
+        tasks = self.GetExportTasks(manifest)
+        backgroundTasks = self.GetBackgroundTasks(tasks)
+        exportedTasks = []
+
+        # the clips need the skeleton of the mesh in unreal, while the mesh is still building they wait for it
+        pendingImports = PendingUnrealImports(2 if backgroundTasks else 1, len(backgroundTasks) > 0)
+
+        def OnTaskFinished(task, error):
+            self.RecordExportedTask(manifest, task)
+            exportedTasks.append(task)
+            self.SendUnrealImports(pendingImports, [task])
+
+        if backgroundTasks:
+            self.StartBackgroundExport(backgroundTasks, manifest, pendingImports)
+        try:
+            fbxExport.RunExportTasks([task for task in tasks if task not in backgroundTasks], OnTaskFinished)
+        finally:
+            # whatever got written before a failure is already over, unreal saves it once
+            self.FinishUnrealImportPart(pendingImports)
+        return [task["path"] for task in exportedTasks]
+
+    # the skeletal meshes with lods a mayapy worker writes while the session goes on
+    def GetBackgroundTasks(self, tasks):
+        return [task for task in tasks if task["type"] == "skeletalMesh" and task["lods"]] if self.exportLodsInBackground else []
 
-        mc.FBXResetExport()
-        mc.FBXExportSmoothingGroups('-v', True)
-        mc.FBXExportInputConnections('-v', False)
-        mc.FBXExportScaleFactor('-v', self.scale)  # Apply scale
+    # SaveFiles without blocking the session: one file per idle step, the returned job can be cancelled in between
+    def StartSaveFilesJob(self, forceFullExport=False, progressCallback=None, finishedCallback=None):
+        self.ValidateExport()
+        manifest = self.LoadManifest(forceFullExport)
+        tasks = self.GetExportTasks(manifest)
+        backgroundTasks = self.GetBackgroundTasks(tasks)
+        # the background export can finish between two steps of the job, the save waits for both
+        pendingImports = PendingUnrealImports(2 if backgroundTasks else 1, len(backgroundTasks) > 0)
 
-        mc.FBXExport('-f', skeletalMeshExportPath, '-s', True, '-ea', False)
+        def OnTaskFinished(task, error):
+            self.RecordExportedTask(manifest, task)
+            self.SendUnrealImports(pendingImports, [task])
 
-        os.makedirs(self.GetAnimDirPath(), exist_ok=True)
-        mc.FBXExportBakeComplexAnimation('-v', True)
+        def OnJobFinished(job):
+            self.FinishUnrealImportPart(pendingImports)
+            if finishedCallback:
+                finishedCallback(job)
+
+        if backgroundTasks:
+            self.StartBackgroundExport(backgroundTasks, manifest, pendingImports)
+        job = exportJobRunner.ExportJob([task for task in tasks if task not in backgroundTasks], OnTaskFinished, OnJobFinished, progressCallback)
+        job.Start()
+        return job
+
+    # the written files go over unsaved, the clips wait while their skeletal mesh is still exporting in the background
+    def SendUnrealImports(self, pendingImports, tasks):
+        if pendingImports.isMeshPending:
+            pendingImports.heldTasks += tasks
+            return
+        if self.QueueUnrealImports(tasks, save=False):
+            pendingImports.hasImports = True
+
+    # one part of an export is done writing, once the last part is unreal saves everything imported in one go
+    def FinishUnrealImportPart(self, pendingImports):
+        pendingImports.remainingParts -= 1
+        if pendingImports.remainingParts == 0 and pendingImports.hasImports:
+            self.QueueUnrealSave()
+
+    # the manifest is saved after every file, an interrupted export keeps what it finished
+    def RecordExportedTask(self, manifest, task):
+        self.RecordExportReport(task["path"], task)
+        task["fileHash"] = exportCache.HashFile(task["path"])
+        manifest.Update(task["path"], task["hash"])
+        manifest.Save()
+
+    # the snapshot is saved right away, so the worker sees the scene before anything else touches it
+    @Traced("StartBackgroundExport")
+    def StartBackgroundExport(self, tasks, manifest, pendingImports):
+        snapshotPath = self.SaveSceneSnapshot()
+        future = mayapyPool.StartMayapyJobs(exportWorker.__file__, [{"scene": snapshotPath, "tasks": tasks}])
+        self.backgroundExports.append(future)
+        future.add_done_callback(lambda finishedFuture: ueTransport.RunOnMainThread(self.BackgroundExportFinished, finishedFuture, tasks, manifest, pendingImports, snapshotPath))
+        return future
+
+    def BackgroundExportFinished(self, future, tasks, manifest, pendingImports, snapshotPath):
+        self.backgroundExports.remove(future)
+        self.RemoveSceneSnapshot(snapshotPath)
+        try:
+            errors, finishedTasks = self.ApplyWorkerResults(future.result(), {task["path"]: task for task in tasks}, manifest)
+        except Exception as e:
+            errors, finishedTasks = [f"{e}"], []
+        manifest.Save()
+
+        # the skeletal mesh goes first, the clips held back for its skeleton right after
+        pendingImports.isMeshPending = False
+        self.SendUnrealImports(pendingImports, finishedTasks + pendingImports.heldTasks)
+        pendingImports.heldTasks = []
+        self.FinishUnrealImportPart(pendingImports)
+        if self.backgroundExportFinishedCallback:
+            self.backgroundExportFinishedCallback(errors)
+
+    def IsExportingInBackground(self):
+        return len(self.backgroundExports) > 0
+
+    @Traced("SaveSceneSnapshot")
+    def SaveSceneSnapshot(self):
+        snapshotDir = tempfile.mkdtemp(prefix="MayaToUE_")
+        snapshotPath = os.path.join(snapshotDir, "snapshot.mb")
+        mc.file(snapshotPath, exportAll=True, type="mayaBinary", preserveReferences=True, force=True)
+        return snapshotPath
+
+    def RemoveSceneSnapshot(self, snapshotPath):
+        os.remove(snapshotPath)
+        os.rmdir(os.path.dirname(snapshotPath))
+
+    # only returns the files whose content hash differs from the one recorded in the manifest
+    @Traced("GetExportTasks")
+    def GetExportTasks(self, manifest):
+        allJnts = self.GetAllJoints()
+        allObjectToExport = allJnts + self.meshes
+        hasher = exportCache.SceneHasher(allJnts, self.meshes, self.scale)
+
+        tasks = []
+        skeletalMeshExportPath = self.GetSkeletalMeshSavePath()
+        skeletalMeshHash = hasher.GetSkeletalMeshHash()
+        lods = [dict(lodSetting) for lodSetting in self.lodSettings] if self.generateLods else None
+        skinPruning = {"threshold": self.skinWeightThreshold, "maxInfluences": self.maxInfluences} if self.pruneSkinWeights else None
+        if lods or skinPruning:
+            skeletalMeshHash = exportCache.HashValues(skeletalMeshHash, lods, skinPruning)
+        if not manifest.IsUpToDate(skeletalMeshExportPath, skeletalMeshHash):
+            tasks.append({
+                "type": "skeletalMesh",
+                "path": skeletalMeshExportPath,
+                "hash": skeletalMeshHash,
+                "objects": allObjectToExport,
+                "meshes": list(self.meshes),
+                "name": self.fileName,
+                "scale": self.scale,
+                "lods": lods,
+                "skinPruning": skinPruning,
+            })
 
         for animClip in self.animationClips:
             if not animClip.shouldExport:
                 continue
             animExportPath = self.GetSavePathForAnimClip(animClip)
-            startFrame = animClip.frameMin
-            endFrame = animClip.frameMax
-            mc.FBXExportBakeComplexStart('-v', startFrame)
-            mc.FBXExportBakeComplexEnd('-v', endFrame)
-            mc.FBXExportBakeComplexStep('-v', 1)
-            mc.playbackOptions(e=True, min=startFrame, max=endFrame)
-            mc.FBXExport('-f', animExportPath, '-s', True, '-ea', True)
+            animClipHash = hasher.GetAnimClipHash(animClip.frameMin, animClip.frameMax)
+            keyTolerances = dict(self.keyTolerances) if self.reduceKeys else None
+            if keyTolerances is not None:
+                animClipHash = exportCache.HashValues(animClipHash, sorted(keyTolerances.items()))
+            if manifest.IsUpToDate(animExportPath, animClipHash):
+                continue
+            tasks.append({
+                "type": "animClip",
+                "path": animExportPath,
+                "hash": animClipHash,
+                "objects": allObjectToExport,
+                "joints": allJnts,
+                "scale": self.scale,
+                "frameMin": animClip.frameMin,
+                "frameMax": animClip.frameMax,
+                "keyTolerances": keyTolerances,
+            })
+        return tasks
+
+    # exports the skeletal mesh and every clip in headless mayapy workers opening a snapshot of this scene
+    @Traced("SaveFilesParallel")
+    def SaveFilesParallel(self, workerCount=None, forceFullExport=False):
+        self.ValidateExport()
+        manifest = self.LoadManifest(forceFullExport)
+        tasks = self.GetExportTasks(manifest)
+        if not tasks:
+            return []
+
+        tasksByPath = {task["path"]: task for task in tasks}
+        snapshotPath = self.SaveSceneSnapshot()
+        payloads = [{"scene": snapshotPath, "tasks": chunk} for chunk in mayapyPool.SplitIntoChunks(tasks, mayapyPool.GetWorkerCount(workerCount))]
+        try:
+            with tracer.Span("RunMayapyJobs", workers=len(payloads), tasks=len(tasks)):
+                workerResults = mayapyPool.RunMayapyJobs(exportWorker.__file__, payloads, workerCount)
+        finally:
+            self.RemoveSceneSnapshot(snapshotPath)
+
+        errors, finishedTasks = self.ApplyWorkerResults(workerResults, tasksByPath, manifest)
+        manifest.Save()
+        self.QueueUnrealImports(finishedTasks)
+        if errors:
+            raise Exception("Parallel export failed:\n" + "\n".join(errors))
+
+        return [result for workerResult in workerResults for result in workerResult.results]
+
+    # records every file a worker wrote in the manifest, returns the errors and the tasks of the files written
+    def ApplyWorkerResults(self, workerResults, tasksByPath, manifest):
+        errors = []
+        finishedTasks = []
+        for workerResult in workerResults:
+            if not workerResult.Succeeded():
+                errors.append(workerResult.error)
+            for result in workerResult.results:
+                if result["error"]:
+                    errors.append(f"{result['path']}:\n{result['error']}")
+                    continue
+                task = tasksByPath[result["path"]]
+                self.RecordExportReport(task["path"], result)
+                task["fileHash"] = exportCache.HashFile(task["path"])
+                manifest.Update(task["path"], task["hash"])
+                finishedTasks.append(task)
+        return errors, finishedTasks
+
+    # the reports an export task or a mayapy worker result carries back: key reduction of a clip, skin pruning of a mesh
+    def RecordExportReport(self, path, report):
+        if report.get("reduction"):
+            self.clipReductions[path] = report["reduction"]
+        if report.get("pruning"):
+            self.skinPrunings = report["pruning"]
+
+    def GetExportReportText(self):
+        lines = [skinWeights.GetPruningSummaryText(pruning) for pruning in self.skinPrunings]
+        lines += [f"{os.path.basename(path)}: {keyReduction.GetReductionSummaryText(reduction)}" for path, reduction in self.clipReductions.items()]
+        return "\n".join(lines)
+
+    def GetUnrealDestination(self):
+        return "/Game/" + self.fileName
+
+    def GetUnrealSkeletalMeshPath(self):
+        return self.GetUnrealDestination() + "/" + self.fileName
+
+    # the hash of the written fbx lets unreal skip a file whose asset was imported from the same file before, the
+    # manifest hash of the scene inputs would not change with everything the fbx depends on
+    def GetUnrealImportEntry(self, exportType, path, sourceHash):
+        if exportType == "skeletalMesh":
+            return ueTransport.BuildImportBatchEntry(exportType, path, self.GetUnrealDestination(), sourceHash)
+        return ueTransport.BuildImportBatchEntry(exportType, path, self.GetUnrealDestination() + "/anim", sourceHash, self.GetUnrealSkeletalMeshPath())
+
+    # tasks: the export tasks of the files to import, all of them go over as one command
+    @Traced("QueueUnrealImports")
+    def QueueUnrealImports(self, tasks, save=True):
+        if not self.sendToUnreal or not tasks:
+            return None
+
+        entries = [self.GetUnrealImportEntry(task["type"], task["path"], task["fileHash"]) for task in tasks]
+        return ueTransport.GetUnrealTransport().Enqueue(ueTransport.BuildImportBatchCommand(entries, save), f"{len(entries)} files of {self.fileName}")
+
+    def QueueUnrealSave(self):
+        return ueTransport.GetUnrealTransport().Enqueue(ueTransport.BuildSaveImportsCommand([self.GetUnrealDestination()]), f"save {self.fileName}")
+
+    # queues the imports on the background transport and returns right away, files already in unreal are skipped there
+    def SendToUnreal(self):
+        paths = [("skeletalMesh", self.GetSkeletalMeshSavePath())]
+        paths += [("animClip", self.GetSavePathForAnimClip(animClip)) for animClip in self.animationClips if animClip.shouldExport]
+        return self.QueueUnrealImports([{"type": exportType, "path": path, "fileHash": exportCache.HashFile(path) if os.path.exists(path) else None}
+                                        for exportType, path in paths])
+
+# profile keys every character takes over unless it sets its own
+PROFILE_SHARED_KEYS = ["scale", "clips", "sendToUnreal", "reduceKeys", "keyTolerances", "generateLods", "lods", "pruneSkinWeights", "skinWeightThreshold", "maxInfluences", "validate"]
+
+# Several characters or props of one scene exported in one run: all their clips go through a single bake pass
+# over the joints of every character, and the files written are sent to unreal as one batch at the end.
+class ExportProfile:
+    def __init__(self):
+        self.characters: list[MayaToUE] = []
+        self.saveDir = ""
+
+    def AddCharacter(self, characterSpec):
+        character = MayaToUE()
+        character.LoadSpec(characterSpec)
+        self.characters.append(character)
+        return character
+
+    def RemoveCharacter(self, character: MayaToUE):
+        self.characters.remove(character)
+
+    def GetSpec(self):
+        return {"saveDir": self.saveDir, "characters": [character.GetSpec() for character in self.characters]}
+
+    # characters missing a fileName are named after their root joint and export into <saveDir>/<fileName>
+    def LoadSpec(self, spec):
+        self.saveDir = spec.get("saveDir", "")
+        self.characters = []
+        sharedSpec = {key: spec[key] for key in PROFILE_SHARED_KEYS if key in spec}
+        for characterSpec in spec.get("characters", []):
+            characterSpec = dict(sharedSpec, **characterSpec)
+            if not characterSpec.get("rootJoint"):
+                raise Exception("no rootJoint given for a character of the profile")
+            characterSpec.setdefault("fileName", characterSpec["rootJoint"].split("|")[-1].replace(":", "_"))
+            characterSpec.setdefault("saveDir", os.path.join(self.saveDir, characterSpec["fileName"]))
+            self.AddCharacter(characterSpec)
+
+    def GetTracePath(self):
+        path = os.path.join(self.saveDir or self.characters[0].saveDir, "profile_export_trace.json")
+        return os.path.normpath(path)
+
+    def GetExportReportText(self):
+        return "\n".join(filter(None, [character.GetExportReportText() for character in self.characters]))
+
+    @Traced("SaveProfileFiles")
+    def SaveFiles(self, forceFullExport=False):
+        # every problem of every character is reported at once, before the first character gets baked
+        exportValidation.RaiseExportIssues([f"{character.fileName}: {issue}" for character in self.characters
+                                            if character.validateBeforeExport for issue in character.GetExportIssues()])
+        tasks = []
+        taskCharacters = {}
+        for character in self.characters:
+            manifest = character.LoadManifest(forceFullExport)
+            for task in character.GetExportTasks(manifest):
+                if task["path"] in taskCharacters:
+                    raise Exception(f"{task['path']} is exported by more than one character, please give them different file names!")
+                taskCharacters[task["path"]] = (character, manifest)
+                tasks.append(task)
+
+        exportedTasks = []
+
+        def OnTaskFinished(task, error):
+            character, manifest = taskCharacters[task["path"]]
+            character.RecordExportReport(task["path"], task)
+            task["fileHash"] = exportCache.HashFile(task["path"])
+            manifest.Update(task["path"], task["hash"])
+            manifest.Save()
+            exportedTasks.append(task)
+            # every file goes over unsaved as it is written, the meshes are exported before the clips that need them
+            self.QueueUnrealBatch([task], taskCharacters, save=False)
+
+        try:
+            fbxExport.RunExportTasks(tasks, OnTaskFinished)
+        finally:
+            # whatever got written before a failure is already over, unreal saves it once
+            self.QueueUnrealSave([taskCharacters[task["path"]][0] for task in exportedTasks])
+        return [task["path"] for task in exportedTasks]
+
+    @Traced("QueueUnrealBatch")
+    def QueueUnrealBatch(self, exportedTasks, taskCharacters, save=True):
+        entries = []
+        for task in exportedTasks:
+            character, _ = taskCharacters[task["path"]]
+            if character.sendToUnreal:
+                entries.append(character.GetUnrealImportEntry(task["type"], task["path"], task["fileHash"]))
+        if not entries:
+            return None
 
-        self.SendToUnreal()
+        return ueTransport.GetUnrealTransport().Enqueue(ueTransport.BuildImportBatchCommand(entries, save), f"{len(entries)} files of {len(self.characters)} characters")
+
+    def QueueUnrealSave(self, exportedCharacters):
+        destinations = list(dict.fromkeys(character.GetUnrealDestination() for character in exportedCharacters if character.sendToUnreal))
+        if not destinations:
+            return None
+
+        return ueTransport.GetUnrealTransport().Enqueue(ueTransport.BuildSaveImportsCommand(destinations), f"save {len(destinations)} characters")
 
 
 class MayaToUEWidget(QMayaWindow):
@@ -116,12 +674,34 @@ class MayaToUEWidget(QMayaWindow):
         addMeshBtn.clicked.connect(self.AddMeshBtnClicked)
         self.masterLayout.addWidget(addMeshBtn)
 
+        animClipBtnLayout = QHBoxLayout()
+        self.masterLayout.addLayout(animClipBtnLayout)
+
         addNewAnimClipEntryBtn = QPushButton("Add Animation Clip")
         addNewAnimClipEntryBtn.clicked.connect(self.AddNewAnimClipEntryBtnClicked)
-        self.masterLayout.addWidget(addNewAnimClipEntryBtn)
+        animClipBtnLayout.addWidget(addNewAnimClipEntryBtn)
+
+        importClipRangesBtn = QPushButton("Import Clip Ranges")
+        importClipRangesBtn.clicked.connect(self.ImportClipRangesBtnClicked)
+        animClipBtnLayout.addWidget(importClipRangesBtn)
 
-        self.animEntryLayout = QVBoxLayout()
-        self.masterLayout.addLayout(self.animEntryLayout)
+        setPlaybackRangeBtn = QPushButton("Set Playback Range")
+        setPlaybackRangeBtn.clicked.connect(self.SetPlaybackRangeBtnClicked)
+        animClipBtnLayout.addWidget(setPlaybackRangeBtn)
+
+        removeAnimClipsBtn = QPushButton("Remove Selected")
+        removeAnimClipsBtn.clicked.connect(self.RemoveAnimClipsBtnClicked)
+        animClipBtnLayout.addWidget(removeAnimClipsBtn)
+
+        # the view only creates and paints the rows on screen, so hundreds of clips cost the same as a few
+        self.animClipModel = AnimClipTableModel(self.mayaToUE)
+        self.animClipView = QTableView()
+        self.animClipView.setModel(self.animClipModel)
+        self.animClipView.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.animClipView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.animClipView.horizontalHeader().setStretchLastSection(True)
+        self.animClipView.setMinimumHeight(160)
+        self.masterLayout.addWidget(self.animClipView)
 
         self.saveFileLayout = QHBoxLayout()
         self.masterLayout.addLayout(self.saveFileLayout)
@@ -158,42 +738,434 @@ class MayaToUEWidget(QMayaWindow):
         self.savePreviewLabel = QLabel("")
         self.masterLayout.addWidget(self.savePreviewLabel)
 
+        # typing a file name restarts the timer, the preview refreshes once the typing stops
+        self.savePreviewTimer = QTimer(self)
+        self.savePreviewTimer.setSingleShot(True)
+        self.savePreviewTimer.setInterval(200)
+        self.savePreviewTimer.timeout.connect(self.UpdateSavePreviewLabel)
+
+        self.unrealStatusLabel = QLabel("")
+        self.masterLayout.addWidget(self.unrealStatusLabel)
+
+        self.traceSummaryLabel = QLabel("")
+        self.masterLayout.addWidget(self.traceSummaryLabel)
+        ueTransport.GetUnrealTransport().progressCallback = self.UnrealImportProgressed
+
+        self.parallelExportCheckbox = QCheckBox("Export In Parallel (mayapy workers)")
+        self.masterLayout.addWidget(self.parallelExportCheckbox)
+
+        self.forceFullExportCheckbox = QCheckBox("Force Full Export")
+        self.masterLayout.addWidget(self.forceFullExportCheckbox)
+
+        self.reduceKeysCheckbox = QCheckBox("Reduce Animation Keys")
+        self.reduceKeysCheckbox.toggled.connect(self.ReduceKeysCheckboxToggled)
+        self.masterLayout.addWidget(self.reduceKeysCheckbox)
+
+        keyToleranceLayout = QHBoxLayout()
+        keyToleranceLayout.addWidget(QLabel("Key Tolerance"))
+        for channelKind, tolerance in self.mayaToUE.keyTolerances.items():
+            keyToleranceLayout.addWidget(QLabel(channelKind.capitalize() + ":"))
+            toleranceEdit = QLineEdit()
+            toleranceEdit.setValidator(QDoubleValidator(0, 1000, 4))
+            toleranceEdit.setFixedWidth(60)
+            toleranceEdit.setText(f"{tolerance}")
+            toleranceEdit.textChanged.connect(lambda text, channelKind=channelKind: self.KeyToleranceEditChanged(channelKind, text))
+            keyToleranceLayout.addWidget(toleranceEdit)
+        self.masterLayout.addLayout(keyToleranceLayout)
+
+        skinPruningLayout = QHBoxLayout()
+        self.pruneSkinWeightsCheckbox = QCheckBox("Prune Skin Weights")
+        self.pruneSkinWeightsCheckbox.toggled.connect(self.PruneSkinWeightsCheckboxToggled)
+        skinPruningLayout.addWidget(self.pruneSkinWeightsCheckbox)
+        skinPruningLayout.addWidget(QLabel("Threshold:"))
+        skinWeightThresholdEdit = QLineEdit()
+        skinWeightThresholdEdit.setValidator(QDoubleValidator(0, 1, 4))
+        skinWeightThresholdEdit.setFixedWidth(60)
+        skinWeightThresholdEdit.setText(f"{self.mayaToUE.skinWeightThreshold}")
+        skinWeightThresholdEdit.textChanged.connect(self.SkinWeightThresholdEditChanged)
+        skinPruningLayout.addWidget(skinWeightThresholdEdit)
+        skinPruningLayout.addWidget(QLabel("Max Influences:"))
+        maxInfluencesEdit = QLineEdit()
+        maxInfluencesEdit.setValidator(QIntValidator(1, 32))
+        maxInfluencesEdit.setFixedWidth(40)
+        maxInfluencesEdit.setText(f"{self.mayaToUE.maxInfluences}")
+        maxInfluencesEdit.textChanged.connect(self.MaxInfluencesEditChanged)
+        skinPruningLayout.addWidget(maxInfluencesEdit)
+        self.masterLayout.addLayout(skinPruningLayout)
+
+        self.exportReportLabel = QLabel("")
+        self.masterLayout.addWidget(self.exportReportLabel)
+
+        lodLayout = QHBoxLayout()
+        self.generateLodsCheckbox = QCheckBox("Generate LODs (ratio:bone limit)")
+        self.generateLodsCheckbox.toggled.connect(self.GenerateLodsCheckboxToggled)
+        lodLayout.addWidget(self.generateLodsCheckbox)
+        self.lodSettingsEdit = QLineEdit()
+        self.lodSettingsEdit.setText(lodChain.GetLodSettingsText(self.mayaToUE.lodSettings))
+        self.lodSettingsEdit.editingFinished.connect(self.LodSettingsEditFinished)
+        lodLayout.addWidget(self.lodSettingsEdit)
+        self.masterLayout.addLayout(lodLayout)
+
+        # the lods build in a mayapy worker while the window stays responsive
+        self.mayaToUE.exportLodsInBackground = True
+        self.mayaToUE.backgroundExportFinishedCallback = self.BackgroundExportFinished
+        self.lodStatusLabel = QLabel("")
+        self.masterLayout.addWidget(self.lodStatusLabel)
+
+        self.saveAnimStatesCheckbox = QCheckBox("Save Animation States")
+        self.masterLayout.addWidget(self.saveAnimStatesCheckbox)
+
+        self.recordTraceCheckbox = QCheckBox("Record Trace")
+        self.masterLayout.addWidget(self.recordTraceCheckbox)
+
         saveFileBtn = QPushButton("Save Files")
         saveFileBtn.clicked.connect(self.SaveFilesBtnClicked)
         self.masterLayout.addWidget(saveFileBtn)
 
+        # the running in session export and its progress dialog, see StartSaveFilesJob
+        self.exportJob = None
+        self.exportProgressDialog = None
+
+        # several characters of the scene exported together, the current settings get added as one character
+        self.exportProfile = ExportProfile()
+        self.profileList = QListWidget()
+        self.profileList.setFixedHeight(80)
+        self.masterLayout.addWidget(self.profileList)
+
+        profileBtnLayout = QHBoxLayout()
+        self.masterLayout.addLayout(profileBtnLayout)
+        for btnText, onClicked in [("Add To Profile", self.AddToProfileBtnClicked), ("Remove From Profile", self.RemoveFromProfileBtnClicked),
+                                   ("Load Profile", self.LoadProfileBtnClicked), ("Save Profile", self.SaveProfileBtnClicked),
+                                   ("Export Profile", self.ExportProfileBtnClicked)]:
+            profileBtn = QPushButton(btnText)
+            profileBtn.clicked.connect(onClicked)
+            profileBtnLayout.addWidget(profileBtn)
+
+    def RunExport(self, exporter, exportAction):
+        self.StartExportTrace()
+        try:
+            exportAction(self.forceFullExportCheckbox.isChecked())
+        finally:
+            self.ExportFinished(exporter)
+
+    def StartExportTrace(self):
+        if self.recordTraceCheckbox.isChecked():
+            tracer.Start()
+
+    def ExportFinished(self, exporter):
+        self.exportReportLabel.setText(exporter.GetExportReportText())
+        if tracer.enabled:
+            tracer.Stop()
+            tracer.WriteChromeTrace(exporter.GetTracePath())
+            self.traceSummaryLabel.setText(tracer.GetSummaryText())
+
+    @TryAction
     def SaveFilesBtnClicked(self):
-        self.mayaToUE.SaveFiles()
+        if self.mayaToUE.IsExportingInBackground():
+            raise Exception("The Skeletal Mesh LODs are Still Exporting, Please Wait for Them to Finish!")
+        if self.exportJob and self.exportJob.isRunning:
+            raise Exception("The Files are Still Exporting, Please Wait for Them to Finish!")
 
-    def UpdateSavePreviewLabel(self):
-        preivewText = self.mayaToUE.GetSkeletalMeshSavePath()
-        if not self.mayaToUE.animationClips:
-            self.savePreviewLabel.setText(preivewText)
+        if self.parallelExportCheckbox.isChecked():
+            def ExportAction(forceFullExport):
+                self.mayaToUE.SaveFilesParallel(forceFullExport=forceFullExport)
+                if self.saveAnimStatesCheckbox.isChecked():
+                    self.mayaToUE.SaveAnimStates()
+
+            self.RunExport(self.mayaToUE, ExportAction)
+            return
+
+        self.StartExportTrace()
+        try:
+            self.StartSaveFilesJob()
+        except Exception:
+            self.ExportFinished(self.mayaToUE)
+            raise
+
+    # application modal, so the scene cannot change between two steps of the export. The dialog is only built once
+    # the job started, a failed validation raises before it and leaves no dialog behind. The first step of the job runs
+    # deferred, after the dialog is up
+    def StartSaveFilesJob(self):
+        self.exportJob = self.mayaToUE.StartSaveFilesJob(self.forceFullExportCheckbox.isChecked(), self.ExportJobProgressed, self.ExportJobFinished)
+        self.exportProgressDialog = QProgressDialog("Exporting...", "Cancel", 0, len(self.exportJob.tasks), self)
+        self.exportProgressDialog.setWindowTitle("Maya to UE")
+        self.exportProgressDialog.setWindowModality(Qt.ApplicationModal)
+        self.exportProgressDialog.setMinimumDuration(0)
+        self.exportProgressDialog.setAutoClose(False)
+        self.exportProgressDialog.setAutoReset(False)
+        self.exportProgressDialog.canceled.connect(self.exportJob.Cancel)
+        if self.mayaToUE.IsExportingInBackground():
+            self.lodStatusLabel.setText("Exporting the skeletal mesh with LODs in the background...")
+
+    def ExportJobProgressed(self, finishedCount, taskCount, task):
+        self.exportProgressDialog.setValue(finishedCount)
+        self.exportProgressDialog.setLabelText(f"Exported {os.path.basename(task['path'])} ({finishedCount}/{taskCount})")
+
+    def ExportJobFinished(self, job):
+        self.exportProgressDialog.hide()
+        self.exportProgressDialog.deleteLater()
+        self.exportProgressDialog = None
+        try:
+            if not job.error and not job.isCancelled and self.saveAnimStatesCheckbox.isChecked():
+                self.mayaToUE.SaveAnimStates()
+        finally:
+            self.ExportFinished(self.mayaToUE)
+
+        if job.error:
+            QMessageBox().critical(None, "Error", job.error)
+        elif job.isCancelled:
+            self.exportReportLabel.setText(f"Export cancelled after {job.finishedCount} of {len(job.tasks)} files\n" + self.exportReportLabel.text())
+
+    @TryAction
+    def ExportProfileBtnClicked(self):
+        if not self.exportProfile.characters:
+            raise Exception("The Profile is Empty, Please Add a Character First!")
+        self.RunExport(self.exportProfile, self.exportProfile.SaveFiles)
+
+    def UpdateProfileList(self):
+        self.profileList.clear()
+        self.profileList.addItems([f"{character.fileName} ({character.rootJnt}, {len(character.animationClips)} clips)" for character in self.exportProfile.characters])
+
+    @TryAction
+    def AddToProfileBtnClicked(self):
+        if not self.mayaToUE.rootJnt or not self.mayaToUE.fileName or not self.mayaToUE.saveDir:
+            raise Exception("Please Set the Root Joint, File Name and Save Directory First!")
+        self.exportProfile.AddCharacter(self.mayaToUE.GetSpec())
+        self.UpdateProfileList()
+
+    @TryAction
+    def RemoveFromProfileBtnClicked(self):
+        row = self.profileList.currentRow()
+        if row < 0:
+            raise Exception("No Character Selected!")
+        self.exportProfile.RemoveCharacter(self.exportProfile.characters[row])
+        self.UpdateProfileList()
+
+    @TryAction
+    def LoadProfileBtnClicked(self):
+        path, _ = QFileDialog().getOpenFileName(self, "Load Profile", "", "Export Profile (*.json)")
+        if not path:
+            return
+        with open(path, "r") as profileFile:
+            self.exportProfile.LoadSpec(json.load(profileFile))
+        self.UpdateProfileList()
+
+    @TryAction
+    def SaveProfileBtnClicked(self):
+        path, _ = QFileDialog().getSaveFileName(self, "Save Profile", "", "Export Profile (*.json)")
+        if not path:
             return
-        for animClip in self.mayaToUE.animationClips:
-            animSavePath = self.mayaToUE.GetSavePathForAnimClip(animClip)
-            preivewText += "\n" + animSavePath
-        self.savePreviewLabel.setText(preivewText)
+        with open(path, "w") as profileFile:
+            json.dump(self.exportProfile.GetSpec(), profileFile, indent=4)
+
+    def UnrealImportProgressed(self, finishedCount, queuedCount, job):
+        status = ueTransport.GetImportBatchSummaryText(job.output) if job.succeeded else f"failed: {job.output}"
+        self.unrealStatusLabel.setText(f"Unreal {finishedCount}/{queuedCount}: {job.label} {status}")
+
+    def UpdateSavePreviewLabel(self):
+        clipCount = len(self.mayaToUE.animationClips)
+        self.savePreviewLabel.setText(f"{self.mayaToUE.GetSkeletalMeshSavePath()}\n{clipCount} animation clips in {self.mayaToUE.GetAnimDirPath()}")
+        self.animClipModel.SavePathsChanged()
 
     @TryAction
     def PickDirBtnClicked(self):
         path = QFileDialog().getExistingDirectory()
         self.saveDirectoryLineEdit.setText(path)
         self.mayaToUE.saveDir = path
-        self.UpdateSavePreviewLabel()
+        self.savePreviewTimer.start()
 
     @TryAction
     def FileNameLineEditChanged(self, newText):
         self.mayaToUE.fileName = newText
-        self.UpdateSavePreviewLabel()
+        self.savePreviewTimer.start()
 
     @TryAction
     def ScaleEditChanged(self, text):
         self.mayaToUE.SetScale(text)
 
+    def GenerateLodsCheckboxToggled(self, checked):
+        self.mayaToUE.generateLods = checked
+
+    @TryAction
+    def LodSettingsEditFinished(self):
+        self.mayaToUE.SetLodSettings(self.lodSettingsEdit.text())
+
+    def BackgroundExportFinished(self, errors):
+        if errors:
+            self.lodStatusLabel.setText("LOD export failed")
+            QMessageBox().critical(None, "Error", "\n".join(errors))
+            return
+        self.lodStatusLabel.setText(f"Skeletal mesh with LODs written to {self.mayaToUE.GetSkeletalMeshSavePath()}")
+
+    def PruneSkinWeightsCheckboxToggled(self, checked):
+        self.mayaToUE.pruneSkinWeights = checked
+
+    @TryAction
+    def SkinWeightThresholdEditChanged(self, text):
+        self.mayaToUE.SetSkinWeightThreshold(text)
+
+    @TryAction
+    def MaxInfluencesEditChanged(self, text):
+        self.mayaToUE.SetMaxInfluences(text)
+
+    def ReduceKeysCheckboxToggled(self, checked):
+        self.mayaToUE.reduceKeys = checked
+
+    @TryAction
+    def KeyToleranceEditChanged(self, channelKind, text):
+        self.mayaToUE.SetKeyTolerance(channelKind, text)
+
     @TryAction
     def AddNewAnimClipEntryBtnClicked(self):
-        newEntry = self.mayaToUE.AddNewAnimEntry()
-        newEntryWidget = AnimClipEntryWidget(newEntry)
-        newEntryWidget.entryRemoved.connect(self.AnimClipEntryRemoved)
-        newEntryWidget.entrySubfixChanged.connect(lambda x: self
+        self.animClipModel.AddClips([{}])
+        self.savePreviewTimer.start()
+
+    @TryAction
+    def ImportClipRangesBtnClicked(self):
+        path, _ = QFileDialog().getOpenFileName(self, "Import Clip Ranges", "", "Clip Ranges (*.json *.csv *.txt)")
+        if not path:
+            return
+        self.animClipModel.AddClips(LoadClipRanges(path))
+        self.savePreviewTimer.start()
+
+    def GetSelectedAnimClipRows(self):
+        return sorted(index.row() for index in self.animClipView.selectionModel().selectedRows())
+
+    @TryAction
+    def RemoveAnimClipsBtnClicked(self):
+        self.animClipModel.RemoveClipRows(self.GetSelectedAnimClipRows())
+        self.savePreviewTimer.start()
+
+    @TryAction
+    def SetPlaybackRangeBtnClicked(self):
+        selectedRows = self.GetSelectedAnimClipRows()
+        if not selectedRows:
+            raise Exception("No Animation Clip Selected!")
+        animClip = self.animClipModel.GetClip(selectedRows[0])
+        mc.playbackOptions(e=True, min=animClip.frameMin, max=animClip.frameMax)
+        mc.playbackOptions(e=True, ast=animClip.frameMin, aet=animClip.frameMax)
+
+    @TryAction
+    def AddMeshBtnClicked(self):
+        self.mayaToUE.AddSelectedMeshes()
+        self.meshList.clear()
+        self.meshList.addItems(self.mayaToUE.meshes)
+
+    @TryAction
+    def AddRootJntButtonClicked(self):
+        self.mayaToUE.AddRootJoint()
+        self.rootJntText.setText(self.mayaToUE.rootJnt)
+
+    @TryAction
+    def SetSelectionAsRootJointBtnClicked(self):
+        self.mayaToUE.SetSelectedAsRootJnt()
+        self.rootJntText.setText(self.mayaToUE.rootJnt)
+
+
+class AnimClipTableModel(QAbstractTableModel):
+    EXPORT_COLUMN, SUBFIX_COLUMN, MIN_COLUMN, MAX_COLUMN, PATH_COLUMN = range(5)
+    COLUMN_NAMES = ["Export", "Subfix", "Min", "Max", "Save Path"]
+
+    def __init__(self, mayaToUE: MayaToUE):
+        super().__init__()
+        self.mayaToUE = mayaToUE
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.mayaToUE.animationClips)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMN_NAMES)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMN_NAMES[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == self.EXPORT_COLUMN:
+            return flags | Qt.ItemIsUserCheckable
+        if index.column() == self.PATH_COLUMN:
+            return flags
+        return flags | Qt.ItemIsEditable
+
+    def GetClip(self, row) -> AnimClip:
+        return self.mayaToUE.animationClips[row]
+
+    # only asked for the rows on screen, the save paths are built as they get painted
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        animClip = self.GetClip(index.row())
+        column = index.column()
+        if column == self.EXPORT_COLUMN:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if animClip.shouldExport else Qt.Unchecked
+            return None
+
+        if role not in [Qt.DisplayRole, Qt.EditRole]:
+            return None
+        if column == self.SUBFIX_COLUMN:
+            return animClip.subfix
+        if column == self.MIN_COLUMN:
+            return int(animClip.frameMin)
+        if column == self.MAX_COLUMN:
+            return int(animClip.frameMax)
+        return self.mayaToUE.GetSavePathForAnimClip(animClip)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+
+        animClip = self.GetClip(index.row())
+        column = index.column()
+        if column == self.EXPORT_COLUMN and role == Qt.CheckStateRole:
+            animClip.shouldExport = value == Qt.Checked
+        elif role != Qt.EditRole:
+            return False
+        elif column == self.SUBFIX_COLUMN:
+            if not re.fullmatch(r"\w*", value):
+                return False
+            animClip.subfix = value
+            pathIndex = self.index(index.row(), self.PATH_COLUMN)
+            self.dataChanged.emit(pathIndex, pathIndex)
+        elif column == self.MIN_COLUMN:
+            animClip.frameMin = int(value)
+        elif column == self.MAX_COLUMN:
+            animClip.frameMax = int(value)
+        else:
+            return False
+
+        self.dataChanged.emit(index, index)
+        return True
+
+    def AddClips(self, clipSpecs):
+        if not clipSpecs:
+            return []
+        firstRow = self.rowCount()
+        self.beginInsertRows(QModelIndex(), firstRow, firstRow + len(clipSpecs) - 1)
+        newClips = self.mayaToUE.AddAnimClips(clipSpecs)
+        self.endInsertRows()
+        return newClips
+
+    def RemoveClipRows(self, rows):
+        # back to front, one removal per run of neighbouring rows
+        rows = sorted(set(rows), reverse=True)
+        while rows:
+            lastRow = firstRow = rows.pop(0)
+            while rows and rows[0] == firstRow - 1:
+                firstRow = rows.pop(0)
+            self.beginRemoveRows(QModelIndex(), firstRow, lastRow)
+            del self.mayaToUE.animationClips[firstRow:lastRow + 1]
+            self.endRemoveRows()
+
+    # one change signal for the whole column, the view repaints the visible rows only
+    def SavePathsChanged(self):
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, self.PATH_COLUMN), self.index(self.rowCount() - 1, self.PATH_COLUMN))
+
+# only open the window when run as a script, headless batch exports import this module for MayaToUE
+if __name__ == "__main__":
+    mayaToUEWidget = MayaToUEWidget()
+    mayaToUEWidget.show()
@@ -0,0 +1,102 @@
+# Runs inside the Unreal Editor python, the source of this file is sent over remote execution once per connection
+import json
+import os
+import unreal
+
+# metadata tag on every asset ImportBatch brings in, holding the content hash of the fbx it came from
+SOURCE_HASH_TAG = "MayaToUESourceHash"
+
+def CreateImportTask(filePath, destination, save=True):
+    importTask = unreal.AssetImportTask()
+    importTask.filename = filePath
+    importTask.destination_path = destination
+    importTask.automated = True
+    importTask.replace_existing = True
+    importTask.save = save
+    return importTask
+
+def CreateSkeletalMeshImportTask(filePath, destination, save=True):
+    importTask = CreateImportTask(filePath, destination, save)
+    importOptions = unreal.FbxImportUI()
+    importOptions.import_mesh = True
+    importOptions.import_as_skeletal = True
+    importOptions.import_animations = False
+    importOptions.mesh_type_to_import = unreal.FBXImportType.FBXIT_SKELETAL_MESH
+    importOptions.skeletal_mesh_import_data.import_morph_targets = True
+    # an lod group in the fbx becomes the lods of the skeletal mesh
+    importOptions.skeletal_mesh_import_data.import_mesh_lo_ds = True
+    importTask.options = importOptions
+    return importTask
+
+def CreateAnimationImportTask(filePath, destination, skeletalMeshPath, save=True):
+    skeletalMesh = unreal.EditorAssetLibrary.load_asset(skeletalMeshPath)
+    importTask = CreateImportTask(filePath, destination, save)
+    importOptions = unreal.FbxImportUI()
+    importOptions.import_mesh = False
+    importOptions.import_as_skeletal = True
+    importOptions.import_animations = True
+    importOptions.skeleton = skeletalMesh.skeleton
+    importOptions.mesh_type_to_import = unreal.FBXImportType.FBXIT_ANIMATION
+    importTask.options = importOptions
+    return importTask
+
+def ImportSkeletalMeshFile(filePath, destination):
+    importTask = CreateSkeletalMeshImportTask(filePath, destination)
+    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([importTask])
+    for importedPath in importTask.imported_object_paths:
+        if isinstance(unreal.EditorAssetLibrary.load_asset(importedPath), unreal.SkeletalMesh):
+            return importedPath
+    return None
+
+def ImportAnimationFile(filePath, destination, skeletalMeshPath):
+    importTask = CreateAnimationImportTask(filePath, destination, skeletalMeshPath)
+    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([importTask])
+    return list(importTask.imported_object_paths)
+
+# the asset an fbx was imported into before, named after the file
+def GetSourceHash(filePath, destination):
+    assetPath = destination + "/" + os.path.splitext(os.path.basename(filePath))[0]
+    if not unreal.EditorAssetLibrary.does_asset_exist(assetPath):
+        return None
+    return unreal.EditorAssetLibrary.get_metadata_tag(unreal.EditorAssetLibrary.load_asset(assetPath), SOURCE_HASH_TAG)
+
+# imports the tasks in one call without saving, tags what came in with the source hash and returns the assets
+def RunImportTasks(importTasks, hashes):
+    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks(importTasks)
+    importedAssets = []
+    for importTask, sourceHash in zip(importTasks, hashes):
+        for importedPath in importTask.imported_object_paths:
+            importedAsset = unreal.EditorAssetLibrary.load_asset(importedPath)
+            unreal.EditorAssetLibrary.set_metadata_tag(importedAsset, SOURCE_HASH_TAG, sourceHash)
+            importedAssets.append(importedAsset)
+    return importedAssets
+
+# Imports every file of the batch manifest, a json list of {"type", "path", "destination", "hash", "skeletalMesh"}.
+# Files whose asset already carries the same source hash are skipped, the skeletal meshes go in before the clips that
+# need their skeletons and the packages are saved once at the end. With save off they are left for SaveImportedAssets,
+# so the files of an export can come in one by one while it runs. Returns a json summary of what happened.
+def ImportBatch(manifestJson, save=True):
+    entries = json.loads(manifestJson)
+    changedEntries = [entry for entry in entries if not entry["hash"] or GetSourceHash(entry["path"], entry["destination"]) != entry["hash"]]
+    meshEntries = [entry for entry in changedEntries if entry["type"] == "skeletalMesh"]
+    animEntries = [entry for entry in changedEntries if entry["type"] != "skeletalMesh"]
+
+    importedAssets = []
+    if meshEntries:
+        importTasks = [CreateSkeletalMeshImportTask(entry["path"], entry["destination"], False) for entry in meshEntries]
+        importedAssets += RunImportTasks(importTasks, [entry["hash"] for entry in meshEntries])
+    if animEntries:
+        importTasks = [CreateAnimationImportTask(entry["path"], entry["destination"], entry["skeletalMesh"], False) for entry in animEntries]
+        importedAssets += RunImportTasks(importTasks, [entry["hash"] for entry in animEntries])
+
+    if importedAssets and save:
+        unreal.EditorAssetLibrary.save_loaded_assets(importedAssets, only_if_is_dirty=False)
+    return json.dumps({"imported": [entry["path"] for entry in changedEntries], "skipped": len(entries) - len(changedEntries)})
+
+# saves what the ImportBatch calls without saving left dirty under the destinations, a json list of content folders
+def SaveImportedAssets(destinationsJson):
+    destinations = json.loads(destinationsJson)
+    for destination in destinations:
+        if unreal.EditorAssetLibrary.does_directory_exist(destination):
+            unreal.EditorAssetLibrary.save_directory(destination, only_if_is_dirty=True, recursive=True)
+    return json.dumps({"saved": destinations})
@@ -0,0 +1,181 @@
+import json
+import os
+import struct
+import numpy as np
+
+# Saved animation states: the sampled local transform of every joint on every frame of a clip, stored as
+# (frames, joints, 10) float32 channels - translate xyz, rotation quaternion xyzw, scale xyz - behind a small
+# json header. The data is memory mapped on first access, so opening a large library only reads headers.
+ANIM_STATE_MAGIC = b"ANIMSTATE1\n"
+ANIM_STATE_EXTENSION = ".animstate"
+CHANNEL_COUNT = 10
+DATA_ALIGNMENT = 64
+
+# maya rotate order enum to the order the axes are applied in
+ROTATE_ORDERS = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+
+def QuaternionMultiply(a, b):
+    ax, ay, az, aw = np.moveaxis(a, -1, 0)
+    bx, by, bz, bw = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    ], axis=-1)
+
+def EulerToQuaternions(eulerDegrees, rotateOrder=0):
+    halfAngles = np.radians(np.asarray(eulerDegrees, dtype=np.float64)) / 2
+    axisQuaternions = {}
+    for axisIndex, axisName in enumerate("xyz"):
+        axisQuaternion = np.zeros(halfAngles.shape[:-1] + (4,))
+        axisQuaternion[..., axisIndex] = np.sin(halfAngles[..., axisIndex])
+        axisQuaternion[..., 3] = np.cos(halfAngles[..., axisIndex])
+        axisQuaternions[axisName] = axisQuaternion
+
+    # the first axis of the order is applied first, so it ends up rightmost in the product
+    quaternion = None
+    for axisName in ROTATE_ORDERS[rotateOrder]:
+        quaternion = axisQuaternions[axisName] if quaternion is None else QuaternionMultiply(axisQuaternions[axisName], quaternion)
+    return quaternion
+
+# every joint over the range through the API sampler, one context evaluation per frame instead of a getAttr per plug and frame
+def SampleJointTransforms(joints, frameMin, frameMax):
+    import transformSampler
+    return transformSampler.SampleJointTransforms(joints, frameMin, frameMax)
+
+def SaveAnimState(path, jointNames, frameMin, frameMax, data, metadata=None):
+    data = np.ascontiguousarray(data, dtype=np.float32)
+    if data.shape != (int(frameMax - frameMin) + 1, len(jointNames), CHANNEL_COUNT):
+        raise Exception(f"animation state data has shape {data.shape}, does not match the frame range and joints")
+
+    header = {
+        "jointNames": list(jointNames),
+        "frameMin": frameMin,
+        "frameMax": frameMax,
+        "shape": list(data.shape),
+        "dtype": "float32",
+        "metadata": metadata or {},
+    }
+    headerBytes = json.dumps(header).encode("utf-8")
+    headerEnd = len(ANIM_STATE_MAGIC) + 4 + len(headerBytes)
+    padding = (-headerEnd) % DATA_ALIGNMENT
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as stateFile:
+        stateFile.write(ANIM_STATE_MAGIC)
+        stateFile.write(struct.pack("<I", len(headerBytes)))
+        stateFile.write(headerBytes)
+        stateFile.write(b"\0" * padding)
+        stateFile.write(data.tobytes())
+    return AnimState(path, header, headerEnd + padding)
+
+def LoadAnimState(path):
+    with open(path, "rb") as stateFile:
+        if stateFile.read(len(ANIM_STATE_MAGIC)) != ANIM_STATE_MAGIC:
+            raise Exception(f"{path} is not an animation state file")
+        headerLength = struct.unpack("<I", stateFile.read(4))[0]
+        header = json.loads(stateFile.read(headerLength).decode("utf-8"))
+
+    headerEnd = len(ANIM_STATE_MAGIC) + 4 + headerLength
+    return AnimState(path, header, headerEnd + (-headerEnd) % DATA_ALIGNMENT)
+
+class AnimState:
+    def __init__(self, path, header, dataOffset):
+        self.path = path
+        self.header = header
+        self.dataOffset = dataOffset
+        self.mappedData = None
+
+    @property
+    def jointNames(self):
+        return self.header["jointNames"]
+
+    @property
+    def frameMin(self):
+        return self.header["frameMin"]
+
+    @property
+    def frameMax(self):
+        return self.header["frameMax"]
+
+    @property
+    def data(self):
+        if self.mappedData is None:
+            self.mappedData = np.memmap(self.path, dtype=self.header["dtype"], mode="r", offset=self.dataOffset, shape=tuple(self.header["shape"]))
+        return self.mappedData
+
+# Data oriented class
+class AnimStateDiff:
+    def __init__(self, jointNames, frames, translateDiffs, rotationDiffs, scaleDiffs):
+        self.jointNames = jointNames
+        self.frames = frames
+        # largest difference per joint over all the compared frames, rotation in degrees
+        self.translateDiffs = translateDiffs
+        self.rotationDiffs = rotationDiffs
+        self.scaleDiffs = scaleDiffs
+
+    def GetMaxDiffs(self):
+        if not len(self.jointNames):
+            return 0.0, 0.0, 0.0
+        return float(self.translateDiffs.max()), float(self.rotationDiffs.max()), float(self.scaleDiffs.max())
+
+    def GetChangedJoints(self, translateTolerance=1e-4, rotationTolerance=1e-2, scaleTolerance=1e-4):
+        changed = (self.translateDiffs > translateTolerance) | (self.rotationDiffs > rotationTolerance) | (self.scaleDiffs > scaleTolerance)
+        return [jointName for jointName, isChanged in zip(self.jointNames, changed) if isChanged]
+
+# angle in degrees between the rotations, the stored quaternions are float32 so they get renormalized first and the
+# angle comes from atan2, which stays exact near 0 where arccos of the dot product turns rounding into ~0.05 degrees
+def GetQuaternionAngles(quaternionsA, quaternionsB):
+    quaternionsA = np.asarray(quaternionsA, dtype=np.float64)
+    quaternionsB = np.asarray(quaternionsB, dtype=np.float64)
+    quaternionsA = quaternionsA / np.linalg.norm(quaternionsA, axis=-1, keepdims=True)
+    quaternionsB = quaternionsB / np.linalg.norm(quaternionsB, axis=-1, keepdims=True)
+    # q and -q are the same rotation, b is flipped onto the side of a
+    quaternionsB = np.where(np.sum(quaternionsA * quaternionsB, axis=-1, keepdims=True) < 0, -quaternionsB, quaternionsB)
+    # for unit quaternions |a - b| = 2 sin(angle / 4) and |a + b| = 2 cos(angle / 4)
+    return np.degrees(4 * np.arctan2(np.linalg.norm(quaternionsA - quaternionsB, axis=-1), np.linalg.norm(quaternionsA + quaternionsB, axis=-1)))
+
+# compares the joints and frames both states have in common
+def DiffAnimStates(stateA, stateB):
+    jointIndicesB = {jointName: i for i, jointName in enumerate(stateB.jointNames)}
+    jointNames = [jointName for jointName in stateA.jointNames if jointName in jointIndicesB]
+    indicesA = [stateA.jointNames.index(jointName) for jointName in jointNames]
+    indicesB = [jointIndicesB[jointName] for jointName in jointNames]
+
+    frameMin = max(stateA.frameMin, stateB.frameMin)
+    frameMax = min(stateA.frameMax, stateB.frameMax)
+    if frameMax < frameMin or not jointNames:
+        empty = np.zeros(0)
+        return AnimStateDiff([], range(0), empty, empty, empty)
+
+    framesA = slice(int(frameMin - stateA.frameMin), int(frameMax - stateA.frameMin) + 1)
+    framesB = slice(int(frameMin - stateB.frameMin), int(frameMax - stateB.frameMin) + 1)
+    dataA = np.asarray(stateA.data[framesA][:, indicesA], dtype=np.float64)
+    dataB = np.asarray(stateB.data[framesB][:, indicesB], dtype=np.float64)
+
+    translateDiffs = np.linalg.norm(dataA[..., 0:3] - dataB[..., 0:3], axis=-1).max(axis=0)
+    rotationDiffs = GetQuaternionAngles(dataA[..., 3:7], dataB[..., 3:7]).max(axis=0)
+    scaleDiffs = np.abs(dataA[..., 7:10] - dataB[..., 7:10]).max(axis=(0, 2))
+    return AnimStateDiff(jointNames, range(int(frameMin), int(frameMax) + 1), translateDiffs, rotationDiffs, scaleDiffs)
+
+# every state in a directory, only the headers are read until a state's data is used
+class AnimStateLibrary:
+    def __init__(self, directory):
+        self.directory = directory
+        self.states = {}
+
+    def GetStateNames(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(os.path.splitext(fileName)[0] for fileName in os.listdir(self.directory) if fileName.endswith(ANIM_STATE_EXTENSION))
+
+    def GetState(self, stateName):
+        if stateName not in self.states:
+            self.states[stateName] = LoadAnimState(os.path.join(self.directory, stateName + ANIM_STATE_EXTENSION))
+        return self.states[stateName]
+
+    def SaveState(self, stateName, jointNames, frameMin, frameMax, data, metadata=None):
+        state = SaveAnimState(os.path.join(self.directory, stateName + ANIM_STATE_EXTENSION), jointNames, frameMin, frameMax, data, metadata)
+        self.states[stateName] = state
+        return state
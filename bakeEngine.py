@@ -0,0 +1,76 @@
+import maya.cmds as mc
+from exportTrace import tracer
+
+BAKED_ATTRS = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+
+def GetFrameRangeUnion(frameRanges):
+    union = []
+    for frameMin, frameMax in sorted(frameRanges):
+        # touching ranges share their samples as well, merge them
+        if union and frameMin <= union[-1][1] + 1:
+            union[-1][1] = max(union[-1][1], frameMax)
+            continue
+        union.append([frameMin, frameMax])
+    return [tuple(frameRange) for frameRange in union]
+
+def GetUniqueFrameCount(frameRanges):
+    return sum(frameMax - frameMin + 1 for frameMin, frameMax in GetFrameRangeUnion(frameRanges))
+
+# An undo chunk that is undone on exit, so everything built inside it leaves the scene again. Shared by the bake,
+# the key reduction and the LOD chain. Undo is turned on for the chunk when it is off, the default in mayapy.
+class UndoneChunk:
+    def __init__(self, chunkName):
+        self.chunkName = chunkName
+        self.undoWasOff = False
+
+    def __enter__(self):
+        self.undoWasOff = not mc.undoInfo(q=True, state=True)
+        if self.undoWasOff:
+            mc.undoInfo(state=True)
+        mc.undoInfo(openChunk=True, chunkName=self.chunkName)
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        mc.undoInfo(closeChunk=True)
+        try:
+            with tracer.Span("Undo" + self.chunkName):
+                mc.undo()
+        finally:
+            if self.undoWasOff:
+                mc.undoInfo(state=False)
+        return False
+
+# Samples the skeleton once over all the clip ranges into plain anim curves, every clip export afterwards only
+# reads those curves instead of evaluating the rig again. The bake is undone on exit so the rig stays untouched.
+class SingleBakePass:
+    def __init__(self, joints, frameRanges):
+        self.joints = joints
+        self.clipCount = len(frameRanges)
+        self.frameRanges = GetFrameRangeUnion(frameRanges)
+        self.undoneChunk = UndoneChunk("SingleBakePass")
+        self.isBaked = False
+
+    def ShouldBake(self):
+        # a single clip gains nothing over the fbx bake
+        return len(self.joints) > 0 and self.clipCount > 1
+
+    def __enter__(self):
+        if not self.ShouldBake():
+            return self
+
+        self.undoneChunk.__enter__()
+        self.isBaked = True
+        # one bake per merged range, the gaps between disjoint clip groups are never evaluated. Each bake keeps the
+        # keys outside its range, so the ranges baked before it stay on the curves
+        with tracer.Span("SingleBakePass", frames=GetUniqueFrameCount(self.frameRanges), ranges=len(self.frameRanges), joints=len(self.joints)):
+            for bakeStart, bakeEnd in self.frameRanges:
+                mc.bakeResults(self.joints, t=(bakeStart, bakeEnd), at=BAKED_ATTRS, sampleBy=1, simulation=True,
+                               disableImplicitControl=True, preserveOutsideKeys=True, minimizeRotation=True)
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if not self.isBaked:
+            return False
+
+        self.isBaked = False
+        return self.undoneChunk.__exit__(excType, excValue, traceback)
@@ -0,0 +1,97 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import mayapyPool
+import batchExportWorker
+
+# Headless batch export of many scenes through MayaToUE, spread over a pool of mayapy processes.
+# python batchExport.py scenes/ --spec spec.json --output-dir exports --workers 8
+#
+# The spec gives the rootJoint, meshes, scale and clips ({subfix, frameMin, frameMax}) for every scene,
+# a "scenes" entry keyed by scene file name can override any of them per scene. A "characters" list of those
+# settings exports several characters of one scene together, see MayaToUE2.ExportProfile.
+SCENE_EXTENSIONS = [".ma", ".mb"]
+
+def LoadSpec(specPath):
+    with open(specPath, "r") as specFile:
+        if os.path.splitext(specPath)[1].lower() in [".yaml", ".yml"]:
+            try:
+                import yaml
+            except ImportError:
+                raise Exception("PyYAML is needed to read yaml specs, please install it or use a json spec!")
+            return yaml.safe_load(specFile)
+        return json.load(specFile)
+
+def FindScenes(paths, recursive=False):
+    scenes = []
+    for path in paths:
+        if not os.path.isdir(path):
+            scenes.append(os.path.abspath(path))
+            continue
+
+        pattern = os.path.join(path, "**", "*") if recursive else os.path.join(path, "*")
+        for scenePath in sorted(glob.glob(pattern, recursive=recursive)):
+            if os.path.splitext(scenePath)[1].lower() in SCENE_EXTENSIONS:
+                scenes.append(os.path.abspath(scenePath))
+    return scenes
+
+def GetSceneSpec(spec, scenePath, outputDir):
+    sceneName = os.path.splitext(os.path.basename(scenePath))[0]
+    sceneSpec = {key: value for key, value in spec.items() if key != "scenes"}
+    sceneSpec.update(spec.get("scenes", {}).get(os.path.basename(scenePath), {}))
+    sceneSpec.setdefault("fileName", sceneName)
+    sceneSpec.setdefault("saveDir", os.path.join(outputDir, sceneName))
+
+    if not sceneSpec.get("rootJoint") and not sceneSpec.get("characters"):
+        raise Exception(f"no rootJoint or characters given for {scenePath}")
+    return sceneSpec
+
+def RunBatchExport(scenePaths, spec, outputDir, workerCount=None, forceFullExport=False):
+    workerCount = mayapyPool.GetWorkerCount(workerCount)
+    # one scene per payload so a slow scene never holds back the queue behind it
+    payloads = [{
+        "scenes": [{"path": scenePath, "spec": GetSceneSpec(spec, scenePath, outputDir)}],
+        "forceFullExport": forceFullExport,
+    } for scenePath in scenePaths]
+
+    sceneResults = []
+    for payload, workerResult in zip(payloads, mayapyPool.RunMayapyJobs(batchExportWorker.__file__, payloads, workerCount)):
+        if workerResult.Succeeded():
+            sceneResults += workerResult.results
+            continue
+        sceneResults.append({"scene": payload["scenes"][0]["path"], "exported": [], "error": workerResult.error})
+    return sceneResults
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Export many maya scenes to fbx for unreal with MayaToUE.")
+    parser.add_argument("scenes", nargs="+", help="scene files or directories holding .ma/.mb files")
+    parser.add_argument("--spec", required=True, help="json or yaml file with rootJoint, meshes, scale and clips")
+    parser.add_argument("--output-dir", required=True, help="every scene exports into <output-dir>/<scene name>")
+    parser.add_argument("--workers", type=int, default=None, help="number of mayapy processes, defaults to the core count")
+    parser.add_argument("--recursive", action="store_true", help="look for scenes in sub directories too")
+    parser.add_argument("--force", action="store_true", help="ignore the export manifests and export everything")
+    parsedArgs = parser.parse_args(args)
+
+    scenePaths = FindScenes(parsedArgs.scenes, parsedArgs.recursive)
+    if not scenePaths:
+        print("no scenes found")
+        return 1
+
+    spec = LoadSpec(parsedArgs.spec)
+    sceneResults = RunBatchExport(scenePaths, spec, os.path.abspath(parsedArgs.output_dir), parsedArgs.workers, parsedArgs.force)
+
+    failedCount = 0
+    for sceneResult in sceneResults:
+        if sceneResult["error"]:
+            failedCount += 1
+            print(f"FAILED {sceneResult['scene']}\n{sceneResult['error']}")
+            continue
+        print(f"ok     {sceneResult['scene']} ({len(sceneResult['exported'])} files written)")
+
+    print(f"{len(sceneResults) - failedCount}/{len(sceneResults)} scenes exported")
+    return 1 if failedCount else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+import traceback
+
+# runs inside a headless mayapy: mayapy batchExportWorker.py <payload.json> <result.json>
+def ExportScene(scenePath, spec, forceFullExport):
+    import maya.cmds as mc
+    import MayaToUE2
+
+    mc.file(scenePath, o=True, f=True)
+    spec = dict(spec)
+    spec.setdefault("sendToUnreal", False)
+    if spec.get("characters"):
+        exporter = MayaToUE2.ExportProfile()
+    else:
+        exporter = MayaToUE2.MayaToUE()
+    exporter.LoadSpec(spec)
+
+    exportedPaths = exporter.SaveFiles(forceFullExport)
+    if spec["sendToUnreal"]:
+        import ueTransport
+        ueTransport.GetUnrealTransport().WaitUntilDone()
+    return exportedPaths
+
+def RunPayload(payload):
+    import maya.cmds as mc
+    mc.loadPlugin("fbxmaya", quiet=True)
+
+    results = []
+    for scene in payload["scenes"]:
+        result = {"scene": scene["path"], "exported": [], "error": ""}
+        try:
+            result["exported"] = ExportScene(scene["path"], scene["spec"], payload.get("forceFullExport", False))
+        except Exception:
+            result["error"] = traceback.format_exc()
+        results.append(result)
+    return results
+
+def main(payloadPath, resultPath):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    try:
+        with open(payloadPath, "r") as payloadFile:
+            payload = json.load(payloadFile)
+        results = RunPayload(payload)
+        with open(resultPath, "w") as resultFile:
+            json.dump(results, resultFile)
+    finally:
+        maya.standalone.uninitialize()
+
+if __name__ == "__main__":
+    main(sys.argv[1], sys.argv[2])
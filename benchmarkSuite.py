@@ -0,0 +1,158 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import fakeMaya
+
+# Runs LimbRigger.AutoFindJnts + RigLimb and MayaToUE.SaveFiles against the recording maya.cmds stand-in and
+# reports how many commands each rigged limb and each exported clip costs as the scene grows.
+# python benchmarkSuite.py [--sizes 1 10 100 500] [--breakdown]
+# Exits with 1 when a threshold below is exceeded, so extra listRelatives, setAttr or FBXExport calls get caught.
+DEFAULT_SIZES = [1, 10, 100, 500]
+SKELETON_JOINT_COUNT = 60
+CLIP_LENGTH = 30
+
+# maximum commands per added limb / clip, measured between the two largest scenarios so fixed costs drop out
+THRESHOLDS = {
+    "RigLimb": {"total": 60, "listRelatives": 1, "setAttr": 18, "expression": 0, "xform": 1},
+    "SaveFiles": {"total": 14, "FBXExport": 1, "listRelatives": 0, "bakeResults": 0, "ls": 0},
+}
+
+cmds = fakeMaya.Install()
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Data oriented class
+class ScenarioResult:
+    def __init__(self, benchmarkName, size):
+        self.benchmarkName = benchmarkName
+        self.size = size
+        self.calls = {}
+        self.totalCalls = 0
+        self.wallTime = 0.0
+        self.simulatedTime = 0.0
+
+def RecordScenario(benchmarkName, size, run):
+    result = ScenarioResult(benchmarkName, size)
+    cmds.ResetCounters()
+    startTime = time.perf_counter()
+    run()
+    result.wallTime = time.perf_counter() - startTime
+    result.calls = dict(cmds.calls)
+    result.totalCalls = cmds.GetTotalCalls()
+    result.simulatedTime = cmds.simulatedTime
+    return result
+
+def ResetScene():
+    import skeletonIndex
+    cmds.Reset()
+    # a new scene in maya fires the callback that drops every cached index
+    skeletonIndex.ClearSkeletonIndices()
+    return cmds.scene
+
+def BuildLimbScene(limbCount):
+    scene = ResetScene()
+    scene.CreateNode("root", "joint")
+    limbRoots = []
+    for i in range(limbCount):
+        limbNames = [f"limb{i}_upper", f"limb{i}_lower", f"limb{i}_end"]
+        scene.AddJointChain(limbNames, "root", offset=(i * 2.0, 10.0, 0.0))
+        limbRoots.append(limbNames[0])
+    return limbRoots
+
+def RunRigLimbScenario(limbCount):
+    import limbriggingtool
+    limbRoots = BuildLimbScene(limbCount)
+
+    def Run():
+        rigger = limbriggingtool.LimbRigger()
+        for limbRoot in limbRoots:
+            cmds.scene.selection = [limbRoot]
+            rigger.AutoFindJnts()
+            rigger.RigLimb()
+
+    return RecordScenario("RigLimb", limbCount, Run)
+
+def BuildExportScene(clipCount):
+    scene = ResetScene()
+    jntNames = [f"jnt{i}" for i in range(SKELETON_JOINT_COUNT)]
+    scene.AddJointChain(jntNames)
+    for jntName in jntNames:
+        scene.AddAnimCurves(jntName, range(1, clipCount * CLIP_LENGTH + 1, 5))
+    scene.CreateNode("body", "mesh")
+    return jntNames[0]
+
+def RunSaveFilesScenario(clipCount, saveDir):
+    import MayaToUE2
+    rootJnt = BuildExportScene(clipCount)
+
+    mayaToUE = MayaToUE2.MayaToUE()
+    mayaToUE.rootJnt = rootJnt
+    mayaToUE.meshes = ["body"]
+    mayaToUE.fileName = "bench"
+    mayaToUE.saveDir = os.path.join(saveDir, f"clips{clipCount}")
+    mayaToUE.sendToUnreal = False
+    # the validation reads the scene through OpenMaya, which the recording stand-in does not have
+    mayaToUE.validateBeforeExport = False
+    for i in range(clipCount):
+        animClip = mayaToUE.AddNewAnimEntry()
+        animClip.subfix = f"_clip{i}"
+        animClip.frameMin = i * CLIP_LENGTH + 1
+        animClip.frameMax = (i + 1) * CLIP_LENGTH
+
+    return RecordScenario("SaveFiles", clipCount, lambda: mayaToUE.SaveFiles(forceFullExport=True))
+
+def GetMarginalCalls(smaller, larger, commandName=None):
+    sizeDelta = larger.size - smaller.size
+    if commandName is None:
+        return (larger.totalCalls - smaller.totalCalls) / sizeDelta
+    return (larger.calls.get(commandName, 0) - smaller.calls.get(commandName, 0)) / sizeDelta
+
+def PrintResults(results, unitName, breakdown):
+    print(f"{results[0].benchmarkName}: commands per {unitName}")
+    print(f"  {'size':>6} {'commands':>10} {'per ' + unitName:>12} {'wall ms':>10} {'simulated s':>12}")
+    for result in results:
+        print(f"  {result.size:>6} {result.totalCalls:>10} {result.totalCalls / result.size:>12.1f} {result.wallTime * 1000:>10.1f} {result.simulatedTime:>12.2f}")
+
+    if breakdown:
+        largest = results[-1]
+        for commandName, count in sorted(largest.calls.items(), key=lambda item: -item[1]):
+            print(f"    {commandName:<28} {count / largest.size:>8.2f} per {unitName}")
+
+def CheckThresholds(results):
+    failures = []
+    if len(results) < 2:
+        return failures
+
+    smaller, larger = results[-2], results[-1]
+    for commandName, maxCalls in THRESHOLDS[larger.benchmarkName].items():
+        marginalCalls = GetMarginalCalls(smaller, larger, None if commandName == "total" else commandName)
+        if marginalCalls > maxCalls:
+            failures.append(f"{larger.benchmarkName}: {marginalCalls:.2f} {commandName} calls per unit, threshold is {maxCalls}")
+    return failures
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Command count benchmarks for the limb rigger and MayaToUE export.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="limb and clip counts to run")
+    parser.add_argument("--breakdown", action="store_true", help="print the per command counts of the largest run")
+    parsedArgs = parser.parse_args(args)
+    sizes = sorted(parsedArgs.sizes)
+
+    saveDir = tempfile.mkdtemp(prefix="benchmarkSuite_")
+    try:
+        rigResults = [RunRigLimbScenario(size) for size in sizes]
+        exportResults = [RunSaveFilesScenario(size, saveDir) for size in sizes]
+    finally:
+        shutil.rmtree(saveDir, ignore_errors=True)
+
+    PrintResults(rigResults, "limb", parsedArgs.breakdown)
+    PrintResults(exportResults, "clip", parsedArgs.breakdown)
+
+    failures = CheckThresholds(rigResults) + CheckThresholds(exportResults)
+    for failure in failures:
+        print("FAILED " + failure)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import maya.cmds as mc
+
+# Controller shapes stored as plain cv data at size 1. Points are scaled before the curve is created,
+# so there is no mel string to parse and no scale + makeIdentity to freeze afterwards.
+CIRCLE_SECTION = 0.78361162489122504
+CIRCLE_RADIUS = 1.1081941875543879
+
+SHAPES = {
+    "box": {
+        "degree": 1,
+        "periodic": False,
+        "points": [
+            (-0.5, 0.5, -0.5), (-0.5, 0.5, 0.5), (0.5, 0.5, 0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5),
+            (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5), (0.5, 0.5, 0.5), (0.5, -0.5, 0.5),
+            (0.5, -0.5, -0.5), (0.5, -0.5, 0.5), (-0.5, -0.5, 0.5), (-0.5, 0.5, 0.5), (-0.5, -0.5, 0.5),
+            (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, -0.5, 0.5), (-0.5, -0.5, 0.5),
+        ],
+    },
+    "plus": {
+        "degree": 1,
+        "periodic": False,
+        "points": [
+            (0, 0, 12), (1, 0, 12), (2, 0, 12), (2, 0, 13), (2, 0, 14), (3, 0, 14), (4, 0, 14), (4, 0, 15),
+            (4, 0, 16), (3, 0, 16), (2, 0, 16), (2, 0, 17), (2, 0, 18), (1, 0, 18), (0, 0, 18), (0, 0, 17),
+            (0, 0, 16), (-1, 0, 16), (-2, 0, 16), (-2, 0, 15), (-2, 0, 14), (-1, 0, 14), (0, 0, 14), (0, 0, 13),
+            (0, 0, 12),
+        ],
+    },
+    # same cvs as a circle with normal (1, 0, 0) and radius 1
+    "circle": {
+        "degree": 3,
+        "periodic": True,
+        "points": [
+            (0, CIRCLE_SECTION, -CIRCLE_SECTION), (0, 0, -CIRCLE_RADIUS), (0, -CIRCLE_SECTION, -CIRCLE_SECTION),
+            (0, -CIRCLE_RADIUS, 0), (0, -CIRCLE_SECTION, CIRCLE_SECTION), (0, 0, CIRCLE_RADIUS),
+            (0, CIRCLE_SECTION, CIRCLE_SECTION), (0, CIRCLE_RADIUS, 0),
+        ],
+    },
+}
+
+def GetShapeCurveArgs(shapeName, size):
+    shape = SHAPES[shapeName]
+    degree = shape["degree"]
+    points = [(x * size, y * size, z * size) for x, y, z in shape["points"]]
+    if not shape["periodic"]:
+        return {"d": degree, "p": points, "k": list(range(len(points) + degree - 1))}
+
+    # a periodic curve repeats its first degree cvs and has degree - 1 extra knots at both ends
+    points += points[:degree]
+    return {"d": degree, "p": points, "k": list(range(-degree + 1, len(points))), "per": True}
+
+def ApplyColor(ctrlName, color):
+    mc.setAttr(f"{ctrlName}.overrideEnabled", 1)
+    mc.setAttr(f"{ctrlName}.overrideRGBColors", 1)
+    mc.setAttr(f"{ctrlName}.overrideColorRGB", *color)
+
+def CreateController(shapeName, name, size=1, color=None):
+    ctrlName = mc.curve(n=name, **GetShapeCurveArgs(shapeName, size))
+    if color is not None:
+        ApplyColor(ctrlName, color)
+    return ctrlName
+
+# specs are (shapeName, name, size, color), the scaled cv data is worked out once per shape and size
+def CreateControllers(specs):
+    curveArgsCache = {}
+    ctrlNames = []
+    for shapeName, name, size, color in specs:
+        curveArgs = curveArgsCache.get((shapeName, size))
+        if curveArgs is None:
+            curveArgs = GetShapeCurveArgs(shapeName, size)
+            curveArgsCache[(shapeName, size)] = curveArgs
+
+        ctrlName = mc.curve(n=name, **curveArgs)
+        if color is not None:
+            ApplyColor(ctrlName, color)
+        ctrlNames.append(ctrlName)
+    return ctrlNames
+
+# rig controls the limb rigger builds from a shape, by name prefix, so existing rigs can be resized in place
+CONTROLLER_SHAPES_BY_PREFIX = {"ac_fk_": "circle", "ac_ik_": "box"}
+
+def GetControllerShapeName(ctrlName):
+    shortName = ctrlName.split("|")[-1]
+    for prefix, shapeName in CONTROLLER_SHAPES_BY_PREFIX.items():
+        if shortName.startswith(prefix):
+            return shapeName
+    return None
+
+# the size that best maps the shape cvs at size 1 onto the current cvs, so cv tweaks after creation are kept
+def GetControllerSize(shapeName, points):
+    shapePoints = SHAPES[shapeName]["points"]
+    dot = sum(px * sx + py * sy + pz * sz for (px, py, pz), (sx, sy, sz) in zip(points, shapePoints))
+    shapeLengthSquared = sum(sx * sx + sy * sy + sz * sz for sx, sy, sz in shapePoints)
+    return dot / shapeLengthSquared
+
+# one cv query and one cv edit per control, the cvs are scaled in object space around the control pivot
+def ResizeControllers(ctrlNames, size):
+    resizedCtrls = []
+    for ctrlName in ctrlNames:
+        shapeName = GetControllerShapeName(ctrlName)
+        if shapeName is None:
+            continue
+        points = mc.getAttr(f"{ctrlName}.cv[*]")
+        currentSize = GetControllerSize(shapeName, points)
+        if abs(currentSize) < 1e-6:
+            continue
+        ratio = size / currentSize
+        mc.setAttr(f"{ctrlName}.cv[0:{len(points) - 1}]", *[value * ratio for point in points for value in point])
+        resizedCtrls.append(ctrlName)
+    return resizedCtrls
+
+def ApplyColors(ctrlNames, color):
+    for ctrlName in ctrlNames:
+        ApplyColor(ctrlName, color)
@@ -0,0 +1,161 @@
+import bisect
+import hashlib
+import json
+import os
+import maya.cmds as mc
+import numpy as np
+import skinWeights
+from exportTrace import tracer
+
+
+def HashValues(*values):
+    return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
+# the bytes of a written file, what unreal compares against the asset it imported before
+def HashFile(path, chunkSize=1 << 20):
+    fileHash = hashlib.sha1()
+    with open(path, "rb") as hashedFile:
+        for chunk in iter(lambda: hashedFile.read(chunkSize), b""):
+            fileHash.update(chunk)
+    return fileHash.hexdigest()
+
+# the joint channels that place the skeleton at rest, read only where nothing drives them
+JOINT_REST_ATTRS = ["translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ", "scaleX", "scaleY", "scaleZ",
+                    "jointOrientX", "jointOrientY", "jointOrientZ", "rotateOrder"]
+
+# translateX counts as driven when the whole translate is connected
+def IsDrivenPlug(plug):
+    return plug.isDestination or (plug.isChild and plug.parent().isDestination)
+
+def UpdateHash(dataHash, values):
+    dataHash.update(np.asarray(values, dtype=np.float64).tobytes())
+
+def GetMeshFn(mesh):
+    import maya.api.OpenMaya as om
+    selection = om.MSelectionList()
+    selection.add(mesh)
+    return om.MFnMesh(selection.getDagPath(0))
+
+# points and polygons of a mesh shape or mesh data object
+def UpdateMeshHash(dataHash, meshFn):
+    import maya.api.OpenMaya as om
+    UpdateHash(dataHash, [value for point in meshFn.getPoints(om.MSpace.kObject) for value in point])
+    for polygonArray in meshFn.getVertices():
+        UpdateHash(dataHash, list(polygonArray))
+
+# the weights, influences and bind pose of a skinned mesh, and the undeformed mesh going into the skin cluster
+def UpdateSkinHash(dataHash, skin):
+    import maya.api.OpenMaya as om
+    UpdateHash(dataHash, skin.weights)
+    dataHash.update(repr([influencePath.fullPathName() for influencePath in skin.skinFn.influenceObjects()]).encode("utf-8"))
+
+    bindPreMatrixPlug = skin.skinFn.findPlug("bindPreMatrix", False)
+    for elementIndex in range(bindPreMatrixPlug.numElements()):
+        elementPlug = bindPreMatrixPlug.elementByPhysicalIndex(elementIndex)
+        UpdateHash(dataHash, [elementPlug.logicalIndex()] + list(om.MFnMatrixData(elementPlug.asMObject()).matrix()))
+
+    for inputGeometry in skin.skinFn.getInputGeometry():
+        UpdateMeshHash(dataHash, om.MFnMesh(inputGeometry))
+
+class SceneHasher:
+    def __init__(self, joints, meshes, scale):
+        self.joints = joints
+        self.meshes = meshes
+        self.scale = scale
+        self.curveData = None
+        self.skeletalMeshHash = None
+
+    def GetHierarchyHash(self):
+        # long names carry the full parent chain of every joint
+        return HashValues(sorted(mc.ls(self.joints, long=True)))
+
+    # the animated or constrained channels are left to the clip curves, so the hash does not change with the current frame
+    def GetJointRestHash(self):
+        import maya.api.OpenMaya as om
+        dataHash = hashlib.sha1()
+        selection = om.MSelectionList()
+        for jnt in self.joints:
+            selection.add(jnt)
+        for jointIndex in range(len(self.joints)):
+            nodeFn = om.MFnDependencyNode(selection.getDependNode(jointIndex))
+            plugs = [nodeFn.findPlug(attr, False) for attr in JOINT_REST_ATTRS if nodeFn.hasAttribute(attr)]
+            UpdateHash(dataHash, [plug.asDouble() for plug in plugs if not IsDrivenPlug(plug)])
+        return dataHash.hexdigest()
+
+    # a skinned mesh is hashed before the skin cluster deforms it, the deformed points would change with the frame
+    def GetMeshDataHash(self):
+        dataHash = hashlib.sha1()
+        for mesh in sorted(self.meshes):
+            skin = skinWeights.ReadSkinWeights(mesh)
+            if skin:
+                UpdateSkinHash(dataHash, skin)
+            else:
+                UpdateMeshHash(dataHash, GetMeshFn(mesh))
+        return dataHash.hexdigest()
+
+    # edits to the geometry, the skinning or the rest placement of the joints all show up in the skeletal mesh fbx
+    def GetSkeletalMeshHash(self):
+        if self.skeletalMeshHash is None:
+            with tracer.Span("HashSkeletalMesh", joints=len(self.joints), meshes=len(self.meshes)):
+                self.skeletalMeshHash = HashValues(self.GetHierarchyHash(), sorted(self.meshes), self.scale,
+                                                   self.GetJointRestHash(), self.GetMeshDataHash())
+        return self.skeletalMeshHash
+
+    def GetCurveData(self):
+        if self.curveData is not None:
+            return self.curveData
+
+        # the joints of a rig are usually driven through constraints, so collect every curve upstream of them
+        history = mc.listHistory(self.joints) or []
+        curves = sorted(set(mc.ls(history, type="animCurve")))
+
+        self.curveData = []
+        for curve in curves:
+            keys = mc.keyframe(curve, q=True, tc=True, vc=True) or []
+            times = keys[0::2]
+            values = keys[1::2]
+            inAngles = mc.keyTangent(curve, q=True, ia=True) or []
+            outAngles = mc.keyTangent(curve, q=True, oa=True) or []
+            self.curveData.append((curve, times, values, inAngles, outAngles))
+        return self.curveData
+
+    def GetAnimClipHash(self, frameMin, frameMax):
+        clipCurveData = []
+        for curve, times, values, inAngles, outAngles in self.GetCurveData():
+            # keep the keys inside the range plus the neighbours that shape its interpolation
+            first = max(0, bisect.bisect_right(times, frameMin) - 1)
+            last = bisect.bisect_left(times, frameMax)
+            keySlice = slice(first, last + 1)
+            clipCurveData.append((curve, times[keySlice], values[keySlice], inAngles[keySlice], outAngles[keySlice]))
+
+        return HashValues(self.GetSkeletalMeshHash(), frameMin, frameMax, clipCurveData)
+
+class ExportManifest:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r") as manifestFile:
+                self.entries = json.load(manifestFile)
+
+    def GetKey(self, outputPath):
+        return os.path.relpath(outputPath, os.path.dirname(self.path)).replace("\\", "/")
+
+    def IsUpToDate(self, outputPath, hash):
+        return self.entries.get(self.GetKey(outputPath)) == hash and os.path.exists(outputPath)
+
+    def GetHash(self, outputPath):
+        return self.entries.get(self.GetKey(outputPath))
+
+    def Update(self, outputPath, hash):
+        self.entries[self.GetKey(outputPath)] = hash
+
+    def Clear(self):
+        self.entries = {}
+
+    # written next to the manifest and swapped in, an interrupted save leaves the previous manifest intact
+    def Save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w") as manifestFile:
+            json.dump(self.entries, manifestFile, indent=4, sort_keys=True)
+        os.replace(self.path + ".tmp", self.path)
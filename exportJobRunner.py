@@ -0,0 +1,67 @@
+import traceback
+import maya.cmds as mc
+import fbxExport
+from exportTrace import tracer
+
+# Runs the export tasks of a SaveFiles inside the session one file per step, each step queued with evalDeferred at
+# the lowest priority so maya redraws and handles input (a cancel click) in between. A cancel takes effect between
+# two files: every file written so far is complete and in the manifest, the rest keeps its old hash and is exported
+# again next time. The clips are baked one by one, a SingleBakePass undo chunk must not stay open across idle events.
+def GetPlaybackRange():
+    return {flag: mc.playbackOptions(q=True, **{flag: True}) for flag in ["min", "max", "ast", "aet"]}
+
+def SetPlaybackRange(playbackRange):
+    mc.playbackOptions(e=True, **playbackRange)
+
+class ExportJob:
+    def __init__(self, tasks, onTaskFinished, onFinished=None, progressCallback=None):
+        self.tasks = list(tasks)
+        self.onTaskFinished = onTaskFinished
+        self.onFinished = onFinished
+        self.progressCallback = progressCallback
+        self.finishedCount = 0
+        self.isRunning = False
+        self.isCancelled = False
+        self.error = ""
+        self.playbackRange = None
+
+    def Start(self):
+        # the clip exports set the playback range to each clip, the user gets theirs back at the end
+        self.playbackRange = GetPlaybackRange()
+        self.isRunning = True
+        self.ScheduleNextStep()
+
+    # the file being written is finished, nothing after it starts
+    def Cancel(self):
+        self.isCancelled = True
+
+    def ScheduleNextStep(self):
+        mc.evalDeferred(self.RunNextStep, lowestPriority=True)
+
+    def RunNextStep(self):
+        if self.isCancelled or self.finishedCount >= len(self.tasks):
+            self.Finish()
+            return
+
+        task = self.tasks[self.finishedCount]
+        # a failing manifest save or progress update ends the job as well, it must not stay running with a modal dialog up
+        try:
+            with tracer.Span("ExportJobStep", path=task["path"]):
+                fbxExport.RunExportTask(task)
+            self.finishedCount += 1
+            self.onTaskFinished(task, "")
+            if self.progressCallback:
+                self.progressCallback(self.finishedCount, len(self.tasks), task)
+        except Exception:
+            self.error = traceback.format_exc()
+            self.Finish()
+            return
+        self.ScheduleNextStep()
+
+    def Finish(self):
+        self.isRunning = False
+        try:
+            SetPlaybackRange(self.playbackRange)
+        finally:
+            if self.onFinished:
+                self.onFinished(self)
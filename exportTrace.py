@@ -0,0 +1,108 @@
+import functools
+import json
+import os
+import threading
+import time
+
+# Nested timing spans written as a Chrome trace (open the json in chrome://tracing or ui.perfetto.dev).
+# While the tracer is off Span() hands back one shared do-nothing span, so instrumented code pays a single call.
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+    def SetArg(self, name, value):
+        pass
+
+NULL_SPAN = NullSpan()
+
+class TraceSpan:
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.startTime = 0
+
+    def __enter__(self):
+        self.startTime = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        endTime = time.perf_counter_ns()
+        if excType is not None:
+            self.args["error"] = f"{excValue}"
+        self.tracer.AddEvent(self.name, self.startTime, endTime - self.startTime, self.args)
+        return False
+
+    def SetArg(self, name, value):
+        self.args[name] = value
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.lock = threading.Lock()
+
+    def Span(self, name, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return TraceSpan(self, name, args)
+
+    def Start(self):
+        self.Clear()
+        self.enabled = True
+
+    def Stop(self):
+        self.enabled = False
+
+    def Clear(self):
+        with self.lock:
+            self.events = []
+
+    def AddEvent(self, name, startTime, duration, args):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": startTime / 1000.0,
+            "dur": duration / 1000.0,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self.lock:
+            self.events.append(event)
+
+    def WriteChromeTrace(self, path):
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as traceFile:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, traceFile)
+
+    # (name, count, total ms) per span name, most expensive first
+    def GetSummary(self):
+        totals = {}
+        with self.lock:
+            for event in self.events:
+                count, totalTime = totals.get(event["name"], (0, 0.0))
+                totals[event["name"]] = (count + 1, totalTime + event["dur"] / 1000.0)
+        return sorted(((name, count, totalTime) for name, (count, totalTime) in totals.items()), key=lambda item: -item[2])
+
+    def GetSummaryText(self, maxLines=8):
+        lines = [f"{name}: {totalTime:.1f} ms ({count}x)" for name, count, totalTime in self.GetSummary()[:maxLines]]
+        return "\n".join(lines)
+
+tracer = Tracer()
+
+def Traced(name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return function(*args, **kwargs)
+            with tracer.Span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
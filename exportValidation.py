@@ -0,0 +1,117 @@
+import maya.api.OpenMaya as om
+import skeletonIndex
+from exportTrace import Traced, tracer
+
+# Checks the root joint, joints, meshes and clip ranges of an export before any bake time is spent, and reports every
+# problem at once. The nodes go into one MSelectionList and are read through the API, no cmds call per node.
+SCALE_TOLERANCE = 1e-3
+
+def GetDagPaths(names):
+    dagPaths = {}
+    selection = om.MSelectionList()
+    for name in names:
+        try:
+            selection.add(name)
+        except RuntimeError:
+            # not in the scene, left out so the caller reports it as missing
+            continue
+        dagPaths[name] = selection.getDagPath(selection.length() - 1)
+    return dagPaths
+
+def IsUniformScale(dagPath):
+    scale = om.MTransformationMatrix(dagPath.inclusiveMatrix()).scale(om.MSpace.kWorld)
+    return max(scale) - min(scale) <= SCALE_TOLERANCE * max(abs(value) for value in scale) and min(scale) > 0
+
+def GetSkinClusterNode(shapePath):
+    skinClusterIter = om.MItDependencyGraph(shapePath.node(), om.MFn.kSkinClusterFilter, om.MItDependencyGraph.kUpstream)
+    return None if skinClusterIter.isDone() else skinClusterIter.currentNode()
+
+def GetRootJointIssues(rootJnt, rootPath):
+    if rootPath is None:
+        return [f"root joint {rootJnt} does not exist"]
+    if not rootPath.hasFn(om.MFn.kJoint):
+        return [f"{rootJnt} is not a joint"]
+
+    parentPath = om.MDagPath(rootPath).pop()
+    if parentPath.length() > 0 and parentPath.hasFn(om.MFn.kJoint):
+        return [f"{rootJnt} is parented under the joint {parentPath.partialPathName()}, the fbx gets more than one root"]
+    return []
+
+def GetJointIssues(jointPaths):
+    return [f"{jnt} has a non uniform or negative world scale" for jnt, jointPath in jointPaths.items() if not IsUniformScale(jointPath)]
+
+def GetMeshIssues(meshes, meshPaths, jntIndex):
+    import maya.api.OpenMayaAnim as oma
+    issues = []
+    for mesh in meshes:
+        meshPath = meshPaths.get(mesh)
+        if meshPath is None:
+            issues.append(f"mesh {mesh} does not exist")
+            continue
+
+        shapePath = om.MDagPath(meshPath)
+        try:
+            shapePath.extendToShape()
+        except RuntimeError:
+            issues.append(f"{mesh} has no shape")
+            continue
+        if not shapePath.hasFn(om.MFn.kMesh):
+            issues.append(f"{mesh} is not a mesh")
+            continue
+
+        # the skinned mesh has to sit at the origin, a moved mesh gets its offset twice in unreal
+        transformPath = om.MDagPath(shapePath).pop()
+        if not transformPath.inclusiveMatrix().isEquivalent(om.MMatrix.kIdentity):
+            issues.append(f"{mesh} has unfrozen transforms, please freeze them before binding")
+
+        skinClusterNode = GetSkinClusterNode(shapePath)
+        if skinClusterNode is None:
+            issues.append(f"{mesh} is not skinned")
+            continue
+
+        influencePaths = oma.MFnSkinCluster(skinClusterNode).influenceObjects()
+        outsideInfluences = [influencePath.partialPathName() for influencePath in influencePaths
+                             if jntIndex is not None and not jntIndex.Contains(influencePath.fullPathName())]
+        if outsideInfluences:
+            issues.append(f"{mesh} is skinned to joints outside of the skeleton, the fbx gets extra roots: {', '.join(outsideInfluences)}")
+    return issues
+
+# clipRanges: (save path, frameMin, frameMax) of every clip to export
+def GetClipIssues(clipRanges):
+    issues = []
+    savePaths = set()
+    for savePath, frameMin, frameMax in clipRanges:
+        if frameMin is None or frameMax is None:
+            issues.append(f"clip {savePath} has no frame range")
+        elif frameMin > frameMax:
+            issues.append(f"clip {savePath} starts at frame {frameMin:g} after it ends at {frameMax:g}")
+        if savePath in savePaths:
+            issues.append(f"more than one clip saves to {savePath}, please give them different subfixes")
+        savePaths.add(savePath)
+    return issues
+
+@Traced("GetExportIssues")
+def GetExportIssues(rootJnt, meshes, clipRanges, scale):
+    issues = []
+    if scale <= 0:
+        issues.append(f"the export scale {scale:g} has to be above 0")
+    issues += GetClipIssues(clipRanges)
+    if not rootJnt:
+        return issues + ["no root joint assigned"]
+
+    rootPath = GetDagPaths([rootJnt]).get(rootJnt)
+    rootIssues = GetRootJointIssues(rootJnt, rootPath)
+    issues += rootIssues
+    jntIndex = None
+    if not rootIssues:
+        jntIndex = skeletonIndex.GetSkeletonIndex(rootJnt)
+        with tracer.Span("ValidateJoints", joints=len(jntIndex.longNames)):
+            issues += GetJointIssues(GetDagPaths(jntIndex.GetSubtree(rootJnt)))
+
+    with tracer.Span("ValidateMeshes", meshes=len(meshes)):
+        issues += GetMeshIssues(meshes, GetDagPaths(meshes), jntIndex)
+    return issues
+
+def RaiseExportIssues(issues):
+    if issues:
+        raise Exception(f"The export has {len(issues)} problems, please fix them first:\n" + "\n".join(issues))
@@ -0,0 +1,30 @@
+import json
+import os
+import sys
+
+# runs inside a headless mayapy: mayapy exportWorker.py <payload.json> <result.json>
+def RunPayload(payload):
+    import maya.cmds as mc
+    import fbxExport
+    mc.loadPlugin("fbxmaya", quiet=True)
+    mc.file(payload["scene"], o=True, f=True)
+
+    results = []
+    fbxExport.RunExportTasks(payload["tasks"], lambda task, error: results.append({"path": task["path"], "error": error, "reduction": task.get("reduction"), "pruning": task.get("pruning")}), False)
+    return results
+
+def main(payloadPath, resultPath):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    try:
+        with open(payloadPath, "r") as payloadFile:
+            payload = json.load(payloadFile)
+        results = RunPayload(payload)
+        with open(resultPath, "w") as resultFile:
+            json.dump(results, resultFile)
+    finally:
+        maya.standalone.uninitialize()
+
+if __name__ == "__main__":
+    main(sys.argv[1], sys.argv[2])
@@ -0,0 +1,386 @@
+import os
+import sys
+import types
+from collections import Counter
+
+# A stand-in for maya.cmds / maya.mel that keeps a tiny scene graph, counts every command it is asked to run,
+# records the arguments and adds a simulated latency per command. Install() puts it, together with generic
+# stand-ins for the Qt and Maya UI modules the tools import, into sys.modules so the tools run outside Maya.
+
+# seconds of simulated latency per command, anything not listed costs DEFAULT_LATENCY
+DEFAULT_LATENCY = 0.0001
+LATENCIES = {
+    "FBXExport": 0.5,
+    "bakeResults": 0.2,
+    "file": 0.5,
+    "listRelatives": 0.0005,
+    "listHistory": 0.002,
+    "xform": 0.0003,
+    "matchTransform": 0.0005,
+    "ikHandle": 0.002,
+    "expression": 0.001,
+    "refresh": 0.01,
+}
+
+class AnythingMeta(type):
+    def __getattr__(cls, name):
+        return Anything()
+
+# takes any call, attribute access or subclassing, used for the Qt and Maya UI modules
+class Anything(metaclass=AnythingMeta):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return Anything()
+
+    def __call__(self, *args, **kwargs):
+        return Anything()
+
+    def __iter__(self):
+        return iter(())
+
+    def __int__(self):
+        return 0
+
+    def __float__(self):
+        return 0.0
+
+class FakeModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Anything
+
+class FakeNode:
+    def __init__(self, name, nodeType, parent=None):
+        self.name = name
+        self.nodeType = nodeType
+        self.parent = parent
+        self.children = []
+        self.attrs = {}
+
+class FakeScene:
+    def __init__(self):
+        self.nodes = {}
+        self.selection = []
+        self.playbackMin = 1.0
+        self.playbackMax = 120.0
+        self.currentTime = 1.0
+
+    def GetUniqueName(self, name):
+        if name not in self.nodes:
+            return name
+        i = 1
+        while f"{name}{i}" in self.nodes:
+            i += 1
+        return f"{name}{i}"
+
+    def CreateNode(self, name, nodeType, parent=None):
+        node = FakeNode(self.GetUniqueName(name), nodeType)
+        self.nodes[node.name] = node
+        if parent:
+            self.Reparent(node.name, parent)
+        return node.name
+
+    def GetNode(self, name):
+        return self.nodes[name.split("|")[-1].split(".")[0]]
+
+    def Exists(self, name):
+        return name.split("|")[-1].split(".")[0] in self.nodes
+
+    def Reparent(self, name, parentName):
+        node = self.GetNode(name)
+        if node.parent:
+            node.parent.children.remove(node)
+        node.parent = self.GetNode(parentName) if parentName else None
+        if node.parent:
+            node.parent.children.append(node)
+
+    def GetLongName(self, name):
+        node = self.GetNode(name)
+        parts = []
+        while node:
+            parts.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(parts))
+
+    def GetDescendants(self, name):
+        descendants = []
+        stack = list(reversed(self.GetNode(name).children))
+        while stack:
+            node = stack.pop()
+            descendants.append(node)
+            stack.extend(reversed(node.children))
+        return descendants
+
+    def GetWorldPosition(self, name):
+        node = self.GetNode(name)
+        position = [0.0, 0.0, 0.0]
+        while node:
+            translate = node.attrs.get("t", (0.0, 0.0, 0.0))
+            position = [position[i] + translate[i] for i in range(3)]
+            node = node.parent
+        return position
+
+    def AddJointChain(self, names, parent=None, offset=(0.0, 0.0, 0.0), step=(0.0, -5.0, 0.5)):
+        for i, name in enumerate(names):
+            self.CreateNode(name, "joint", parent if i == 0 else names[i - 1])
+            self.GetNode(name).attrs["t"] = tuple(offset) if i == 0 else tuple(step)
+        return names
+
+    def AddAnimCurves(self, jnt, keyTimes):
+        for attr in ["rotateX", "rotateY", "rotateZ"]:
+            curve = self.CreateNode(f"{jnt}_{attr}", "animCurveTA")
+            self.GetNode(curve).attrs["keys"] = [(time, time * 0.5) for time in keyTimes]
+            self.GetNode(jnt).attrs.setdefault("curves", []).append(curve)
+
+def AsList(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+def MatchesType(node, nodeTypes):
+    return not nodeTypes or any(node.nodeType.startswith(nodeType) for nodeType in AsList(nodeTypes))
+
+class RecordingCmds(types.ModuleType):
+    def __init__(self, name="maya.cmds"):
+        super().__init__(name)
+        self.scene = FakeScene()
+        self.calls = Counter()
+        self.callLog = []
+        self.keepCallLog = False
+        self.simulatedTime = 0.0
+
+    def Reset(self, scene=None):
+        self.scene = scene or FakeScene()
+        self.ResetCounters()
+
+    def ResetCounters(self):
+        self.calls = Counter()
+        self.callLog = []
+        self.simulatedTime = 0.0
+
+    def GetTotalCalls(self):
+        return sum(self.calls.values())
+
+    def Record(self, commandName, args, kwargs):
+        self.calls[commandName] += 1
+        self.simulatedTime += LATENCIES.get(commandName, DEFAULT_LATENCY)
+        if self.keepCallLog:
+            self.callLog.append((commandName, args, kwargs))
+
+    def __getattr__(self, commandName):
+        if commandName.startswith("__"):
+            raise AttributeError(commandName)
+
+        handler = getattr(type(self), "Cmd_" + commandName, None)
+
+        def Command(*args, **kwargs):
+            self.Record(commandName, args, kwargs)
+            if handler:
+                return handler(self, *args, **kwargs)
+            return None
+
+        return Command
+
+    # scene queries
+    def Cmd_ls(self, *args, sl=False, type=None, long=False, selection=False, **kwargs):
+        names = list(self.scene.selection) if (sl or selection) else [name for arg in args for name in AsList(arg)]
+        if not args and not (sl or selection):
+            names = list(self.scene.nodes)
+        names = [name for name in names if self.scene.Exists(name) and MatchesType(self.scene.GetNode(name), type)]
+        if long:
+            return [self.scene.GetLongName(name) for name in names]
+        return [self.scene.GetNode(name).name for name in names]
+
+    def Cmd_listRelatives(self, name, c=False, ad=False, p=False, type=None, fullPath=False, children=False, allDescendents=False, parent=False, **kwargs):
+        names = AsList(name)
+        relatives = []
+        for nodeName in names:
+            node = self.scene.GetNode(nodeName)
+            if p or parent:
+                relatives += [node.parent] if node.parent else []
+            elif ad or allDescendents:
+                # maya lists descendants bottom up
+                relatives += list(reversed(self.scene.GetDescendants(nodeName)))
+            else:
+                relatives += node.children
+        relatives = [node for node in relatives if MatchesType(node, type)]
+        if not relatives:
+            return None
+        if fullPath:
+            return [self.scene.GetLongName(node.name) for node in relatives]
+        return [node.name for node in relatives]
+
+    def Cmd_objExists(self, name):
+        return self.scene.Exists(name)
+
+    def Cmd_objectType(self, name, **kwargs):
+        return self.scene.GetNode(name).nodeType
+
+    def Cmd_nodeType(self, name, **kwargs):
+        return self.scene.GetNode(name).nodeType
+
+    def Cmd_xform(self, names, q=False, t=False, ws=False, **kwargs):
+        if not q:
+            return None
+        positions = []
+        for name in AsList(names):
+            positions += self.scene.GetWorldPosition(name) if ws else list(self.scene.GetNode(name).attrs.get("t", (0.0, 0.0, 0.0)))
+        return positions
+
+    def Cmd_getAttr(self, plug, **kwargs):
+        nodeName, _, attr = plug.partition(".")
+        value = self.scene.GetNode(nodeName).attrs.get(attr)
+        if value is not None:
+            return value
+        if attr in ["t", "translate", "r", "rotate", "jointOrient"]:
+            return [(0.0, 0.0, 0.0)]
+        if attr in ["s", "scale"]:
+            return [(1.0, 1.0, 1.0)]
+        return 0.0
+
+    def Cmd_setAttr(self, plug, *values, **kwargs):
+        nodeName, _, attr = plug.partition(".")
+        self.scene.GetNode(nodeName).attrs[attr] = values[0] if len(values) == 1 else tuple(values)
+
+    def Cmd_select(self, *args, r=False, cl=False, clear=False, add=False, **kwargs):
+        if cl or clear:
+            self.scene.selection = []
+            return
+        names = [name for arg in args for name in AsList(arg)]
+        self.scene.selection = (self.scene.selection if add else []) + names
+
+    def Cmd_listHistory(self, names, **kwargs):
+        history = []
+        for name in AsList(names):
+            history.append(self.scene.GetNode(name).name)
+            history += self.scene.GetNode(name).attrs.get("curves", [])
+        return history
+
+    def Cmd_keyframe(self, curves=None, q=False, tc=False, vc=False, name=False, **kwargs):
+        if not q:
+            return None
+        values = []
+        for curve in AsList(curves):
+            for time, value in self.scene.GetNode(curve).attrs.get("keys", []):
+                values += [time, value] if tc and vc else [time if tc else value]
+        return values
+
+    def Cmd_keyTangent(self, curves=None, q=False, **kwargs):
+        if not q:
+            return None
+        return [0.0 for curve in AsList(curves) for _ in self.scene.GetNode(curve).attrs.get("keys", [])]
+
+    def Cmd_playbackOptions(self, q=False, e=False, min=None, max=None, **kwargs):
+        if q:
+            return self.scene.playbackMin if min else self.scene.playbackMax
+        if min is not None:
+            self.scene.playbackMin = min
+        if max is not None:
+            self.scene.playbackMax = max
+
+    def Cmd_currentTime(self, time=None, q=False, **kwargs):
+        if q:
+            return self.scene.currentTime
+        self.scene.currentTime = time
+        return time
+
+    def Cmd_undoInfo(self, q=False, state=False, **kwargs):
+        if q:
+            return True
+        return None
+
+    # node creation
+    def Cmd_createNode(self, nodeType, n=None, name=None, p=None, parent=None, **kwargs):
+        return self.scene.CreateNode(n or name or nodeType + "1", nodeType, p or parent)
+
+    def Cmd_joint(self, n=None, name=None, **kwargs):
+        return self.scene.CreateNode(n or name or "joint1", "joint")
+
+    def Cmd_curve(self, n=None, name=None, **kwargs):
+        return self.scene.CreateNode(n or name or "curve1", "transform")
+
+    def Cmd_circle(self, n=None, name=None, **kwargs):
+        return [self.scene.CreateNode(n or name or "nurbsCircle1", "transform"), self.scene.CreateNode("makeNurbCircle1", "makeNurbCircle")]
+
+    def Cmd_spaceLocator(self, n=None, name=None, **kwargs):
+        return [self.scene.CreateNode(n or name or "locator1", "transform")]
+
+    def Cmd_group(self, *args, n=None, name=None, em=False, **kwargs):
+        groupName = self.scene.CreateNode(n or name or "group1", "transform")
+        for child in [child for arg in args for child in AsList(arg)]:
+            self.scene.Reparent(child, groupName)
+        return groupName
+
+    def Cmd_parent(self, *args, w=False, world=False, **kwargs):
+        names = [name for arg in args for name in AsList(arg)]
+        if w or world:
+            for name in names:
+                self.scene.Reparent(name, None)
+            return names
+        for name in names[:-1]:
+            self.scene.Reparent(name, names[-1])
+        return names[:-1]
+
+    def Cmd_ikHandle(self, n=None, name=None, **kwargs):
+        handleName = self.scene.CreateNode(n or name or "ikHandle1", "ikHandle")
+        return [handleName, self.scene.CreateNode("effector1", "ikEffector")]
+
+    def CreateConstraint(self, constraintType, targets):
+        constrained = targets[-1]
+        return [self.scene.CreateNode(f"{constrained.split('|')[-1]}_{constraintType}1", constraintType, constrained)]
+
+    def Cmd_orientConstraint(self, *targets, **kwargs):
+        return self.CreateConstraint("orientConstraint", targets)
+
+    def Cmd_parentConstraint(self, *targets, **kwargs):
+        return self.CreateConstraint("parentConstraint", targets)
+
+    def Cmd_poleVectorConstraint(self, *targets, **kwargs):
+        return self.CreateConstraint("poleVectorConstraint", targets)
+
+    def Cmd_expression(self, n=None, name=None, **kwargs):
+        return self.scene.CreateNode(n or name or "expression1", "expression")
+
+    def Cmd_FBXExport(self, *args):
+        path = args[list(args).index("-f") + 1]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as exportFile:
+            exportFile.write("fake fbx")
+
+def IsJoint(name):
+    cmds = sys.modules["maya.cmds"]
+    return cmds.scene.Exists(name) and cmds.scene.GetNode(name).nodeType == "joint"
+
+def IsMesh(name):
+    cmds = sys.modules["maya.cmds"]
+    return cmds.scene.Exists(name) and cmds.scene.GetNode(name).nodeType in ["mesh", "transform"]
+
+class FakeQMayaWindow(Anything):
+    def GetWindowHash(self):
+        return ""
+
+def Install():
+    cmds = RecordingCmds()
+    mel = RecordingCmds("maya.mel")
+    maya = FakeModule("maya")
+    maya.cmds = cmds
+    maya.mel = mel
+    modules = {"maya": maya, "maya.cmds": cmds, "maya.mel": mel}
+    for moduleName in ["maya.OpenMaya", "maya.OpenMayaUI", "maya.utils", "maya.standalone", "maya.api", "maya.api.OpenMaya", "maya.api.OpenMayaAnim",
+                       "PySide2", "PySide2.QtCore", "PySide2.QtGui", "PySide2.QtWidgets", "shiboken2",
+                       "remote_execution", "mayatools"]:
+        modules[moduleName] = FakeModule(moduleName)
+
+    mayaUtils = FakeModule("mayaUtils")
+    mayaUtils.IsJoint = IsJoint
+    mayaUtils.IsMesh = IsMesh
+    mayaUtils.QMayaWindow = FakeQMayaWindow
+    modules["mayaUtils"] = mayaUtils
+
+    sys.modules.update(modules)
+    return cmds
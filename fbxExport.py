@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import traceback
+import maya.cmds as mc
+import bakeEngine
+import keyReduction
+import lodChain
+import skinWeights
+from exportTrace import tracer
+
+# Qt free export steps, shared by the interactive tool and the mayapy workers
+# Every file is written into a directory of its own next to its final place and moved over once complete, so a failed
+# or cancelled export never leaves a truncated fbx where the manifest expects a good one. The directory belongs to the
+# one task, parallel workers writing into the same save directory never share or remove each other's.
+PARTIAL_DIR_PREFIX = ".exporting-"
+
+def ResetFbxExport(scale):
+    mc.FBXResetExport()
+    mc.FBXExportSmoothingGroups('-v', True)
+    mc.FBXExportInputConnections('-v', False)
+    mc.FBXExportScaleFactor('-v', scale)
+
+def ExportSkeletalMesh(path, objectsToExport, scale):
+    with tracer.Span("select", count=len(objectsToExport)):
+        mc.select(objectsToExport, r=True)
+    ResetFbxExport(scale)
+    with tracer.Span("FBXExport", path=path):
+        mc.FBXExport('-f', path, '-s', True, '-ea', False)
+
+# with bake off the curves already on the joints are written as they are, used for reduced keys and the single bake pass
+def ExportAnimClip(path, objectsToExport, startFrame, endFrame, bake=True):
+    with tracer.Span("select", count=len(objectsToExport)):
+        mc.select(objectsToExport, r=True)
+    mc.FBXExportBakeComplexAnimation('-v', bake)
+    if bake:
+        mc.FBXExportBakeComplexStart('-v', startFrame)
+        mc.FBXExportBakeComplexEnd('-v', endFrame)
+        mc.FBXExportBakeComplexStep('-v', 1)
+    else:
+        mc.FBXExportSplitAnimationIntoTakes('-c')
+        mc.FBXExportSplitAnimationIntoTakes('-v', os.path.splitext(os.path.basename(path))[0], startFrame, endFrame)
+    mc.playbackOptions(e=True, min=startFrame, max=endFrame)
+    with tracer.Span("FBXExport", path=path, frames=endFrame - startFrame + 1):
+        mc.FBXExport('-f', path, '-s', True, '-ea', True)
+
+# bake off when the joints already carry baked curves over the clip range, a SingleBakePass around the export
+def WriteExportTask(task, path, bake=True):
+    if task["type"] == "skeletalMesh":
+        skinPruning = task.get("skinPruning")
+        with tracer.Span("ExportSkeletalMesh", path=task["path"]):
+            # the lods copy their weights from the pruned source meshes
+            with skinWeights.PrunedSkinWeights(task.get("meshes", []) if skinPruning else [], **(skinPruning or {})) as prunedWeights:
+                with lodChain.GeneratedLodChain(task.get("meshes", []), task.get("lods") or [], task["name"]) as lods:
+                    ExportSkeletalMesh(path, task["objects"] + lods.GetExportObjects(), task["scale"])
+        if prunedWeights.prunings:
+            task["pruning"] = [pruning.AsDict() for pruning in prunedWeights.prunings]
+        return
+
+    with tracer.Span("ExportAnimClip", path=task["path"], frames=task["frameMax"] - task["frameMin"] + 1):
+        if task.get("keyTolerances") is None:
+            ResetFbxExport(task["scale"])
+            ExportAnimClip(path, task["objects"], task["frameMin"], task["frameMax"], bake)
+            return
+
+        with keyReduction.ReducedClipKeys(task["joints"], task["frameMin"], task["frameMax"], task["keyTolerances"]) as reducedKeys:
+            ResetFbxExport(task["scale"])
+            ExportAnimClip(path, task["objects"], task["frameMin"], task["frameMax"], not reducedKeys.isReduced)
+        if reducedKeys.reduction:
+            task["reduction"] = reducedKeys.reduction.AsDict()
+            task["reduction"]["fileSize"] = os.path.getsize(path)
+
+def RunExportTask(task, bake=True):
+    with tracer.Span("makedirs"):
+        os.makedirs(os.path.dirname(task["path"]), exist_ok=True)
+    partialDir = tempfile.mkdtemp(prefix=PARTIAL_DIR_PREFIX, dir=os.path.dirname(task["path"]))
+    try:
+        # the partial file keeps the name, the take of a clip is named after the file
+        partialPath = os.path.join(partialDir, os.path.basename(task["path"]))
+        WriteExportTask(task, partialPath, bake)
+        os.replace(partialPath, task["path"])
+    finally:
+        shutil.rmtree(partialDir, ignore_errors=True)
+
+def RunExportTaskSafe(task, onTaskFinished, stopOnError, bake=True):
+    try:
+        RunExportTask(task, bake)
+    except Exception:
+        if stopOnError:
+            raise
+        onTaskFinished(task, traceback.format_exc())
+        return
+    onTaskFinished(task, "")
+
+def RunExportTasks(tasks, onTaskFinished, stopOnError=True):
+    clipTasks = [task for task in tasks if task["type"] == "animClip"]
+    for task in tasks:
+        if task["type"] == "skeletalMesh":
+            RunExportTaskSafe(task, onTaskFinished, stopOnError)
+
+    if not clipTasks:
+        return
+
+    # reduced clips get baked one by one inside their own undo chunk, a shared bake under them would get in the way
+    if any(task.get("keyTolerances") is not None for task in clipTasks):
+        for task in clipTasks:
+            RunExportTaskSafe(task, onTaskFinished, stopOnError)
+        return
+
+    # clips of several characters share the bake, each joint is sampled once over the union of all their ranges and
+    # every clip writes its take of the baked curves without baking again
+    joints = list(dict.fromkeys(jnt for task in clipTasks for jnt in task["joints"]))
+    frameRanges = [(task["frameMin"], task["frameMax"]) for task in clipTasks]
+    with bakeEngine.SingleBakePass(joints, frameRanges) as bakePass:
+        for task in clipTasks:
+            RunExportTaskSafe(task, onTaskFinished, stopOnError, not bakePass.isBaked)
@@ -0,0 +1,148 @@
+import maya.cmds as mc
+import numpy as np
+import bakeEngine
+from exportTrace import tracer
+
+# Removes the keys a clip bake puts on every frame where the curve is a straight line within a tolerance.
+# Tolerances are per channel kind: translate in scene units, rotate in degrees, scale as a factor.
+DEFAULT_TOLERANCES = {"translate": 0.01, "rotate": 0.05, "scale": 0.001}
+CHANNEL_KINDS = {"tx": "translate", "ty": "translate", "tz": "translate",
+                 "rx": "rotate", "ry": "rotate", "rz": "rotate",
+                 "sx": "scale", "sy": "scale", "sz": "scale"}
+
+# keeps the fewest samples whose linear interpolation stays within tolerance of every sample (Douglas-Peucker)
+def ReduceCurve(values, tolerance):
+    values = np.asarray(values, dtype=np.float64)
+    keep = np.zeros(len(values), dtype=bool)
+    if len(values) == 0:
+        return keep
+    keep[0] = keep[-1] = True
+
+    segments = [(0, len(values) - 1)]
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2:
+            continue
+        between = np.arange(start + 1, end)
+        line = values[start] + (values[end] - values[start]) * (between - start) / (end - start)
+        errors = np.abs(values[start + 1:end] - line)
+        worst = int(np.argmax(errors))
+        if errors[worst] <= tolerance:
+            continue
+        split = start + 1 + worst
+        keep[split] = True
+        segments += [(start, split), (split, end)]
+    return keep
+
+def GetReducedCurveError(values, keep):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return 0.0
+    frames = np.arange(len(values))
+    return float(np.max(np.abs(values - np.interp(frames, frames[keep], values[keep]))))
+
+# Data oriented class
+class ClipReduction:
+    def __init__(self, frameMin, frameMax):
+        self.frameMin = frameMin
+        self.frameMax = frameMax
+        self.keysBefore = 0
+        self.keysAfter = 0
+        self.maxErrors = {kind: 0.0 for kind in DEFAULT_TOLERANCES}
+
+    def AsDict(self):
+        return {"frameMin": self.frameMin, "frameMax": self.frameMax, "keysBefore": self.keysBefore, "keysAfter": self.keysAfter, "maxErrors": dict(self.maxErrors)}
+
+# one line for a reduction dict as it comes back from RunExportTask or a mayapy worker
+def GetReductionSummaryText(reduction):
+    ratio = reduction["keysAfter"] / reduction["keysBefore"] if reduction["keysBefore"] else 1.0
+    errors = ", ".join(f"{kind} {error:.3g}" for kind, error in reduction["maxErrors"].items())
+    text = f"{reduction['keysBefore']} -> {reduction['keysAfter']} keys ({ratio:.0%}), max error {errors}"
+    if "fileSize" in reduction:
+        text += f", {reduction['fileSize'] / 1024:.0f} KB"
+    return text
+
+# Bakes the clip range onto the joints, drops the redundant keys and leaves the reduced curves in place for an
+# fbx export without baking. Everything happens in a bakeEngine.UndoneChunk.
+class ReducedClipKeys:
+    def __init__(self, joints, frameMin, frameMax, tolerances=None):
+        self.joints = joints
+        self.frameMin = frameMin
+        self.frameMax = frameMax
+        self.tolerances = dict(DEFAULT_TOLERANCES, **(tolerances or {}))
+        self.reduction = None
+        self.undoneChunk = bakeEngine.UndoneChunk("ReducedClipKeys")
+        self.isReduced = False
+
+    def ShouldReduce(self):
+        return len(self.joints) > 0
+
+    def __enter__(self):
+        if not self.ShouldReduce():
+            return self
+
+        self.undoneChunk.__enter__()
+        self.isReduced = True
+        frameCount = int(self.frameMax - self.frameMin) + 1
+        try:
+            with tracer.Span("BakeClip", frames=frameCount, joints=len(self.joints)):
+                # keys outside the clip are dropped so the exported curves cover exactly the clip
+                mc.bakeResults(self.joints, t=(self.frameMin, self.frameMax), at=bakeEngine.BAKED_ATTRS, sampleBy=1, simulation=True,
+                               disableImplicitControl=True, preserveOutsideKeys=False, minimizeRotation=True)
+
+            with tracer.Span("ReduceKeys", frames=frameCount, joints=len(self.joints)) as span:
+                self.reduction = self.ReduceBakedCurves(frameCount)
+                span.SetArg("keysBefore", self.reduction.keysBefore)
+                span.SetArg("keysAfter", self.reduction.keysAfter)
+        except Exception:
+            # __exit__ is not called when __enter__ raises, the bake still has to come off the rig
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    # the plugs the bake put a key on every frame of and their values, a locked or non keyable channel gets no keys
+    def GetBakedPlugValues(self, plugs, frameCount):
+        timeRange = (self.frameMin, self.frameMax)
+        # usually every plug is baked, then one query returns the keys plug after plug
+        values = np.array(mc.keyframe(plugs, q=True, t=timeRange, vc=True) or [], dtype=np.float64)
+        if values.size == len(plugs) * frameCount:
+            return plugs, values.reshape(len(plugs), frameCount)
+
+        bakedPlugs = []
+        bakedValues = []
+        for plug in plugs:
+            plugValues = mc.keyframe(plug, q=True, t=timeRange, vc=True) or []
+            if len(plugValues) == frameCount:
+                bakedPlugs.append(plug)
+                bakedValues.append(plugValues)
+        return bakedPlugs, np.array(bakedValues, dtype=np.float64).reshape(len(bakedPlugs), frameCount)
+
+    def ReduceBakedCurves(self, frameCount):
+        plugs, values = self.GetBakedPlugValues([f"{jnt}.{attr}" for jnt in self.joints for attr in bakeEngine.BAKED_ATTRS], frameCount)
+        timeRange = (self.frameMin, self.frameMax)
+        reduction = ClipReduction(self.frameMin, self.frameMax)
+        if not plugs:
+            return reduction
+
+        # the kept keys are interpolated linearly, exactly what the error was measured against
+        mc.keyTangent(plugs, t=timeRange, itt="linear", ott="linear")
+
+        reduction.keysBefore = values.size
+        frames = np.arange(frameCount) + self.frameMin
+        for plug, plugValues in zip(plugs, values):
+            kind = CHANNEL_KINDS[plug.rsplit(".", 1)[1]]
+            keep = ReduceCurve(plugValues, self.tolerances[kind])
+            reduction.keysAfter += int(np.count_nonzero(keep))
+            reduction.maxErrors[kind] = max(reduction.maxErrors[kind], GetReducedCurveError(plugValues, keep))
+
+            removedFrames = frames[~keep]
+            if len(removedFrames):
+                mc.cutKey(plug, time=[(frame, frame) for frame in removedFrames.tolist()], clear=True)
+        return reduction
+
+    def __exit__(self, excType, excValue, traceback):
+        if not self.isReduced:
+            return False
+
+        self.isReduced = False
+        return self.undoneChunk.__exit__(excType, excValue, traceback)
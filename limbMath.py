@@ -0,0 +1,60 @@
+import numpy as np
+
+# Maya free limb placement math, every function works on (N, 3) arrays of world positions for N limbs at once
+
+def Normalize(vectors):
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(lengths > 1e-8, lengths, 1.0)
+
+def ComputePoleVectorDirections(rootLocs, midLocs, endLocs):
+    rootLocs, midLocs, endLocs = (np.asarray(locs, dtype=np.float64) for locs in (rootLocs, midLocs, endLocs))
+    rootToEndDirs = Normalize(endLocs - rootLocs)
+    rootToMid = midLocs - rootLocs
+
+    # the part of root->mid perpendicular to root->end points from the limb line towards the knee or elbow,
+    # which is the plane the rotate plane solver bends in
+    perpendicular = rootToMid - rootToEndDirs * np.sum(rootToMid * rootToEndDirs, axis=-1, keepdims=True)
+
+    # a straight chain has no bend plane, fall back to any direction perpendicular to the limb
+    isStraight = np.linalg.norm(perpendicular, axis=-1) < 1e-6
+    if np.any(isStraight):
+        fallbackAxes = np.where(np.abs(rootToEndDirs[:, 1:2]) < 0.99, [[0.0, 1.0, 0.0]], [[0.0, 0.0, 1.0]])
+        fallback = np.cross(np.cross(rootToEndDirs, fallbackAxes), rootToEndDirs)
+        perpendicular = np.where(isStraight[:, None], fallback, perpendicular)
+
+    return Normalize(perpendicular)
+
+def ComputePoleVectorLocs(rootLocs, midLocs, endLocs):
+    rootLocs = np.asarray(rootLocs, dtype=np.float64)
+    rootToEndVecs = np.asarray(endLocs, dtype=np.float64) - rootLocs
+    rootToEndLengths = np.linalg.norm(rootToEndVecs, axis=-1, keepdims=True)
+    poleVectorDirs = ComputePoleVectorDirections(rootLocs, midLocs, endLocs)
+    return rootLocs + rootToEndVecs / 2 + poleVectorDirs * rootToEndLengths
+
+def ComputeBlendCtrlLocs(rootLocs):
+    rootLocs = np.asarray(rootLocs, dtype=np.float64)
+    offsets = rootLocs * [1.0, 0.0, 1.0]
+    return rootLocs + offsets
+
+# rows are the x axis along the limb, the y axis towards the pole vector and z completing a right handed frame
+def ComputeLimbOrientations(rootLocs, midLocs, endLocs):
+    xAxes = Normalize(np.asarray(endLocs, dtype=np.float64) - np.asarray(rootLocs, dtype=np.float64))
+    yAxes = ComputePoleVectorDirections(rootLocs, midLocs, endLocs)
+    zAxes = np.cross(xAxes, yAxes)
+    return np.stack([xAxes, yAxes, zAxes], axis=1)
+
+# euler angles in degrees, xyz rotate order, matching the row vector matrices maya uses
+def OrientationsToEulerXYZ(orientations):
+    orientations = np.asarray(orientations, dtype=np.float64)
+    ry = np.arcsin(np.clip(-orientations[:, 0, 2], -1.0, 1.0))
+    rx = np.arctan2(orientations[:, 1, 2], orientations[:, 2, 2])
+    rz = np.arctan2(orientations[:, 0, 1], orientations[:, 0, 0])
+    return np.degrees(np.stack([rx, ry, rz], axis=-1))
+
+# Data oriented class
+class LimbPlacements:
+    def __init__(self, rootLocs, midLocs, endLocs):
+        self.poleVectorLocs = ComputePoleVectorLocs(rootLocs, midLocs, endLocs)
+        self.blendCtrlLocs = ComputeBlendCtrlLocs(rootLocs)
+        self.orientations = ComputeLimbOrientations(rootLocs, midLocs, endLocs)
+        self.eulerRotations = OrientationsToEulerXYZ(self.orientations)
@@ -1,34 +1,20 @@
+import re
+import time
 from PySide2.QtGui import QColor
 import maya.cmds as mc
-import maya.OpenMayaUI as omui
 from maya.OpenMaya import MVector
-import shiboken2
-import maya.mel as mel
+import limbMath
+import controllerShapes
+import skeletonIndex
+import rigProfiler
+from exportTrace import Traced, tracer
+from toolLauncher import QMayaWindow
 
-from PySide2.QtWidgets import (QMainWindow, QColorDialog, QWidget, QVBoxLayout,QHBoxLayout, QLabel, QSlider, QPushButton, QLineEdit, QMessageBox)
-from PySide2.QtCore import Qt
+from PySide2.QtWidgets import (QColorDialog, QFileDialog, QWidget, QVBoxLayout,QHBoxLayout, QLabel, QSlider, QPushButton, QLineEdit, QMessageBox, QCheckBox)
+from PySide2.QtCore import Qt, Signal
 
-def GetMayaMainWindow()->QMainWindow:
-    mayaMainWindow = omui.MQtUtil.mainWindow()
-    return shiboken2.wrapInstance(int(mayaMainWindow), QMainWindow)
-
-def DeleteWindowWithName(name):
-    for window in GetMayaMainWindow().findChildren(QWidget, name):
-        window.deleteLater()
-
-def FindWindowWithName(name):
-    for window in GetMayaMainWindow().findChildren(name, QWidget):
-        window.deleteLater()
-
-class QMayaWindow(QWidget):
-    def __init__(self):
-        super().__init__(parent = GetMayaMainWindow())
-        DeleteWindowWithName(self.GetWindowHash())
-        self.setWindowFlags(Qt.WindowType.Window)
-        self.setObjectName(self.GetWindowHash())
-
-    def GetWindowHash(self):
-        return "memesdfsdfsdfwersdfhfa"
+# matched against the whole short joint name without namespace, so twist joints like upperarm_twist_01_l are left out
+DEFAULT_LIMB_NAMING_RULES = [r"^upper_?arm_[lr]$", r"^thigh_[lr]$", r"^(left|right)(arm|upleg)$"]
 
 class LimbRigger:
     def __init__(self):
@@ -37,40 +23,85 @@ class LimbRigger:
         self.end = ""
         self.controllerSize = 5
         self.controllerColor = [0, 0, 0]  
+        self.useUtilityNodes = True
+
+    def GetLimbChain(self, rootJnt):
+        jntIndex = skeletonIndex.GetSkeletonIndex(rootJnt)
+        midJnt = jntIndex.GetChainChild(rootJnt)
+        endJnt = jntIndex.GetChainChild(midJnt) if midJnt else None
+        if not endJnt:
+            raise Exception(f"{rootJnt} has no three joint chain below it, please pick the first joint of a limb!")
+        return rootJnt, midJnt, endJnt
+
+    def SetLimbRoot(self, rootJnt):
+        self.root, self.mid, self.end = self.GetLimbChain(rootJnt)
 
     def AutoFindJnts(self):
-        self.root = mc.ls(sl=True, type="joint")[0]
-        self.mid = mc.listRelatives(self.root, c=True, type="joint")[0]
-        self.end = mc.listRelatives(self.mid, c=True, type="joint")[0]
+        self.SetLimbRoot(mc.ls(sl=True, type="joint")[0])
+
+    def FindLimbRoots(self, skeletonRoot, namingRules=DEFAULT_LIMB_NAMING_RULES):
+        jnts = skeletonIndex.GetSkeletonIndex(skeletonRoot).GetSubtree(skeletonRoot)
+        return [jnt for jnt in jnts if any(re.search(rule, jnt.split("|")[-1].split(":")[-1], re.IGNORECASE) for rule in namingRules)]
+
+    # rigs every limb in one undo chunk with the viewport refresh suspended, returns (limb root, seconds) per rigged
+    # limb and (limb root, reason) per limb root without a three joint chain, which is skipped
+    @Traced("RigLimbs")
+    def RigLimbs(self, limbRoots):
+        timings = []
+        skippedLimbRoots = []
+        # resolve every chain from the cached index before any rig node gets added
+        limbChains = []
+        for limbRoot in limbRoots:
+            try:
+                limbChains.append(self.GetLimbChain(limbRoot))
+            except Exception as e:
+                skippedLimbRoots.append((limbRoot, f"{e}"))
+        limbRoots = [limbChain[0] for limbChain in limbChains]
+        if not limbChains:
+            return timings, skippedLimbRoots
+
+        mc.undoInfo(openChunk=True, chunkName="RigLimbs")
+        mc.refresh(suspend=True)
+        try:
+            placements = self.ComputeLimbPlacements(limbChains)
+            for placementIndex, limbRoot in enumerate(limbRoots):
+                startTime = time.perf_counter()
+                self.root, self.mid, self.end = limbChains[placementIndex]
+                self.RigLimb(placements, placementIndex)
+                timings.append((limbRoot, time.perf_counter() - startTime))
+        finally:
+            mc.refresh(suspend=False)
+            mc.undoInfo(closeChunk=True)
+        return timings, skippedLimbRoots
 
     def ApplyColor(self, ctrlName):
-        mc.setAttr(f"{ctrlName}.overrideEnabled", 1)
-        mc.setAttr(f"{ctrlName}.overrideRGBColors", 1)
-        mc.setAttr(f"{ctrlName}.overrideColorRGB", *self.controllerColor)
+        controllerShapes.ApplyColor(ctrlName, self.controllerColor)
+
+    @Traced("CreateFKControlsForJnts")
+    def CreateFKControlsForJnts(self, jntNames):
+        ctrlNames = controllerShapes.CreateControllers([("circle", "ac_fk_" + jntName, self.controllerSize, self.controllerColor) for jntName in jntNames])
+        ctrls = []
+        for ctrlName, jntName in zip(ctrlNames, jntNames):
+            ctrlGrpName = ctrlName + "_grp"
+            mc.group(ctrlName, n=ctrlGrpName)
+            mc.matchTransform(ctrlGrpName, jntName)
+            mc.orientConstraint(ctrlName, jntName)
+            ctrls.append((ctrlName, ctrlGrpName))
+        return ctrls
 
     def CreateFKControlForJnt(self, jntName):
-        ctrlName = "ac_fk_" + jntName
-        ctrlGrpName = ctrlName + "_grp"
-        mc.circle(n=ctrlName, r=self.controllerSize, nr = (1,0,0))
-        self.ApplyColor(ctrlName)
-        mc.group(ctrlName, n=ctrlGrpName)
-        mc.matchTransform(ctrlGrpName, jntName)
-        mc.orientConstraint(ctrlName, jntName)
-        return ctrlName, ctrlGrpName
+        return self.CreateFKControlsForJnts([jntName])[0]
 
+    @Traced("CreateBoxController")
     def CreateBoxController(self, name):
-        mel.eval(f"curve -n {name} -d 1 -p -0.5 0.5 -0.5 -p -0.5 0.5 0.5 -p 0.5 0.5 0.5 -p 0.5 0.5 -0.5 -p -0.5 0.5 -0.5 -p -0.5 -0.5 -0.5 -p 0.5 -0.5 -0.5 -p 0.5 0.5 -0.5 -p 0.5 0.5 0.5 -p 0.5 -0.5 0.5 -p 0.5 -0.5 -0.5 -p 0.5 -0.5 0.5 -p -0.5 -0.5 0.5 -p -0.5 0.5 0.5 -p -0.5 -0.5 0.5 -p -0.5 -0.5 -0.5 -p 0.5 -0.5 -0.5 -p 0.5 -0.5 0.5 -p -0.5 -0.5 0.5 -k 0 -k 1 -k 2 -k 3 -k 4 -k 5 -k 6 -k 7 -k 8 -k 9 -k 10 -k 11 -k 12 -k 13 -k 14 -k 15 -k 16 -k 17 -k 18 ;")
-        mc.scale(self.controllerSize, self.controllerSize, self.controllerSize, name)
-        mc.makeIdentity(name, apply = True)
-        self.ApplyColor(name)
+        name = controllerShapes.CreateController("box", name, self.controllerSize, self.controllerColor)
         grpName = name + "_grp"
         mc.group(name, n=grpName)
         return name, grpName
 
+    @Traced("CreatePlusController")
     def CreatePlusController(self, name):
-        mel.eval(f"curve -n {name} -d 1 -p 0 0 12 -p 1 0 12 -p 2 0 12 -p 2 0 13 -p 2 0 14 -p 3 0 14 -p 4 0 14 -p 4 0 15 -p 4 0 16 -p 3 0 16 -p 2 0 16 -p 2 0 17 -p 2 0 18 -p 1 0 18 -p 0 0 18 -p 0 0 17 -p 0 0 16 -p -1 0 16 -p -2 0 16 -p -2 0 15 -p -2 0 14 -p -1 0 14 -p 0 0 14 -p 0 0 13 -p 0 0 12 -k 0 -k 1 -k 2 -k 3 -k 4 -k 5 -k 6 -k 7 -k 8 -k 9 -k 10 -k 11 -k 12 -k 13 -k 14 -k 15 -k 16 -k 17 -k 18 -k 19 -k 20 -k 21 -k 22 -k 23 -k 24 ;")
-        mc.makeIdentity(name, apply = True)
-        self.ApplyColor(name)
+        name = controllerShapes.CreateController("plus", name, 1, self.controllerColor)
         grpName = name + "_grp"
         mc.group(name, n=grpName)
         return name, grpName
@@ -82,10 +113,21 @@ class LimbRigger:
     def PrintMVector(self, vectorToPrint):
         print(f"<{vectorToPrint.x}, {vectorToPrint.y}, {vectorToPrint.z}>")
 
-    def RigLimb(self):
-        rootFKCtrl, rootFKCtrlGrp = self.CreateFKControlForJnt(self.root)
-        midFKCtrl, midFKCtrlGrp = self.CreateFKControlForJnt(self.mid)
-        endFKCtrl, endFKCtrlGrp = self.CreateFKControlForJnt(self.end)
+    def GetObjectLocs(self, objectNames):
+        # a single xform query returns the world positions of all the objects back to back
+        locs = mc.xform(objectNames, q=True, t=True, ws=True)
+        return [locs[i:i + 3] for i in range(0, len(locs), 3)]
+
+    # one bulk position query for every limb, then the placement math for all of them at once
+    @Traced("ComputeLimbPlacements")
+    def ComputeLimbPlacements(self, limbChains):
+        locs = self.GetObjectLocs([jnt for limbChain in limbChains for jnt in limbChain])
+        return limbMath.LimbPlacements(locs[0::3], locs[1::3], locs[2::3])
+
+    @Traced("RigLimb")
+    def RigLimb(self, placements=None, placementIndex=0):
+        fkCtrls = self.CreateFKControlsForJnts([self.root, self.mid, self.end])
+        (rootFKCtrl, rootFKCtrlGrp), (midFKCtrl, midFKCtrlGrp), (endFKCtrl, endFKCtrlGrp) = fkCtrls
 
         mc.parent(midFKCtrlGrp, rootFKCtrl)
         mc.parent(endFKCtrlGrp, midFKCtrl)
@@ -95,40 +137,48 @@ class LimbRigger:
         mc.matchTransform(ikEndCtrlGrp, self.end)
         endOrientConstraint = mc.orientConstraint(ikEndCtrl, self.end)[0]
 
-        rootJntLoc = self.GetObjectLoc(self.root)
-        endJntLoc = self.GetObjectLoc(self.end)
-
-        rootToEndVec = endJntLoc - rootJntLoc
+        if placements is None:
+            placements = self.ComputeLimbPlacements([(self.root, self.mid, self.end)])
+        ikPoleVectorCtrlLoc = placements.poleVectorLocs[placementIndex]
+        ikfkBlendCtrlLoc = placements.blendCtrlLocs[placementIndex]
 
         ikHandleName = "ikHandle_" + self.end
-        mc.ikHandle(n=ikHandleName, sj=self.root, ee = self.end, sol="ikRPsolver")
-        ikPoleVectorVals = mc.getAttr(ikHandleName + ".poleVector")[0]
-        ikPoleVector = MVector(ikPoleVectorVals[0], ikPoleVectorVals[1], ikPoleVectorVals[2])
-
-        ikPoleVector.normalize()
-        ikPoleVectorCtrlLoc = rootJntLoc + rootToEndVec / 2 + ikPoleVector * rootToEndVec.length()
+        with tracer.Span("ikHandle"):
+            mc.ikHandle(n=ikHandleName, sj=self.root, ee = self.end, sol="ikRPsolver")
 
         ikPoleVectorCtrlName = "ac_ik_" + self.mid
         mc.spaceLocator(n=ikPoleVectorCtrlName)
         ikPoleVectorCtrlGrp = ikPoleVectorCtrlName + "grp"
         mc.group(ikPoleVectorCtrlName, n=ikPoleVectorCtrlGrp)
-        mc.setAttr(ikPoleVectorCtrlGrp+".t", ikPoleVectorCtrlLoc.x, ikPoleVectorCtrlLoc.y, ikPoleVectorCtrlLoc.z, typ = "double3")
+        mc.setAttr(ikPoleVectorCtrlGrp+".t", *ikPoleVectorCtrlLoc, typ = "double3")
         mc.poleVectorConstraint(ikPoleVectorCtrlName, ikHandleName)
 
         ikfkBlendCtrlName = "ac_ikfk_blend_" + self.root
         ikfkBlendCtrlName, ikfkBlendCtrlGrp = self.CreatePlusController(ikfkBlendCtrlName)
-        ikfkBlendCtrlLoc = rootJntLoc + MVector(rootJntLoc.x, 0, rootJntLoc.z)
-        mc.setAttr(ikfkBlendCtrlGrp+".t", ikfkBlendCtrlLoc.x, ikfkBlendCtrlLoc.y, ikfkBlendCtrlLoc.z, typ="double3")
+        mc.setAttr(ikfkBlendCtrlGrp+".t", *ikfkBlendCtrlLoc, typ="double3")
 
         ikfkBlendAttrName = "ikfkBlend"
         mc.addAttr(ikfkBlendCtrlName, ln=ikfkBlendAttrName, min=0, max=1, k=True)
         ikfkBlendAttr = ikfkBlendCtrlName + "." + ikfkBlendAttrName
 
-        mc.expression(s=f"{ikHandleName}.ikBlend = {ikfkBlendAttr}")
-        mc.expression(s=f"{ikEndCtrlGrp}.v = {ikPoleVectorCtrlGrp}.v = {ikfkBlendAttr}")
-        mc.expression(s=f"{rootFKCtrlGrp}.v = 1 - {ikfkBlendAttr}")
-        mc.expression(s=f"{endOrientConstraint}.{endFKCtrl}W0 = 1-{ikfkBlendAttr}")
-        mc.expression(s=f"{endOrientConstraint}.{ikEndCtrl}W1 = {ikfkBlendAttr}")
+        if self.useUtilityNodes:
+            # plain connections keep the rig friendly to parallel evaluation and cached playback
+            ikfkReverseNode = mc.createNode("reverse", n="ikfk_reverse_" + self.root)
+            mc.connectAttr(ikfkBlendAttr, ikfkReverseNode + ".inputX")
+            ikfkReverseAttr = ikfkReverseNode + ".outputX"
+
+            mc.connectAttr(ikfkBlendAttr, ikHandleName + ".ikBlend")
+            mc.connectAttr(ikfkBlendAttr, ikEndCtrlGrp + ".v")
+            mc.connectAttr(ikfkBlendAttr, ikPoleVectorCtrlGrp + ".v")
+            mc.connectAttr(ikfkReverseAttr, rootFKCtrlGrp + ".v")
+            mc.connectAttr(ikfkReverseAttr, f"{endOrientConstraint}.{endFKCtrl}W0")
+            mc.connectAttr(ikfkBlendAttr, f"{endOrientConstraint}.{ikEndCtrl}W1")
+        else:
+            mc.expression(s=f"{ikHandleName}.ikBlend = {ikfkBlendAttr}")
+            mc.expression(s=f"{ikEndCtrlGrp}.v = {ikPoleVectorCtrlGrp}.v = {ikfkBlendAttr}")
+            mc.expression(s=f"{rootFKCtrlGrp}.v = 1 - {ikfkBlendAttr}")
+            mc.expression(s=f"{endOrientConstraint}.{endFKCtrl}W0 = 1-{ikfkBlendAttr}")
+            mc.expression(s=f"{endOrientConstraint}.{ikEndCtrl}W1 = {ikfkBlendAttr}")
 
         mc.parent(ikHandleName, ikEndCtrl)
         mc.setAttr(ikHandleName+".v", 0)
@@ -136,7 +186,61 @@ class LimbRigger:
         topGrpName = self.root + "_rig_grp"
         mc.group([rootFKCtrlGrp, ikEndCtrlGrp, ikPoleVectorCtrlGrp, ikfkBlendCtrlGrp], n=topGrpName)
 
+    # the fk and ik curve controls of the rigs under the selected _rig_grp groups, or of every rig in the scene
+    def GetRigControllers(self):
+        rigGrps = [rigGrp for rigGrp in mc.ls(sl=True, long=True) if rigGrp.endswith("_rig_grp")]
+        if rigGrps:
+            ctrlCurves = mc.listRelatives(rigGrps, ad=True, type="nurbsCurve", fullPath=True) or []
+        else:
+            ctrlCurves = mc.ls("ac_fk_*", "ac_ik_*", type="nurbsCurve", long=True)
+        ctrlNames = mc.listRelatives(ctrlCurves, p=True, fullPath=True) if ctrlCurves else []
+        return [ctrlName for ctrlName in dict.fromkeys(ctrlNames or []) if controllerShapes.GetControllerShapeName(ctrlName)]
+
+    # resizes and recolors the controls of existing rigs without a rebuild, each call is one undo step
+    @Traced("UpdateRigControllers")
+    def UpdateRigControllers(self, size=None, color=None):
+        mc.undoInfo(openChunk=True, chunkName="UpdateRigControllers")
+        try:
+            ctrlNames = self.GetRigControllers()
+            if size is not None:
+                controllerShapes.ResizeControllers(ctrlNames, size)
+            if color is not None:
+                controllerShapes.ApplyColors(ctrlNames, color)
+        finally:
+            mc.undoInfo(closeChunk=True)
+        return ctrlNames
+
+    # builds the limb once per blend mode, plays the range back and undoes the rig again, returns ms per frame
+    def CompareBlendModes(self, limbRoot, startFrame, endFrame):
+        useUtilityNodes = self.useUtilityNodes
+        frameTimes = {}
+        try:
+            for modeName, modeUseUtilityNodes in [("expressions", False), ("utility nodes", True)]:
+                self.useUtilityNodes = modeUseUtilityNodes
+                mc.undoInfo(openChunk=True, chunkName="CompareBlendModes")
+                try:
+                    self.SetLimbRoot(limbRoot)
+                    self.RigLimb()
+                    frameTimes[modeName] = rigProfiler.MeasurePlaybackFrameTime(startFrame, endFrame)
+                finally:
+                    mc.undoInfo(closeChunk=True)
+                    mc.undo()
+        finally:
+            self.useUtilityNodes = useUtilityNodes
+        return frameTimes
+
+def GetFrameTimesText(frameTimes):
+    return "\n".join(f"{modeName}: {frameTime:.3f} ms per frame" for modeName, frameTime in frameTimes.items())
+
+def GetRigTimingsText(timings, skippedLimbRoots):
+    lines = [f"rigged {len(timings)} limbs in {sum(seconds for _, seconds in timings) * 1000:.1f} ms"]
+    lines += [f"rigged {limbRoot} in {seconds * 1000:.1f} ms" for limbRoot, seconds in timings]
+    lines += [f"skipped {limbRoot}: {reason}" for limbRoot, reason in skippedLimbRoots]
+    return "\n".join(lines)
+
 class ColorPicker(QWidget):
+    colorChanged = Signal(QColor)
+
     def __init__(self):
         super().__init__()
         self.masterLayout = QVBoxLayout()
@@ -152,6 +256,7 @@ class ColorPicker(QWidget):
         if selectedColor.isValid():
             self.color = selectedColor
             self.colorPickerBtn.setStyleSheet(f"background-color:{self.color.name()}")
+            self.colorChanged.emit(self.color)
 
     def GetColorRGB(self):
         return [self.color.redF(), self.color.greenF(), self.color.blueF()]
@@ -187,22 +292,101 @@ class LimbRigToolView(QMayaWindow):
         self.masterLayout.addLayout(ctrlSliderLayout)
 
         self.colorPicker = ColorPicker()
+        self.colorPicker.colorChanged.connect(self.ColorPickerColorChanged)
         self.masterLayout.addWidget(self.colorPicker)
 
+        self.updateExistingRigsCheckbox = QCheckBox("size and color update existing rigs (selected _rig_grp or all)")
+        self.masterLayout.addWidget(self.updateExistingRigsCheckbox)
+
+        self.useUtilityNodesCheckbox = QCheckBox("use utility nodes for ik/fk blend")
+        self.useUtilityNodesCheckbox.setChecked(self.rigger.useUtilityNodes)
+        self.useUtilityNodesCheckbox.toggled.connect(self.UseUtilityNodesToggled)
+        self.masterLayout.addWidget(self.useUtilityNodesCheckbox)
+
         self.rigLimbBtn = QPushButton("rig limb")
         self.masterLayout.addWidget(self.rigLimbBtn)
         self.rigLimbBtn.clicked.connect(self.RigLimbBtnClicked)
 
+        self.namingRulesText = QLineEdit(", ".join(DEFAULT_LIMB_NAMING_RULES))
+        self.masterLayout.addWidget(self.namingRulesText)
+
+        self.rigAllLimbsBtn = QPushButton("rig all limbs of selected skeleton")
+        self.masterLayout.addWidget(self.rigAllLimbsBtn)
+        self.rigAllLimbsBtn.clicked.connect(self.RigAllLimbsBtnClicked)
+
+        self.compareBlendModesBtn = QPushButton("compare blend mode playback")
+        self.masterLayout.addWidget(self.compareBlendModesBtn)
+        self.compareBlendModesBtn.clicked.connect(self.CompareBlendModesBtnClicked)
+
+        self.profileRigsBtn = QPushButton("profile rig playback (selected _rig_grp or all)")
+        self.masterLayout.addWidget(self.profileRigsBtn)
+        self.profileRigsBtn.clicked.connect(self.ProfileRigsBtnClicked)
+
+        # timings of the last rig all limbs, blend mode comparison or profile
+        self.reportLabel = QLabel()
+        self.masterLayout.addWidget(self.reportLabel)
+
         self.setWindowTitle("Limb Rigging Tools")
 
     def CtrlSizeValueChanged(self, newValue):
         self.rigger.controllerSize = newValue
         self.ctrlSizeLabel.setText(f"{self.rigger.controllerSize}")
+        if self.updateExistingRigsCheckbox.isChecked():
+            self.rigger.UpdateRigControllers(size=newValue)
+
+    def ColorPickerColorChanged(self, color):
+        self.rigger.controllerColor = self.colorPicker.GetColorRGB()
+        if self.updateExistingRigsCheckbox.isChecked():
+            self.rigger.UpdateRigControllers(color=self.rigger.controllerColor)
+
+    def UseUtilityNodesToggled(self, checked):
+        self.rigger.useUtilityNodes = checked
+
+    def CompareBlendModesBtnClicked(self):
+        try:
+            startFrame = mc.playbackOptions(q=True, min=True)
+            endFrame = mc.playbackOptions(q=True, max=True)
+            frameTimes = self.rigger.CompareBlendModes(self.rigger.root, startFrame, endFrame)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{e}")
+            return
+
+        self.reportLabel.setText(GetFrameTimesText(frameTimes))
+
+    def ProfileRigsBtnClicked(self):
+        reportPath, _ = QFileDialog.getSaveFileName(self, "Save Rig Profile", "rig_profile.json", "Rig Profile (*.json)")
+        if not reportPath:
+            return
+        try:
+            startFrame = mc.playbackOptions(q=True, min=True)
+            endFrame = mc.playbackOptions(q=True, max=True)
+            rigGrps = [rigGrp for rigGrp in mc.ls(sl=True) if rigGrp.endswith(rigProfiler.RIG_GROUP_SUFFIX)] or None
+            report = rigProfiler.ProfileRigs(startFrame, endFrame, rigGrps)
+            rigProfiler.WriteProfileReport(report, reportPath)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{e}")
+            return
+
+        self.reportLabel.setText(rigProfiler.GetProfileSummaryText(report))
 
     def RigLimbBtnClicked(self):
         self.rigger.controllerColor = self.colorPicker.GetColorRGB()
         self.rigger.RigLimb()
 
+    def RigAllLimbsBtnClicked(self):
+        self.rigger.controllerColor = self.colorPicker.GetColorRGB()
+        try:
+            skeletonRoot = mc.ls(sl=True, type="joint")[0]
+            namingRules = [rule.strip() for rule in self.namingRulesText.text().split(",") if rule.strip()]
+            timings, skippedLimbRoots = self.rigger.RigLimbs(self.rigger.FindLimbRoots(skeletonRoot, namingRules))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{e}")
+            return
+
+        for limbRoot, reason in skippedLimbRoots:
+            mc.warning(f"skipped {limbRoot}: {reason}")
+        self.reportLabel.setText(GetRigTimingsText(timings, skippedLimbRoots))
+
     def AutoFindBtnClicked(self):
         try:
             self.rigger.AutoFindJnts()
@@ -210,5 +394,7 @@ class LimbRigToolView(QMayaWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", "Wrong selection, pick first joint of limb!")
 
-limbRigToolWidget = LimbRigToolView()
-limbRigToolWidget.show()
+# only open the window when run as a script, the shelf opens it through toolLauncher.LaunchTool("LimbRigger")
+if __name__ == "__main__":
+    limbRigToolWidget = LimbRigToolView()
+    limbRigToolWidget.show()
@@ -0,0 +1,104 @@
+import maya.cmds as mc
+import bakeEngine
+import skinWeights
+from exportTrace import tracer
+
+# LOD1 and up of the skeletal mesh: the share of the source triangles to keep and the most bones a vertex may keep
+# (None keeps the influences of the source). LOD0 is always the source mesh as it is.
+DEFAULT_LOD_SETTINGS = [{"ratio": 0.5, "maxInfluences": 4}, {"ratio": 0.25, "maxInfluences": 2}]
+
+# "0.5:4, 0.25:2, 0.1" -> one settings dict per LOD, the bone limit after the colon is optional
+def ParseLodSettings(text):
+    lodSettings = []
+    for lodText in [lodText.strip() for lodText in text.split(",") if lodText.strip()]:
+        ratioText, _, maxInfluencesText = lodText.partition(":")
+        try:
+            ratio = float(ratioText)
+            maxInfluences = int(maxInfluencesText) if maxInfluencesText.strip() else None
+        except ValueError:
+            raise Exception(f"Invalid LOD \"{lodText}\", please use ratio:maxInfluences like 0.5:4")
+        if not 0 < ratio <= 1 or (maxInfluences is not None and maxInfluences < 1):
+            raise Exception(f"Invalid LOD \"{lodText}\", the ratio has to be in (0, 1] and the bone limit at least 1")
+        lodSettings.append({"ratio": ratio, "maxInfluences": maxInfluences})
+    return lodSettings
+
+def GetLodSettingsText(lodSettings):
+    lodTexts = []
+    for lodSetting in lodSettings:
+        maxInfluences = lodSetting.get("maxInfluences")
+        lodTexts.append(f"{lodSetting['ratio']:g}" + (f":{maxInfluences}" if maxInfluences else ""))
+    return ", ".join(lodTexts)
+
+# a reduced copy of the mesh skinned to the same joints, the weights are carried over by closest point
+def CreateLodMesh(mesh, level, lodSetting):
+    lodMesh = mc.duplicate(mesh, n=f"{mesh.split('|')[-1]}_LOD{level}")[0]
+    intermediateShapes = mc.ls(mc.listRelatives(lodMesh, shapes=True, fullPath=True) or [], intermediateObjects=True)
+    if intermediateShapes:
+        mc.delete(intermediateShapes)
+
+    with tracer.Span("polyReduce", mesh=mesh, level=level):
+        mc.polyReduce(lodMesh, version=1, percentage=(1.0 - lodSetting["ratio"]) * 100, keepBorder=True,
+                      keepMapBorder=True, keepHardEdge=True, replaceOriginal=True, constructionHistory=False)
+
+    skinCluster = skinWeights.GetSkinCluster(mesh)
+    if not skinCluster:
+        return lodMesh
+
+    influences = mc.skinCluster(skinCluster, q=True, influence=True)
+    lodSkinCluster = mc.skinCluster(influences, lodMesh, toSelectedBones=True, n=f"{lodMesh}_skinCluster")[0]
+    with tracer.Span("copySkinWeights", mesh=mesh, level=level):
+        mc.copySkinWeights(ss=skinCluster, ds=lodSkinCluster, noMirror=True, surfaceAssociation="closestPoint",
+                           influenceAssociation=["oneToOne", "closestJoint"], normalize=True)
+
+    # the bone limit of the lod, the copied weights get capped the same way the source is pruned
+    maxInfluences = lodSetting.get("maxInfluences")
+    if maxInfluences:
+        skinWeights.PruneSkinWeights([lodMesh], 0.0, maxInfluences)
+    return lodMesh
+
+# Builds the LOD meshes under a lodGroup for the skeletal mesh export, the fbx writes the group as an LOD group that
+# unreal imports as the LODs of the skeletal mesh. Built in a bakeEngine.UndoneChunk, which takes the LOD meshes out
+# and the source meshes back to their parents on exit.
+class GeneratedLodChain:
+    def __init__(self, meshes, lodSettings, name):
+        self.meshes = meshes
+        self.lodSettings = lodSettings
+        self.name = name
+        self.lodGroup = None
+        self.undoneChunk = bakeEngine.UndoneChunk("GeneratedLodChain")
+        self.isGenerated = False
+
+    def ShouldGenerate(self):
+        return len(self.meshes) > 0 and len(self.lodSettings) > 0
+
+    def __enter__(self):
+        if not self.ShouldGenerate():
+            return self
+
+        self.undoneChunk.__enter__()
+        self.isGenerated = True
+        try:
+            with tracer.Span("GenerateLods", meshes=len(self.meshes), lods=len(self.lodSettings)):
+                self.lodGroup = mc.createNode("lodGroup", n=self.name + "_LODGroup")
+                levelMeshes = [list(self.meshes)]
+                for level, lodSetting in enumerate(self.lodSettings, 1):
+                    levelMeshes.append([CreateLodMesh(mesh, level, lodSetting) for mesh in self.meshes])
+
+                for level, meshes in enumerate(levelMeshes):
+                    levelGroup = mc.group(em=True, n=f"{self.name}_LOD{level}", p=self.lodGroup)
+                    mc.parent(meshes, levelGroup)
+        except Exception:
+            # __exit__ is not called when __enter__ raises, the half built chain still has to go
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def GetExportObjects(self):
+        return [self.lodGroup] if self.isGenerated else []
+
+    def __exit__(self, excType, excValue, traceback):
+        if not self.isGenerated:
+            return False
+
+        self.isGenerated = False
+        return self.undoneChunk.__exit__(excType, excValue, traceback)
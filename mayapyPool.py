@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+def GetMayapyPath():
+    mayapyName = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    mayaLocation = os.environ.get("MAYA_LOCATION")
+    if mayaLocation:
+        return os.path.join(mayaLocation, "bin", mayapyName)
+
+    # inside a maya session sys.executable is maya itself, mayapy sits right next to it
+    return os.path.join(os.path.dirname(sys.executable), mayapyName)
+
+def GetWorkerCount(workerCount=None):
+    if workerCount:
+        return max(1, int(workerCount))
+    return os.cpu_count() or 1
+
+def SplitIntoChunks(items, chunkCount):
+    chunks = [[] for _ in range(max(1, min(chunkCount, len(items))))]
+    for i, item in enumerate(items):
+        chunks[i % len(chunks)].append(item)
+    return chunks
+
+# Data oriented class
+class WorkerResult:
+    def __init__(self, payload):
+        self.payload = payload
+        self.results = []
+        self.error = ""
+
+    def Succeeded(self):
+        return not self.error
+
+def RunMayapyJob(scriptPath, payload, mayapyPath=None):
+    workerResult = WorkerResult(payload)
+    tempDir = tempfile.mkdtemp(prefix="mayapy_job_")
+    payloadPath = os.path.join(tempDir, "payload.json")
+    resultPath = os.path.join(tempDir, "result.json")
+    with open(payloadPath, "w") as payloadFile:
+        json.dump(payload, payloadFile)
+
+    cmd = [mayapyPath or GetMayapyPath(), scriptPath, payloadPath, resultPath]
+    process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+    if os.path.exists(resultPath):
+        with open(resultPath, "r") as resultFile:
+            workerResult.results = json.load(resultFile)
+        os.remove(resultPath)
+
+    if process.returncode != 0:
+        workerResult.error = f"worker exited with code {process.returncode}:\n{process.stdout[-2000:]}"
+
+    os.remove(payloadPath)
+    os.rmdir(tempDir)
+    return workerResult
+
+def RunMayapyJobs(scriptPath, payloads, workerCount=None, mayapyPath=None):
+    with ThreadPoolExecutor(max_workers=GetWorkerCount(workerCount)) as executor:
+        futures = [executor.submit(RunMayapyJob, scriptPath, payload, mayapyPath) for payload in payloads]
+        return [future.result() for future in futures]
+
+_backgroundExecutor = None
+
+# same as RunMayapyJobs on a background thread, the returned future holds the worker results
+def StartMayapyJobs(scriptPath, payloads, workerCount=None, mayapyPath=None):
+    global _backgroundExecutor
+    if _backgroundExecutor is None:
+        _backgroundExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="MayapyJobs")
+    return _backgroundExecutor.submit(RunMayapyJobs, scriptPath, payloads, workerCount, mayapyPath)
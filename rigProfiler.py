@@ -0,0 +1,118 @@
+import json
+import os
+import time
+import maya.cmds as mc
+import skeletonIndex
+from exportTrace import Traced, tracer
+
+# Plays a range back over the rigs LimbRigger built and reports fps plus the dg evaluation cost of every rig node,
+# as json so two rig variants can be compared side by side.
+RIG_GROUP_SUFFIX = "_rig_grp"
+# nodes RigLimb wires up outside of the _rig_grp hierarchy, found through the connections of the rig
+RIG_NODE_TYPES = ["orientConstraint", "parentConstraint", "pointConstraint", "poleVectorConstraint", "ikHandle", "ikEffector",
+                  "expression", "reverse", "unitConversion"]
+TOP_NODE_COUNT = 10
+
+def MeasurePlaybackFrameTime(startFrame, endFrame):
+    currentFrame = mc.currentTime(q=True)
+    frames = range(int(startFrame), int(endFrame) + 1)
+    startTime = time.perf_counter()
+    for frame in frames:
+        mc.currentTime(frame, e=True, update=True)
+        mc.refresh(force=True)
+    elapsed = time.perf_counter() - startTime
+    mc.currentTime(currentFrame, e=True)
+    return elapsed * 1000 / max(1, len(frames))
+
+def FindRigGroups():
+    return mc.ls("*" + RIG_GROUP_SUFFIX, type="transform") or []
+
+def GetLimbRoot(rigGrp):
+    return rigGrp.split("|")[-1][:-len(RIG_GROUP_SUFFIX)]
+
+# the rig hierarchy, the limb joints and the constraints, ik nodes and blend nodes hooked up to them
+def GetRigNodes(rigGrp):
+    limbRoot = GetLimbRoot(rigGrp)
+    jntIndex = skeletonIndex.GetSkeletonIndex(limbRoot)
+    midJnt = jntIndex.GetChainChild(limbRoot)
+    limbJnts = [limbRoot, midJnt, jntIndex.GetChainChild(midJnt)]
+
+    hierarchyNodes = [rigGrp] + (mc.listRelatives(rigGrp, ad=True) or [])
+    connectedNodes = mc.listConnections(hierarchyNodes + limbJnts, s=True, d=True, skipConversionNodes=False) or []
+    rigNodes = hierarchyNodes + limbJnts + (mc.ls(connectedNodes, type=RIG_NODE_TYPES) or [])
+    return list(dict.fromkeys(rigNodes))
+
+# Data oriented class
+class LimbProfile:
+    def __init__(self, rigGrp, nodeTimes):
+        self.rigGrp = rigGrp
+        self.limbRoot = GetLimbRoot(rigGrp)
+        # (node, node type, ms per frame), most expensive first
+        self.nodeTimes = sorted(nodeTimes, key=lambda nodeTime: -nodeTime[2])
+
+    def GetTotalTime(self):
+        return sum(nodeTime for _, _, nodeTime in self.nodeTimes)
+
+    def AsDict(self, topNodeCount=TOP_NODE_COUNT):
+        return {
+            "limbRoot": self.limbRoot,
+            "rigGroup": self.rigGrp,
+            "nodeCount": len(self.nodeTimes),
+            "msPerFrame": self.GetTotalTime(),
+            "topNodes": [{"name": name, "type": nodeType, "msPerFrame": nodeTime} for name, nodeType, nodeTime in self.nodeTimes[:topNodeCount]],
+        }
+
+# dgtimer only times dg evaluation, so the per node pass runs with the evaluation manager off.
+# The fps is measured before that, in the evaluation mode the animators actually use.
+@Traced("ProfileRigs")
+def ProfileRigs(startFrame, endFrame, rigGrps=None, topNodeCount=TOP_NODE_COUNT):
+    rigGrps = rigGrps if rigGrps is not None else FindRigGroups()
+    if not rigGrps:
+        raise Exception("No rigs found, rig a limb first!")
+
+    frameCount = int(endFrame) - int(startFrame) + 1
+    evaluationMode = mc.evaluationManager(q=True, mode=True)[0]
+    with tracer.Span("MeasurePlayback", frames=frameCount):
+        msPerFrame = MeasurePlaybackFrameTime(startFrame, endFrame)
+
+    rigNodes = {rigGrp: GetRigNodes(rigGrp) for rigGrp in rigGrps}
+    mc.evaluationManager(mode="off")
+    try:
+        mc.dgtimer(on=True, reset=True)
+        with tracer.Span("DgTimerPlayback", frames=frameCount):
+            dgMsPerFrame = MeasurePlaybackFrameTime(startFrame, endFrame)
+        mc.dgtimer(off=True)
+
+        limbProfiles = []
+        for rigGrp, nodes in rigNodes.items():
+            nodeTypes = [mc.nodeType(node) for node in nodes]
+            # with a node given the query returns the milliseconds that node spent evaluating over the whole playback
+            nodeTimes = [mc.dgtimer(node, q=True, returnType="all") / frameCount for node in nodes]
+            limbProfiles.append(LimbProfile(rigGrp, zip(nodes, nodeTypes, nodeTimes)))
+    finally:
+        mc.dgtimer(off=True)
+        mc.evaluationManager(mode=evaluationMode)
+
+    limbProfiles.sort(key=lambda limbProfile: -limbProfile.GetTotalTime())
+    return {
+        "scene": mc.file(q=True, sceneName=True),
+        "frameMin": startFrame,
+        "frameMax": endFrame,
+        "evaluationMode": evaluationMode,
+        "msPerFrame": msPerFrame,
+        "fps": 1000 / msPerFrame if msPerFrame else 0.0,
+        "dgMsPerFrame": dgMsPerFrame,
+        "limbs": [limbProfile.AsDict(topNodeCount) for limbProfile in limbProfiles],
+    }
+
+def WriteProfileReport(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as reportFile:
+        json.dump(report, reportFile, indent=4)
+
+def GetProfileSummaryText(report, topNodeCount=3):
+    lines = [f"{report['fps']:.1f} fps ({report['msPerFrame']:.2f} ms per frame, {report['evaluationMode']}) over frames {report['frameMin']:g}-{report['frameMax']:g}"]
+    for limb in report["limbs"]:
+        topNodes = ", ".join(f"{node['name']} {node['msPerFrame']:.3f}" for node in limb["topNodes"][:topNodeCount])
+        lines.append(f"{limb['limbRoot']}: {limb['msPerFrame']:.3f} ms per frame in {limb['nodeCount']} nodes, top: {topNodes}")
+    return "\n".join(lines)
@@ -0,0 +1,105 @@
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+# Flat arrays describing one joint hierarchy, built with a single listRelatives call so hierarchy
+# queries afterwards are plain list lookups instead of walks over the DAG.
+class SkeletonIndex:
+    def __init__(self, rootJnt):
+        rootLongName = mc.ls(rootJnt, long=True)[0]
+        descendants = mc.listRelatives(rootLongName, c=True, ad=True, type="joint", fullPath=True) or []
+        # listRelatives returns the descendants bottom up, reversed and sorted by depth the parents come first
+        # and siblings keep their DAG order
+        descendants.reverse()
+        descendants.sort(key=lambda longName: longName.count("|"))
+
+        self.longNames = [rootLongName] + descendants
+        self.names = mc.ls(self.longNames) if descendants else [rootJnt]
+        self.depths = [longName.count("|") - rootLongName.count("|") for longName in self.longNames]
+        self.nameToIndex = {}
+        for i, (name, longName) in enumerate(zip(self.names, self.longNames)):
+            self.nameToIndex[name] = i
+            self.nameToIndex[longName] = i
+
+        self.parents = [-1] * len(self.longNames)
+        self.children = [[] for _ in self.longNames]
+        for i, longName in enumerate(self.longNames):
+            parentIndex = self.nameToIndex.get(longName.rpartition("|")[0], -1)
+            self.parents[i] = parentIndex
+            if parentIndex >= 0:
+                self.children[parentIndex].append(i)
+
+    def Contains(self, jnt):
+        return jnt in self.nameToIndex
+
+    def GetChildren(self, jnt):
+        return [self.names[childIndex] for childIndex in self.children[self.nameToIndex[jnt]]]
+
+    def GetParent(self, jnt):
+        parentIndex = self.parents[self.nameToIndex[jnt]]
+        return self.names[parentIndex] if parentIndex >= 0 else None
+
+    # the child a limb chain goes on through: the one with the most joints below it, so twist and other helper leaves
+    # next to the lower limb are passed over. None on a leaf
+    def GetChainChild(self, jnt):
+        children = self.GetChildren(jnt)
+        if not children:
+            return None
+        return max(children, key=lambda child: len(self.GetSubtree(child)))
+
+    def GetSubtree(self, jnt):
+        subtree = []
+        stack = [self.nameToIndex[jnt]]
+        while stack:
+            index = stack.pop()
+            subtree.append(self.names[index])
+            stack.extend(reversed(self.children[index]))
+        return subtree
+
+_skeletonIndices = {}
+_callbackIds = []
+
+def ClearSkeletonIndices(*args):
+    _skeletonIndices.clear()
+
+def DagChanged(msgType, child, parent, clientData):
+    if child.node().hasFn(om.MFn.kJoint):
+        ClearSkeletonIndices()
+
+def NameChanged(node, previousName, clientData):
+    if node.hasFn(om.MFn.kJoint):
+        ClearSkeletonIndices()
+
+def RegisterCallbacks():
+    if _callbackIds:
+        return
+
+    _callbackIds.append(om.MDagMessage.addAllDagChangesCallback(DagChanged))
+    _callbackIds.append(om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, NameChanged))
+    for sceneMessage in [om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterImport]:
+        _callbackIds.append(om.MSceneMessage.addCallback(sceneMessage, ClearSkeletonIndices))
+
+def RemoveCallbacks():
+    om.MMessage.removeCallbacks(_callbackIds)
+    del _callbackIds[:]
+    ClearSkeletonIndices()
+
+def GetSkeletonRoot(jnt):
+    # the topmost joint in the path of the joint is the root of the whole skeleton
+    pathParts = mc.ls(jnt, long=True)[0].split("|")
+    for i in range(2, len(pathParts) + 1):
+        path = "|".join(pathParts[:i])
+        if mc.objectType(path) == "joint":
+            return path
+    return jnt
+
+# shared by every tool, the index stays cached until a joint is reparented, renamed, created or deleted
+def GetSkeletonIndex(jnt):
+    RegisterCallbacks()
+    for index in _skeletonIndices.values():
+        if index.Contains(jnt):
+            return index
+
+    skeletonRoot = GetSkeletonRoot(jnt)
+    index = SkeletonIndex(skeletonRoot)
+    _skeletonIndices[index.longNames[0]] = index
+    return index
@@ -0,0 +1,141 @@
+import time
+import maya.cmds as mc
+import numpy as np
+from exportTrace import tracer
+
+DEFAULT_WEIGHT_THRESHOLD = 0.01
+DEFAULT_MAX_INFLUENCES = 4
+
+def GetSkinCluster(mesh):
+    skinClusters = mc.ls(mc.listHistory(mesh) or [], type="skinCluster")
+    return skinClusters[0] if skinClusters else None
+
+# (vertices, influences) weights -> the pruned and renormalized weights, every vertex keeps at least its heaviest influence
+def PruneWeights(weights, threshold=DEFAULT_WEIGHT_THRESHOLD, maxInfluences=DEFAULT_MAX_INFLUENCES):
+    weights = np.array(weights, dtype=np.float64)
+    if weights.size == 0:
+        return weights
+
+    keep = weights >= threshold
+    if maxInfluences and maxInfluences < weights.shape[1]:
+        # argpartition puts the maxInfluences heaviest influences of each vertex in the last columns, unordered
+        heaviest = np.argpartition(weights, -maxInfluences, axis=1)[:, -maxInfluences:]
+        keepHeaviest = np.zeros_like(keep)
+        np.put_along_axis(keepHeaviest, heaviest, True, axis=1)
+        keep &= keepHeaviest
+    keep[np.arange(len(weights)), np.argmax(weights, axis=1)] = True
+
+    weights[~keep] = 0.0
+    totals = weights.sum(axis=1, keepdims=True)
+    np.divide(weights, totals, out=weights, where=totals > 0)
+    return weights
+
+def GetInfluenceCounts(weights, epsilon=1e-9):
+    return np.count_nonzero(np.asarray(weights) > epsilon, axis=1)
+
+# Data oriented class
+class SkinWeights:
+    def __init__(self, mesh, skinCluster):
+        self.mesh = mesh
+        self.skinCluster = skinCluster
+        self.skinFn = None
+        self.dagPath = None
+        self.components = None
+        self.influenceIndices = None
+        self.weights = None
+
+# all weights of the mesh in one getWeights call, as a (vertices, influences) array
+def ReadSkinWeights(mesh):
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+    skinCluster = GetSkinCluster(mesh)
+    if not skinCluster:
+        return None
+
+    skinWeights = SkinWeights(mesh, skinCluster)
+    selection = om.MSelectionList()
+    selection.add(skinCluster)
+    skinWeights.skinFn = oma.MFnSkinCluster(selection.getDependNode(0))
+    # the deformed shape, the mesh transform also has the intermediate orig shape under it
+    skinWeights.dagPath = skinWeights.skinFn.getPathAtIndex(0)
+
+    componentFn = om.MFnSingleIndexedComponent()
+    skinWeights.components = componentFn.create(om.MFn.kMeshVertComponent)
+    componentFn.setCompleteData(om.MFnMesh(skinWeights.dagPath).numVertices)
+
+    weights, influenceCount = skinWeights.skinFn.getWeights(skinWeights.dagPath, skinWeights.components)
+    skinWeights.influenceIndices = om.MIntArray(list(range(influenceCount)))
+    skinWeights.weights = np.fromiter(weights, dtype=np.float64, count=len(weights)).reshape(-1, influenceCount)
+    return skinWeights
+
+# writes every weight in one setWeights call and returns the weights it replaced
+def WriteSkinWeights(skinWeights, weights):
+    import maya.api.OpenMaya as om
+    oldWeights = skinWeights.skinFn.setWeights(skinWeights.dagPath, skinWeights.components, skinWeights.influenceIndices,
+                                               om.MDoubleArray(np.ravel(weights).tolist()), False, True)
+    return np.fromiter(oldWeights, dtype=np.float64, count=len(oldWeights)).reshape(np.shape(weights))
+
+# Data oriented class
+class SkinPruning:
+    def __init__(self, mesh, vertexCount, maxInfluencesBefore, maxInfluencesAfter, maxWeightChange, seconds):
+        self.mesh = mesh
+        self.vertexCount = vertexCount
+        self.maxInfluencesBefore = maxInfluencesBefore
+        self.maxInfluencesAfter = maxInfluencesAfter
+        self.maxWeightChange = maxWeightChange
+        self.seconds = seconds
+
+    def AsDict(self):
+        return {"mesh": self.mesh, "vertexCount": self.vertexCount, "maxInfluencesBefore": self.maxInfluencesBefore,
+                "maxInfluencesAfter": self.maxInfluencesAfter, "maxWeightChange": self.maxWeightChange, "seconds": self.seconds}
+
+def GetPruningSummaryText(pruning):
+    return (f"{pruning['mesh']}: {pruning['vertexCount']} vertices, {pruning['maxInfluencesBefore']} -> {pruning['maxInfluencesAfter']} "
+            f"influences, max weight change {pruning['maxWeightChange']:.3g} ({pruning['seconds'] * 1000:.0f} ms)")
+
+# prunes the weights in place, the replaced weights of every mesh go into originals when it is given
+def PruneSkinWeights(meshes, threshold=DEFAULT_WEIGHT_THRESHOLD, maxInfluences=DEFAULT_MAX_INFLUENCES, originals=None):
+    prunings = []
+    for mesh in meshes:
+        startTime = time.perf_counter()
+        with tracer.Span("PruneSkinWeights", mesh=mesh) as span:
+            skinWeights = ReadSkinWeights(mesh)
+            if skinWeights is None:
+                continue
+            prunedWeights = PruneWeights(skinWeights.weights, threshold, maxInfluences)
+            oldWeights = WriteSkinWeights(skinWeights, prunedWeights)
+            if originals is not None:
+                originals.append((skinWeights, oldWeights))
+            span.SetArg("vertices", len(prunedWeights))
+
+        prunings.append(SkinPruning(mesh, len(prunedWeights), int(GetInfluenceCounts(skinWeights.weights).max(initial=0)),
+                                    int(GetInfluenceCounts(prunedWeights).max(initial=0)),
+                                    float(np.abs(prunedWeights - skinWeights.weights).max(initial=0.0)), time.perf_counter() - startTime))
+    return prunings
+
+# Prunes the skin weights of the meshes for the skeletal mesh export only, the original weights are written back on
+# exit. setWeights outside of a command is not undoable, so unlike SingleBakePass this restores the weights itself.
+class PrunedSkinWeights:
+    def __init__(self, meshes, threshold=DEFAULT_WEIGHT_THRESHOLD, maxInfluences=DEFAULT_MAX_INFLUENCES):
+        self.meshes = meshes
+        self.threshold = threshold
+        self.maxInfluences = maxInfluences
+        self.originals = []
+        self.prunings = []
+
+    def __enter__(self):
+        try:
+            self.prunings = PruneSkinWeights(self.meshes, self.threshold, self.maxInfluences, self.originals)
+        except Exception:
+            # __exit__ is not called when __enter__ raises, meshes pruned so far get their weights back
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        with tracer.Span("RestoreSkinWeights", meshes=len(self.originals)):
+            for skinWeights, originalWeights in self.originals:
+                WriteSkinWeights(skinWeights, originalWeights)
+        self.originals = []
+        return False
@@ -0,0 +1,13 @@
+import os
+import sys
+
+# the modules live flat in the repository root, the pure NumPy ones import without maya
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# skinWeights and keyReduction import maya.cmds at the top for their scene functions, outside of maya they are
+# imported against the fake the benchmark runs on, the functions under test never call it
+try:
+    import maya.cmds
+except ImportError:
+    import fakeMaya
+    fakeMaya.Install()
@@ -0,0 +1,35 @@
+import numpy as np
+import animStateStore
+
+def MakeStateData(frameCount, jointCount, seed=0):
+    rng = np.random.default_rng(seed)
+    data = np.zeros((frameCount, jointCount, animStateStore.CHANNEL_COUNT), dtype=np.float32)
+    data[..., 0:3] = rng.normal(size=(frameCount, jointCount, 3)) * 10
+    data[..., 3:7] = animStateStore.EulerToQuaternions(rng.uniform(-180, 180, size=(frameCount, jointCount, 3)))
+    data[..., 7:10] = 1.0
+    return data
+
+def SaveState(directory, name, data):
+    jointNames = [f"jnt{i}" for i in range(data.shape[1])]
+    return animStateStore.SaveAnimState(str(directory / (name + animStateStore.ANIM_STATE_EXTENSION)), jointNames, 1, data.shape[0], data)
+
+def test_identical_state_has_no_changed_joints(tmp_path):
+    data = MakeStateData(120, 50)
+    diff = animStateStore.DiffAnimStates(SaveState(tmp_path, "a", data), SaveState(tmp_path, "b", data))
+    assert diff.GetChangedJoints() == []
+    assert diff.GetMaxDiffs()[1] < 1e-3
+
+def test_flipped_quaternion_is_the_same_rotation(tmp_path):
+    data = MakeStateData(10, 5)
+    flipped = data.copy()
+    flipped[..., 3:7] *= -1
+    diff = animStateStore.DiffAnimStates(SaveState(tmp_path, "a", data), SaveState(tmp_path, "b", flipped))
+    assert diff.GetChangedJoints() == []
+
+def test_rotated_joint_is_reported_with_its_angle(tmp_path):
+    data = MakeStateData(10, 5)
+    rotated = data.copy()
+    rotated[:, 2, 3:7] = animStateStore.QuaternionMultiply(animStateStore.EulerToQuaternions([0.0, 0.0, 1.0]), data[:, 2, 3:7])
+    diff = animStateStore.DiffAnimStates(SaveState(tmp_path, "a", data), SaveState(tmp_path, "b", rotated))
+    assert diff.GetChangedJoints() == ["jnt2"]
+    assert abs(diff.rotationDiffs[2] - 1.0) < 1e-3
@@ -0,0 +1,53 @@
+import numpy as np
+import keyReduction
+
+def test_straight_line_keeps_only_the_ends():
+    keep = keyReduction.ReduceCurve(np.linspace(0.0, 10.0, 50), 0.01)
+    assert np.flatnonzero(keep).tolist() == [0, 49]
+
+def test_corner_is_kept():
+    values = np.concatenate([np.linspace(0.0, 10.0, 11), np.linspace(9.0, 0.0, 10)])
+    keep = keyReduction.ReduceCurve(values, 0.01)
+    assert np.flatnonzero(keep).tolist() == [0, 10, 20]
+
+def test_reduced_curve_stays_within_the_tolerance():
+    values = np.sin(np.linspace(0.0, 4 * np.pi, 240)) * 30
+    for tolerance in [0.01, 0.1, 1.0]:
+        keep = keyReduction.ReduceCurve(values, tolerance)
+        assert keyReduction.GetReducedCurveError(values, keep) <= tolerance
+        assert np.count_nonzero(keep) < len(values)
+
+def test_short_curves():
+    assert keyReduction.ReduceCurve([], 0.01).tolist() == []
+    assert keyReduction.ReduceCurve([1.0], 0.01).tolist() == [True]
+    assert keyReduction.ReduceCurve([1.0, 2.0], 0.01).tolist() == [True, True]
+
+class BakedCurves:
+    def __init__(self, plugKeys):
+        self.plugKeys = plugKeys
+        self.cutPlugs = []
+
+    def keyframe(self, plugs, q=False, t=None, vc=False):
+        plugs = [plugs] if isinstance(plugs, str) else plugs
+        return [value for plug in plugs for value in self.plugKeys.get(plug, [])]
+
+    def keyTangent(self, plugs, **kwargs):
+        assert all(plug in self.plugKeys for plug in plugs)
+
+    def cutKey(self, plug, **kwargs):
+        self.cutPlugs.append(plug)
+
+def test_channels_without_baked_keys_are_left_out(monkeypatch):
+    frameCount = 10
+    plugKeys = {f"{jnt}.{attr}": [float(frame) for frame in range(frameCount)] for jnt in ["a", "b"] for attr in keyReduction.CHANNEL_KINDS}
+    # a locked scale gets no keys from the bake
+    for attr in ["sx", "sy", "sz"]:
+        del plugKeys[f"b.{attr}"]
+    bakedCurves = BakedCurves(plugKeys)
+    monkeypatch.setattr(keyReduction, "mc", bakedCurves)
+
+    reducedKeys = keyReduction.ReducedClipKeys(["a", "b"], 1, frameCount)
+    reduction = reducedKeys.ReduceBakedCurves(frameCount)
+    assert reduction.keysBefore == 15 * frameCount
+    assert reduction.keysAfter == 15 * 2
+    assert sorted(bakedCurves.cutPlugs) == sorted(plugKeys)
@@ -0,0 +1,34 @@
+import numpy as np
+import limbMath
+
+# an arm along +x bending its elbow towards -z, and a second one stretched straight along +y
+ROOT_LOCS = [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+MID_LOCS = [[5.0, 0.0, -1.0], [0.0, 5.0, 0.0]]
+END_LOCS = [[10.0, 0.0, 0.0], [0.0, 10.0, 0.0]]
+
+def test_pole_vector_points_towards_the_bend():
+    directions = limbMath.ComputePoleVectorDirections(ROOT_LOCS[:1], MID_LOCS[:1], END_LOCS[:1])
+    assert np.allclose(directions, [[0.0, 0.0, -1.0]])
+
+    # half way along the limb, one limb length out towards the elbow
+    poleVectorLocs = limbMath.ComputePoleVectorLocs(ROOT_LOCS[:1], MID_LOCS[:1], END_LOCS[:1])
+    assert np.allclose(poleVectorLocs, [[5.0, 0.0, -10.0]])
+
+def test_straight_chain_falls_back_to_a_perpendicular_direction():
+    directions = limbMath.ComputePoleVectorDirections(ROOT_LOCS, MID_LOCS, END_LOCS)
+    assert np.all(np.isfinite(directions))
+    assert np.allclose(np.linalg.norm(directions, axis=-1), 1.0)
+    # the limb along +y is too close to the y fallback axis, z is used instead
+    assert np.allclose(directions[1], [0.0, 0.0, 1.0])
+
+def test_orientation_is_a_right_handed_frame_along_the_limb():
+    orientations = limbMath.ComputeLimbOrientations(ROOT_LOCS, MID_LOCS, END_LOCS)
+    assert np.allclose(orientations[0], [[1.0, 0.0, 0.0], [0.0, 0.0, -1.0], [0.0, 1.0, 0.0]])
+    for orientation in orientations:
+        assert np.allclose(orientation @ orientation.T, np.eye(3))
+        assert np.isclose(np.linalg.det(orientation), 1.0)
+
+def test_euler_rotation_of_the_orientation():
+    orientations = limbMath.ComputeLimbOrientations(ROOT_LOCS[:1], MID_LOCS[:1], END_LOCS[:1])
+    # the y axis turned onto -z is a -90 degree turn about x
+    assert np.allclose(limbMath.OrientationsToEulerXYZ(orientations), [[-90.0, 0.0, 0.0]])
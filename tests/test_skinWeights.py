@@ -0,0 +1,26 @@
+import numpy as np
+import skinWeights
+
+def MakeWeights(vertexCount, influenceCount, seed=0):
+    weights = np.random.default_rng(seed).random((vertexCount, influenceCount))
+    return weights / weights.sum(axis=1, keepdims=True)
+
+def test_pruned_weights_sum_to_one():
+    pruned = skinWeights.PruneWeights(MakeWeights(200, 8), 0.05, 4)
+    assert np.allclose(pruned.sum(axis=1), 1.0)
+
+def test_pruned_weights_keep_the_heaviest_influences_up_to_the_cap():
+    weights = MakeWeights(200, 8)
+    pruned = skinWeights.PruneWeights(weights, 0.0, 3)
+    assert skinWeights.GetInfluenceCounts(pruned).max() == 3
+
+    heaviest = np.sort(np.argsort(weights, axis=1)[:, -3:], axis=1)
+    assert np.array_equal(np.sort(np.argsort(pruned, axis=1)[:, -3:], axis=1), heaviest)
+
+def test_weights_below_the_threshold_are_dropped():
+    pruned = skinWeights.PruneWeights([[0.7, 0.295, 0.005], [0.5, 0.5, 0.0]], 0.01, None)
+    assert np.allclose(pruned, [[0.7 / 0.995, 0.295 / 0.995, 0.0], [0.5, 0.5, 0.0]])
+
+def test_vertex_keeps_its_heaviest_influence_under_the_threshold():
+    pruned = skinWeights.PruneWeights([[0.004, 0.003, 0.002]], 0.01, 4)
+    assert np.allclose(pruned, [[1.0, 0.0, 0.0]])
@@ -0,0 +1,68 @@
+import importlib
+import maya.OpenMayaUI as omui
+import shiboken2
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QMainWindow, QWidget
+
+# Opens the tools from a shelf button: toolLauncher.LaunchTool("LimbRigger"). The module of a tool is imported the
+# first time it opens, and its window is only hidden when closed so the next launch shows the same instance again.
+# tool name -> (module, window class)
+TOOLS = {
+    "LimbRigger": ("limbriggingtool", "LimbRigToolView"),
+    "MayaToUE": ("MayaToUE2", "MayaToUEWidget"),
+}
+
+# object name -> window, kept by QMayaWindow so an old instance is found without walking the maya ui
+_windows = {}
+# tool name -> the warm window of the tool
+_toolWindows = {}
+
+def GetMayaMainWindow()->QMainWindow:
+    mayaMainWindow = omui.MQtUtil.mainWindow()
+    return shiboken2.wrapInstance(int(mayaMainWindow), QMainWindow)
+
+# the python wrapper outlives the widget when maya deletes it, for example on a new scene with the ui reset
+def IsWindowAlive(window):
+    return window is not None and shiboken2.isValid(window)
+
+def GetWindow(name):
+    window = _windows.get(name)
+    return window if IsWindowAlive(window) else None
+
+def RegisterWindow(window):
+    oldWindow = GetWindow(window.objectName())
+    if oldWindow is not None and oldWindow is not window:
+        oldWindow.deleteLater()
+    _windows[window.objectName()] = window
+
+class QMayaWindow(QWidget):
+    def __init__(self):
+        super().__init__(parent = GetMayaMainWindow())
+        self.setWindowFlags(Qt.WindowType.Window)
+        self.setObjectName(self.GetWindowHash())
+        # replaces the window an earlier run of the tool left behind
+        RegisterWindow(self)
+
+    def GetWindowHash(self):
+        return "memesdfsdfsdfwersdfhfa"
+
+def LaunchTool(toolName):
+    window = _toolWindows.get(toolName)
+    if not IsWindowAlive(window):
+        moduleName, className = TOOLS[toolName]
+        window = getattr(importlib.import_module(moduleName), className)()
+        _toolWindows[toolName] = window
+
+    window.show()
+    window.raise_()
+    window.activateWindow()
+    return window
+
+# picks up code changes to the tool: the module is reloaded and the warm window replaced by a new one
+def ReloadTool(toolName):
+    window = _toolWindows.pop(toolName, None)
+    if IsWindowAlive(window):
+        window.close()
+        window.deleteLater()
+    importlib.reload(importlib.import_module(TOOLS[toolName][0]))
+    return LaunchTool(toolName)
@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import animStateStore
+from exportTrace import Traced, tracer
+
+# Reads the local transform of every joint on every frame of a range straight from the dependency graph. Each frame
+# is evaluated in its own MDGContext, so the current time never moves and no viewport or time change callbacks run.
+# The result has the animStateStore layout: (frames, joints, 10) translate xyz, rotation quaternion xyzw, scale xyz.
+TRANSFORM_ATTRS = ["translate", "rotate", "scale"]
+
+# Data oriented class
+class JointPlugs:
+    def __init__(self, jointNames):
+        import maya.api.OpenMaya as om
+
+        selection = om.MSelectionList()
+        for jnt in jointNames:
+            selection.add(jnt)
+
+        # translate, rotate and scale child plugs of every joint in channel order, read one after the other per frame
+        self.plugs = []
+        self.rotateOrders = np.zeros(len(jointNames), dtype=np.int32)
+        self.jointOrients = np.zeros((len(jointNames), 3))
+        for jointIndex in range(len(jointNames)):
+            nodeFn = om.MFnDependencyNode(selection.getDependNode(jointIndex))
+            for attr in TRANSFORM_ATTRS:
+                plug = nodeFn.findPlug(attr, False)
+                self.plugs += [plug.child(childIndex) for childIndex in range(3)]
+            # rotate order and joint orient are not animated, read once at the current time
+            self.rotateOrders[jointIndex] = nodeFn.findPlug("rotateOrder", False).asInt()
+            if nodeFn.hasAttribute("jointOrient"):
+                jointOrientPlug = nodeFn.findPlug("jointOrient", False)
+                self.jointOrients[jointIndex] = [jointOrientPlug.child(childIndex).asDouble() for childIndex in range(3)]
+
+# fills data, a (frames, joints, 10) float32 array, allocated here when not given so repeated samples can reuse one
+@Traced("SampleJointTransforms")
+def SampleJointTransforms(joints, frameMin, frameMax, data=None):
+    import maya.api.OpenMaya as om
+
+    frames = np.arange(frameMin, frameMax + 1)
+    shape = (len(frames), len(joints), animStateStore.CHANNEL_COUNT)
+    if data is None:
+        data = np.empty(shape, dtype=np.float32)
+    elif data.shape != shape:
+        raise Exception(f"sample buffer has shape {data.shape}, expected {shape} for the frame range and joints")
+
+    jointPlugs = JointPlugs(joints)
+    plugs = jointPlugs.plugs
+    # (frames, joints * 9) in internal units: centimeters and radians
+    channels = np.empty((len(frames), len(plugs)))
+    timeUnit = om.MTime.uiUnit()
+    with tracer.Span("EvaluateFrames", frames=len(frames), joints=len(joints)):
+        for frameIndex, frame in enumerate(frames.tolist()):
+            previousContext = om.MDGContext(om.MTime(frame, timeUnit)).makeCurrent()
+            try:
+                channels[frameIndex] = [plug.asDouble() for plug in plugs]
+            finally:
+                previousContext.makeCurrent()
+
+    channels = channels.reshape(len(frames), len(joints), 3, 3)
+    # translate in the scene unit, the same values getAttr gives
+    data[:, :, 0:3] = channels[:, :, 0] * om.MDistance(1.0).asUnits(om.MDistance.uiUnit())
+    rotates = np.degrees(channels[:, :, 1])
+    jointOrientQuaternions = animStateStore.EulerToQuaternions(np.degrees(jointPlugs.jointOrients))
+    for rotateOrder in np.unique(jointPlugs.rotateOrders).tolist():
+        jointMask = jointPlugs.rotateOrders == rotateOrder
+        rotateQuaternions = animStateStore.EulerToQuaternions(rotates[:, jointMask], rotateOrder)
+        data[:, jointMask, 3:7] = animStateStore.QuaternionMultiply(jointOrientQuaternions[jointMask], rotateQuaternions)
+    data[:, :, 7:10] = channels[:, :, 2]
+    return data
+
+# Data oriented class
+class SamplingBenchmark:
+    def __init__(self, jointCount, frameCount, sampleSeconds, fbxBakeSeconds):
+        self.jointCount = jointCount
+        self.frameCount = frameCount
+        self.sampleSeconds = sampleSeconds
+        self.fbxBakeSeconds = fbxBakeSeconds
+
+    def GetSummaryText(self):
+        return (f"{self.jointCount} joints, {self.frameCount} frames: sampler {self.frameCount / self.sampleSeconds:.0f} frames/s, "
+                f"fbx bake {self.frameCount / self.fbxBakeSeconds:.0f} frames/s ({self.fbxBakeSeconds / self.sampleSeconds:.1f}x)")
+
+# times sampling the skeleton against exporting the same range as a baked fbx clip, the only other way to get the data
+def BenchmarkSampling(rootJnt, frameMin, frameMax):
+    import maya.cmds as mc
+    import fbxExport
+    import skeletonIndex
+
+    joints = skeletonIndex.GetSkeletonIndex(rootJnt).GetSubtree(rootJnt)
+    data = np.empty((int(frameMax - frameMin) + 1, len(joints), animStateStore.CHANNEL_COUNT), dtype=np.float32)
+    startTime = time.perf_counter()
+    SampleJointTransforms(joints, frameMin, frameMax, data)
+    sampleSeconds = time.perf_counter() - startTime
+
+    mc.loadPlugin("fbxmaya", quiet=True)
+    fbxPath = os.path.join(tempfile.mkdtemp(prefix="transformSampler_"), "bake.fbx")
+    startTime = time.perf_counter()
+    fbxExport.ExportAnimClip(fbxPath, joints, frameMin, frameMax)
+    fbxBakeSeconds = time.perf_counter() - startTime
+    os.remove(fbxPath)
+    os.rmdir(os.path.dirname(fbxPath))
+    return SamplingBenchmark(len(joints), data.shape[0], sampleSeconds, fbxBakeSeconds)
+
+# mayapy transformSampler.py <scene> <root joint> <frameMin> <frameMax>
+def main(scenePath, rootJnt, frameMin, frameMax):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    try:
+        import maya.cmds as mc
+        mc.file(scenePath, o=True, f=True)
+        print(BenchmarkSampling(rootJnt, frameMin, frameMax).GetSummaryText())
+    finally:
+        maya.standalone.uninitialize()
+
+if __name__ == "__main__":
+    main(sys.argv[1], sys.argv[2], float(sys.argv[3]), float(sys.argv[4]))
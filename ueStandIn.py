@@ -0,0 +1,208 @@
+import ast
+import json
+import os
+import re
+import socket
+import struct
+import sys
+import threading
+import uuid
+
+# A local stand-in for the Unreal Editor side of the remote execution protocol: it answers discovery pings,
+# opens the command connection it is asked for and replies to every command, recording what it received.
+# Lets the transport be exercised without an editor running: python ueStandIn.py
+PROTOCOL_VERSION = 1
+PROTOCOL_MAGIC = "ue_py"
+DEFAULT_MULTICAST_GROUP_ENDPOINT = ("239.0.0.1", 6766)
+DEFAULT_MULTICAST_BIND_ADDRESS = "0.0.0.0"
+DEFAULT_MULTICAST_TTL = 0
+
+def BuildMessage(messageType, source, dest=None, data=None):
+    message = {"version": PROTOCOL_VERSION, "magic": PROTOCOL_MAGIC, "type": messageType, "source": source}
+    if dest:
+        message["dest"] = dest
+    if data:
+        message["data"] = data
+    return json.dumps(message, ensure_ascii=False).encode("utf-8")
+
+def ParseMessage(data):
+    try:
+        message = json.loads(data.decode("utf-8"))
+    except ValueError:
+        return None
+    if message.get("version") != PROTOCOL_VERSION or message.get("magic") != PROTOCOL_MAGIC:
+        return None
+    return message
+
+# a command handler returns whether the command succeeded, its result and what it printed
+def DefaultCommandHandler(command):
+    return True, "None", ""
+
+IMPORT_BATCH_PATTERN = re.compile(r"print\(ImportBatch\((.*), save=(True|False)\)\)$", re.DOTALL)
+SAVE_IMPORTS_PATTERN = re.compile(r"print\(SaveImportedAssets\((.*)\)\)$", re.DOTALL)
+
+# Answers the ImportBatch and SaveImportedAssets commands like UnrealImport does, only it keeps the source hash of
+# every asset instead of importing, so the hash skip and the single save per export can be checked without an editor.
+class ImportBatchHandler:
+    def __init__(self):
+        self.sourceHashes = {}
+        self.importedPaths = []
+        self.hasUnsavedImports = False
+        self.saveCount = 0
+
+    def __call__(self, command):
+        saveMatch = SAVE_IMPORTS_PATTERN.match(command.strip())
+        if saveMatch:
+            if self.hasUnsavedImports:
+                self.saveCount += 1
+            self.hasUnsavedImports = False
+            return True, "None", json.dumps({"saved": json.loads(ast.literal_eval(saveMatch.group(1)))})
+
+        match = IMPORT_BATCH_PATTERN.match(command.strip())
+        if not match:
+            return True, "None", ""
+
+        entries = json.loads(ast.literal_eval(match.group(1)))
+        changedEntries = []
+        for entry in entries:
+            assetPath = entry["destination"] + "/" + os.path.splitext(os.path.basename(entry["path"]))[0]
+            if entry["hash"] and self.sourceHashes.get(assetPath) == entry["hash"]:
+                continue
+            self.sourceHashes[assetPath] = entry["hash"]
+            changedEntries.append(entry)
+
+        self.importedPaths += [entry["path"] for entry in changedEntries]
+        if changedEntries and match.group(2) == "True":
+            self.saveCount += 1
+        elif changedEntries:
+            self.hasUnsavedImports = True
+        return True, "None", json.dumps({"imported": [entry["path"] for entry in changedEntries], "skipped": len(entries) - len(changedEntries)})
+
+class UnrealStandIn:
+    def __init__(self, multicastGroupEndpoint=DEFAULT_MULTICAST_GROUP_ENDPOINT, multicastBindAddress=DEFAULT_MULTICAST_BIND_ADDRESS, commandHandler=DefaultCommandHandler):
+        self.multicastGroupEndpoint = multicastGroupEndpoint
+        self.multicastBindAddress = multicastBindAddress
+        self.commandHandler = commandHandler
+        self.nodeId = str(uuid.uuid4())
+        self.commands = []
+        self.broadcastSocket = None
+        self.commandSocket = None
+        self.isRunning = False
+        self.threads = []
+
+    def GetNodeData(self):
+        return {
+            "user": "standin",
+            "machine": socket.gethostname(),
+            "engine_version": "5.0.0",
+            "engine_root": "",
+            "project_root": "",
+            "project_name": "UnrealStandIn",
+        }
+
+    def Start(self):
+        self.broadcastSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.broadcastSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.broadcastSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.broadcastSocket.bind((self.multicastBindAddress, self.multicastGroupEndpoint[1]))
+        self.broadcastSocket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        self.broadcastSocket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, DEFAULT_MULTICAST_TTL)
+        membership = struct.pack("4s4s", socket.inet_aton(self.multicastGroupEndpoint[0]), socket.inet_aton(self.multicastBindAddress))
+        self.broadcastSocket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.broadcastSocket.settimeout(0.1)
+
+        self.isRunning = True
+        self.StartThread(self.RunBroadcastChannel)
+
+    def Stop(self):
+        self.isRunning = False
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        self.CloseCommandConnection()
+        if self.broadcastSocket:
+            self.broadcastSocket.close()
+            self.broadcastSocket = None
+
+    def StartThread(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def RunBroadcastChannel(self):
+        while self.isRunning:
+            try:
+                data = self.broadcastSocket.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            message = ParseMessage(data)
+            if not message or message["source"] == self.nodeId:
+                continue
+
+            if message["type"] == "ping":
+                self.broadcastSocket.sendto(BuildMessage("pong", self.nodeId, message["source"], self.GetNodeData()), self.multicastGroupEndpoint)
+            elif message["type"] == "open_connection" and message.get("dest") == self.nodeId:
+                self.OpenCommandConnection(message["source"], message["data"])
+            elif message["type"] == "close_connection" and message.get("dest") == self.nodeId:
+                self.CloseCommandConnection()
+
+    def OpenCommandConnection(self, remoteNodeId, data):
+        self.CloseCommandConnection()
+        self.commandSocket = socket.create_connection((data["command_ip"], data["command_port"]))
+        self.commandSocket.settimeout(0.1)
+        self.StartThread(self.RunCommandChannel, self.commandSocket, remoteNodeId)
+
+    def CloseCommandConnection(self):
+        if self.commandSocket:
+            self.commandSocket.close()
+            self.commandSocket = None
+
+    def RunCommandChannel(self, commandSocket, remoteNodeId):
+        decoder = json.JSONDecoder()
+        buffer = b""
+        while self.isRunning and commandSocket is self.commandSocket:
+            try:
+                data = commandSocket.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if not data:
+                return
+
+            # commands larger than one read arrive in pieces, wait until a whole json message is in
+            buffer += data
+            try:
+                message, end = decoder.raw_decode(buffer.decode("utf-8"))
+            except ValueError:
+                continue
+            buffer = buffer.decode("utf-8")[end:].encode("utf-8")
+
+            if message.get("type") != "command":
+                continue
+
+            command = message["data"]["command"]
+            self.commands.append(command)
+            success, result, output = self.commandHandler(command)
+            resultData = {"success": success, "command": command, "result": result, "output": [{"type": "Info", "output": output}] if output else []}
+            commandSocket.sendall(BuildMessage("command_result", self.nodeId, remoteNodeId, resultData))
+
+class PrintCommandHandler(ImportBatchHandler):
+    def __call__(self, command):
+        success, result, output = super().__call__(command)
+        print(output or command)
+        return success, result, output
+
+if __name__ == "__main__":
+    standIn = UnrealStandIn(commandHandler=PrintCommandHandler())
+    standIn.Start()
+    print(f"unreal stand-in {standIn.nodeId} listening on {standIn.multicastGroupEndpoint}, ctrl+c to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        standIn.Stop()
+        sys.exit(0)
@@ -0,0 +1,157 @@
+import json
+import os
+import queue
+import threading
+import time
+import remote_execution
+from exportTrace import tracer
+
+UNREAL_IMPORT_SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "UnrealImport.py")
+
+def RunOnMainThread(callback, *args):
+    try:
+        import maya.utils
+        maya.utils.executeDeferred(callback, *args)
+    except ImportError:
+        callback(*args)
+
+def GetUnrealPath(path):
+    return path.replace("\\", "/")
+
+# one file of an ImportBatch manifest, an empty hash always gets imported
+def BuildImportBatchEntry(exportType, path, destination, sourceHash, skeletalMeshPath=None):
+    return {"type": exportType, "path": GetUnrealPath(path), "destination": destination, "hash": sourceHash or "", "skeletalMesh": skeletalMeshPath}
+
+# one round trip for the files, the manifest goes over as a python string literal and the summary comes back printed.
+# With save off the imported packages wait for a BuildSaveImportsCommand
+def BuildImportBatchCommand(entries, save=True):
+    return f"print(ImportBatch({json.dumps(entries)!r}, save={save}))"
+
+def BuildSaveImportsCommand(destinations):
+    return f"print(SaveImportedAssets({json.dumps(destinations)!r}))"
+
+def GetImportBatchSummaryText(output):
+    try:
+        summary = json.loads(output)
+    except ValueError:
+        return output
+    if "saved" in summary:
+        return f"saved {', '.join(summary['saved'])}"
+    return f"{len(summary['imported'])} imported, {summary['skipped']} unchanged"
+
+# Data oriented class
+class TransportJob:
+    def __init__(self, command, label):
+        self.command = command
+        self.label = label
+        self.succeeded = False
+        self.output = ""
+
+# Keeps one remote execution connection to the editor alive on a background thread and runs the queued
+# commands in order, so Maya can go on exporting while Unreal imports what is already written.
+class UnrealTransport:
+    def __init__(self, config=None, discoveryTimeout=5.0, progressCallback=None):
+        self.config = config
+        self.discoveryTimeout = discoveryTimeout
+        self.progressCallback = progressCallback
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.remoteExec = None
+        self.hasImportSource = False
+        self.queuedCount = 0
+        self.finishedCount = 0
+        self.lock = threading.Lock()
+
+    def Start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self.Run, name="UnrealTransport", daemon=True)
+        self.thread.start()
+
+    def Stop(self):
+        if self.thread and self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
+        self.thread = None
+
+    def Enqueue(self, command, label=""):
+        with self.lock:
+            self.queuedCount += 1
+        job = TransportJob(command, label or command)
+        self.jobs.put(job)
+        self.Start()
+        return job
+
+    def WaitUntilDone(self):
+        self.jobs.join()
+
+    def IsBusy(self):
+        return self.finishedCount < self.queuedCount
+
+    def Connect(self):
+        self.remoteExec = remote_execution.RemoteExecution(self.config) if self.config else remote_execution.RemoteExecution()
+        self.remoteExec.start()
+        timeout = time.time() + self.discoveryTimeout
+        while not self.remoteExec.remote_nodes and time.time() < timeout:
+            time.sleep(0.1)
+
+        if not self.remoteExec.remote_nodes:
+            self.Disconnect()
+            raise Exception("No Unreal Editor found, please make sure remote execution is enabled in the project!")
+
+        self.remoteExec.open_command_connection(self.remoteExec.remote_nodes[0]["node_id"])
+        self.hasImportSource = False
+
+    def Disconnect(self):
+        if self.remoteExec:
+            self.remoteExec.stop()
+        self.remoteExec = None
+        self.hasImportSource = False
+
+    def RunCommand(self, command):
+        if not self.remoteExec:
+            self.Connect()
+
+        if not self.hasImportSource:
+            with open(UNREAL_IMPORT_SOURCE_PATH, "r") as importSourceFile:
+                self.remoteExec.run_command(importSourceFile.read(), unattended=True)
+            self.hasImportSource = True
+
+        return self.remoteExec.run_command(command, unattended=True)
+
+    def RunJob(self, job):
+        try:
+            with tracer.Span("UnrealImport", label=job.label):
+                result = self.RunCommand(job.command)
+            job.succeeded = bool(result.get("success"))
+            # a failed command brings back its traceback as the result, a finished one what it printed
+            printedOutput = "".join(entry.get("output", "") for entry in result.get("output", [])).strip()
+            job.output = printedOutput if job.succeeded else result.get("result", "")
+        except Exception as e:
+            # drop the connection, the next job reconnects from scratch
+            self.Disconnect()
+            job.output = f"{e}"
+
+    def Run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.Disconnect()
+                self.jobs.task_done()
+                return
+
+            self.RunJob(job)
+            with self.lock:
+                self.finishedCount += 1
+                finishedCount, queuedCount = self.finishedCount, self.queuedCount
+            if self.progressCallback:
+                RunOnMainThread(self.progressCallback, finishedCount, queuedCount, job)
+            self.jobs.task_done()
+
+_unrealTransport = None
+
+def GetUnrealTransport():
+    global _unrealTransport
+    if _unrealTransport is None:
+        _unrealTransport = UnrealTransport()
+    return _unrealTransport